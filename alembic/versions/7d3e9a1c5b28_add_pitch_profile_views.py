@@ -0,0 +1,413 @@
+"""add pitch profile views and materialized views
+
+Revision ID: 7d3e9a1c5b28
+Revises: 4c0584f1544d
+Create Date: 2026-10-17 18:22:51.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3e9a1c5b28'
+down_revision: Union[str, Sequence[str], None] = '4c0584f1544d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# View DDL as of this revision (transformation/production/*.sql); later
+# edits to those files need their own revision
+V_PITCH_SHAPE_FEATURES = """
+CREATE OR REPLACE VIEW production.v_pitch_shape_features AS
+SELECT
+    s.pitch_id,
+    p.pa_id,
+    p.game_pk,
+    p.game_counter,
+    p.pitcher_id,
+    p.batter_id,
+    p.pitch_number,
+    p.pitch_type,
+    p.pitch_name,
+    p.description,
+    CAST(pp.pitch_hand AS text) AS pitcher_throws,
+    CAST(bp.bat_side AS text) AS batter_stand,
+    p.balls,
+    p.strikes,
+
+    s.release_pos_x,
+    s.release_pos_y,
+    s.release_pos_z,
+    s.release_extension,
+    s.release_speed,
+    s.release_spin_rate,
+    s.spin_axis,
+    s.pfx_x,
+    s.pfx_z,
+    s.vx0,
+    s.vy0,
+    s.vz0,
+    s.ax,
+    s.ay,
+    s.az,
+    s.plate_x,
+    s.plate_z,
+    s.sz_top,
+    s.sz_bot,
+
+    p.is_swing,
+    p.is_whiff,
+    p.is_called_strike,
+    p.is_foul,
+    p.is_bip,
+
+    (p.is_called_strike OR p.is_whiff) AS is_csw,
+    (p.is_swing AND NOT p.is_whiff) AS is_contact,
+    (p.is_swing AND p.is_foul) AS is_foul_contact,
+    (p.is_swing AND p.is_bip) AS is_inplay_contact,
+
+    (12.0*s.pfx_x) AS horizontal_break_inches,
+    (12.0*s.pfx_z) AS induced_vertical_break_inches,
+    (12.0*sqrt( (s.pfx_x * s.pfx_x) + (s.pfx_z * s.pfx_z) )) AS movement_mag_inches,
+
+    CASE
+        WHEN s.release_spin_rate IS NULL OR s.release_spin_rate= 0 THEN NULL
+        ELSE (12.0 * sqrt( (s.pfx_x*s.pfx_x) + (s.pfx_z*s.pfx_z) )) / (s.release_spin_rate / 1000.0)
+    END AS movement_per_1000rpm,
+
+    CASE
+        WHEN pp.pitch_hand = bp.bat_side THEN 'same'
+        WHEN pp.pitch_hand IS NULL OR bp.bat_side IS NULL THEN NULL
+        ELSE 'opposite'
+    END AS platoon,
+
+    CASE
+        WHEN pp.pitch_hand = 'R' THEN 12.0*s.pfx_x
+        WHEN pp.pitch_hand = 'L' THEN -12.0*s.pfx_x
+        ELSE 12.0*s.pfx_x
+    END AS hb_in_arm_side_pos
+
+FROM production.sat_pitch_shape s
+JOIN production.fact_pitch p
+    ON p.pitch_id = s.pitch_id
+JOIN production.dim_player bp
+    ON p.batter_id = bp.player_id
+JOIN production.dim_player pp
+    ON p.pitcher_id = pp.player_id
+"""
+
+V_PITCH_TYPE_PROFILE = """
+CREATE OR REPLACE VIEW production.v_pitch_type_profile (
+    pitcher_id,
+    pitch_type,
+    pitch_name,
+    platoon,
+    pitches,
+    avg_velo,
+    avg_spin,
+    avg_extension,
+    avg_hb_in,
+    avg_ivb_in,
+    avg_movement_in,
+    avg_move_per_1000rpm,
+    avg_release_side,
+    avg_release_height,
+    avg_ev_on_bip,
+    avg_xwoba_on_bip,
+    swing_rate,
+    whiff_rate,
+    csw_rate,
+    contact_rate,
+    foul_contact_rate,
+    inplay_contact_rate,
+    hard_hit_rate,
+    ideal_contact_rate,
+    zone_rate,
+    chase_rate,
+    zone_whiff_per_zone_swing,
+    chase_whiff_per_chase_swing
+) AS
+WITH pitch_level AS (
+    SELECT
+        v.pitcher_id,
+        v.pitch_id,
+        v.pitch_name,
+        v.pitch_type,
+        v.platoon,
+
+        v.release_speed,
+        v.release_extension,
+        v.release_spin_rate,
+        v.horizontal_break_inches,
+        v.induced_vertical_break_inches,
+        v.movement_mag_inches,
+        v.movement_per_1000rpm,
+        v.release_pos_x,
+        v.release_pos_z,
+        bb.launch_speed,
+        bb.xwoba,
+        
+        v.is_swing,
+        v.is_whiff,
+        v.is_csw,
+        v.is_contact,
+        v.is_foul_contact,
+        v.is_inplay_contact,
+        bb.hard_hit,
+        bb.sweet_spot,
+        bb.ideal_contact,
+
+        v.plate_x,
+        v.plate_z,
+        v.sz_top,
+        v.sz_bot,
+
+        CASE
+            WHEN v.plate_x IS NULL OR v.plate_z IS NULL OR v.sz_top IS NULL OR v.sz_bot IS NULL THEN NULL
+            WHEN v.plate_x BETWEEN -0.83 AND 0.83
+                AND v.plate_z BETWEEN v.sz_bot AND v.sz_top
+            THEN TRUE
+            ELSE FALSE
+        END AS is_in_zone
+    FROM production.v_pitch_shape_features v
+    LEFT JOIN production.sat_batted_balls bb
+        ON v.pitch_id = bb.pitch_id
+    WHERE v.pitch_type IS NOT NULL
+),
+pitch_level2 AS (
+    SELECT
+        *,
+        CASE 
+            WHEN is_in_zone IS NULL OR is_swing IS NULL THEN NULL
+            WHEN is_swing AND NOT is_in_zone THEN TRUE
+            ELSE FALSE
+        END AS is_chase,
+
+        CASE
+            WHEN is_in_zone IS NULL OR is_swing IS NULL THEN NULL
+            WHEN is_swing AND is_in_zone THEN TRUE
+            ELSE FALSE
+        END AS is_zone_swing,
+
+        CASE
+            WHEN is_in_zone IS NULL OR is_whiff IS NULL THEN NULL
+            WHEN is_whiff AND is_in_zone THEN TRUE
+            ELSE FALSE
+        END AS is_zone_whiff,
+
+        CASE
+            WHEN is_in_zone IS NULL OR is_whiff IS NULL THEN NULL
+            WHEN is_whiff AND NOT is_in_zone THEN TRUE
+            ELSE FALSE
+        END AS is_chase_whiff,
+
+        CASE
+            WHEN is_in_zone IS NULL OR ideal_contact IS NULL THEN NULL
+            WHEN ideal_contact AND NOT is_in_zone THEN TRUE
+            ELSE FALSE
+        END AS is_ideal_contact_out_of_zone,
+
+        CASE
+            WHEN is_in_zone IS NULL OR ideal_contact IS NULL THEN NULL
+            WHEN ideal_contact AND is_in_zone THEN TRUE
+            ELSE FALSE
+        END AS is_ideal_contact_in_zone
+    FROM pitch_level
+),
+agg AS (
+    SELECT
+        pitcher_id,
+        pitch_type,
+        pitch_name,
+        platoon,
+
+        COUNT(*) AS pitches,
+
+        AVG(release_speed) AS avg_velo,
+        AVG(release_spin_rate) AS avg_spin,
+        AVG(release_extension) AS avg_extension,
+        AVG(horizontal_break_inches) AS avg_hb_in,
+        AVG(induced_vertical_break_inches) AS avg_ivb_in,
+        AVG(movement_mag_inches) AS avg_movement_in,
+        AVG(movement_per_1000rpm) AS avg_move_per_1000rpm,
+        AVG(release_pos_x) AS avg_release_side,
+        AVG(release_pos_z) AS avg_release_height,
+        AVG(launch_speed) FILTER (WHERE is_inplay_contact) AS avg_ev_on_bip,
+        AVG(xwoba) FILTER (WHERE is_inplay_contact) AS avg_xwoba_on_bip,
+
+        AVG((is_swing)::int) AS swing_rate,
+        AVG((is_whiff)::int) AS whiff_rate,
+        AVG((is_csw)::int) AS csw_rate,
+        AVG((is_contact)::int) AS contact_rate,
+        AVG((is_foul_contact)::int) AS foul_contact_rate,
+        AVG((is_inplay_contact)::int) AS inplay_contact_rate,
+        AVG((hard_hit)::int) AS hard_hit_rate,
+        AVG((ideal_contact)::int) AS ideal_contact_rate,
+
+        AVG((is_in_zone)::int) FILTER (WHERE is_in_zone IS NOT NULL) AS zone_rate,
+        AVG((is_chase)::int) FILTER (WHERE is_chase IS NOT NULL) AS chase_rate,
+
+        CASE
+            WHEN SUM((is_zone_swing)::int) = 0 THEN NULL
+            ELSE SUM((is_zone_whiff)::int)::float / SUM((is_zone_swing)::int)
+        END AS zone_whiff_per_zone_swing,
+
+        CASE
+            WHEN SUM((is_chase)::int) = 0 THEN NULL
+            ELSE SUM((is_chase_whiff)::int)::float / SUM((is_chase)::int)
+        END AS chase_whiff_per_chase_swing
+    FROM pitch_level2
+    GROUP BY 1,2,3,4
+), 
+with_usage AS (
+    SELECT 
+        a.*,
+        a.pitches::float / NULLIF(SUM(a.pitches) OVER (PARTITION BY a.pitcher_id, a.platoon), 0) AS usage_pct
+    FROM agg a
+)
+SELECT * 
+FROM with_usage
+"""
+
+V_GAME_LEVEL_PITCH_TYPE_PROFILE = """
+CREATE OR REPLACE VIEW production.v_game_level_pitch_type_profile (
+    game_pk,
+    pitcher_id,
+    pitch_type,
+    batter_stand,
+    pitch_name,
+    pitches,
+    avg_move_in,
+    avg_ivb_in,
+    bat_contact_rate,
+    batted_balls,
+    inplay_contact_rate,
+    csw_pct,
+    swing_rate,
+    whiff_rate,
+    avg_xwoba_on_bip,
+    hard_hit_rate_on_bip,
+    sweet_spot_rate_on_bip,
+    usage_pct,
+    total_pitches
+) AS
+WITH pitch_level AS (
+    SELECT
+        ps.pitch_id,
+        ps.pa_id,
+        ps.game_pk,
+        ps.game_counter,
+        ps.pitch_number,
+        ps.pitcher_id,
+        ps.batter_id,
+        ps.pitch_type,
+        ps.pitch_name,
+        ps.pitcher_throws,
+        ps.batter_stand,
+        ps.movement_mag_inches,
+        ps.platoon,
+        ps.induced_vertical_break_inches AS ivb_in,
+        ps.is_swing,
+        ps.is_contact,
+        ps.is_inplay_contact,
+        ps.is_csw,
+        ps.is_whiff,
+        bb.xwoba,
+        bb.hard_hit,
+        bb.sweet_spot
+    FROM production.v_pitch_shape_features ps
+    LEFT JOIN production.sat_batted_balls bb
+    ON ps.pitch_id = bb.pitch_id
+    WHERE bb.xwoba IS NOT NULL OR ps.movement_mag_inches IS NOT NULL OR ps.induced_vertical_break_inches IS NOT NULL
+),
+game_level AS (
+    SELECT 
+        game_pk,
+        pitcher_id,
+        COUNT(*) AS total_pitches
+    FROM production.fact_pitch
+    GROUP BY 1,2
+),
+agg AS (
+    SELECT
+        p.game_pk,
+        p.pitcher_id,
+        p.pitch_type,
+        p.batter_stand,
+        p.pitch_name,
+
+        COUNT(*) AS pitches,
+        ROUND(AVG(p.movement_mag_inches)::numeric, 4) AS avg_move_in,
+        ROUND(AVG(p.ivb_in)::numeric, 4) AS avg_ivb_in,
+        ROUND(AVG(p.is_contact::int)::numeric, 4) AS bat_contact_rate,
+        COUNT(p.xwoba) AS batted_balls,
+        ROUND(AVG(p.is_inplay_contact::int)::numeric, 4) AS inplay_contact_rate,
+        ROUND(AVG(p.is_csw::int)::numeric, 4) AS csw_pct,
+        ROUND(AVG(p.is_swing::int)::numeric, 4) as swing_rate,
+        ROUND(AVG(p.is_whiff::int)::numeric, 4) AS whiff_rate,
+        ROUND(AVG(p.xwoba)::numeric, 4) AS avg_xwoba_on_bip,
+        ROUND(AVG(p.hard_hit::int)::numeric, 4) AS hard_hit_rate_on_bip,
+        ROUND(AVG(p.sweet_spot::int)::numeric, 4) AS sweet_spot_rate_on_bip
+    FROM pitch_level p
+    GROUP BY 1,2,3,4,5
+), 
+with_usage AS (
+    SELECT
+        a.*,
+        ROUND((a.pitches::float / NULLIF(SUM(a.pitches) OVER (PARTITION BY a.game_pk, a.pitcher_id, a.batter_stand), 0))::numeric, 3) AS usage_pct,
+        g.total_pitches
+    FROM agg a
+    LEFT JOIN game_level g
+        ON g.game_pk = a.game_pk
+        AND g.pitcher_id = a.pitcher_id
+)
+SELECT *
+FROM with_usage
+"""
+
+
+def upgrade():
+    """Upgrade schema."""
+    op.execute(V_PITCH_SHAPE_FEATURES)
+    op.execute(V_PITCH_TYPE_PROFILE)
+    op.execute(V_GAME_LEVEL_PITCH_TYPE_PROFILE)
+
+    # WITH NO DATA keeps the migration fast; the first refresh_pitch_profiles
+    # run populates them with a plain refresh, later runs refresh CONCURRENTLY.
+    # IF NOT EXISTS covers databases where they were already created by hand.
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS production.mv_pitch_shape_features AS
+        SELECT *
+        FROM production.v_pitch_shape_features
+        WITH NO DATA
+    """)
+    # Unique indexes are what allow REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS mv_pitch_shape_features_pitch_id_uidx
+            ON production.mv_pitch_shape_features (pitch_id)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS mv_pitch_shape_features_pitcher_idx
+            ON production.mv_pitch_shape_features (pitcher_id, pitch_type)
+    """)
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS production.mv_pitch_type_profile AS
+        SELECT *
+        FROM production.v_pitch_type_profile
+        WITH NO DATA
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS mv_pitch_type_profile_uidx
+            ON production.mv_pitch_type_profile (pitcher_id, pitch_type, pitch_name, platoon)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS production.mv_pitch_type_profile")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS production.mv_pitch_shape_features")
+    op.execute("DROP VIEW IF EXISTS production.v_game_level_pitch_type_profile")
+    op.execute("DROP VIEW IF EXISTS production.v_pitch_type_profile")
+    op.execute("DROP VIEW IF EXISTS production.v_pitch_shape_features")
@@ -0,0 +1,34 @@
+"""add schedule index tables
+
+Revision ID: 2f8b6a1d4c93
+Revises: 9c4d2e7f1a36
+Create Date: 2026-10-17 16:41:09.275318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from schema.table_factory import create_table_from_schema
+from schema.raw.schedule import SCHEDULE_GAMES_SPEC, SCHEDULE_DAYS_SPEC
+
+# revision identifiers, used by Alembic.
+revision: str = '2f8b6a1d4c93'
+down_revision: Union[str, Sequence[str], None] = '9c4d2e7f1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    """Upgrade schema."""
+    create_table_from_schema('raw', SCHEDULE_GAMES_SPEC)
+    create_table_from_schema('raw', SCHEDULE_DAYS_SPEC)
+    op.create_index('schedule_games_game_date_idx', 'schedule_games', ['game_date'], schema='raw')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('schedule_games_game_date_idx', table_name='schedule_games', schema='raw')
+    op.drop_table('schedule_days', schema='raw')
+    op.drop_table('schedule_games', schema='raw')
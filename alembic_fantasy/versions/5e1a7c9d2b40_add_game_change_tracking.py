@@ -0,0 +1,34 @@
+"""add game change tracking tables
+
+Revision ID: 5e1a7c9d2b40
+Revises: ca3831ae2b67
+Create Date: 2026-10-17 09:12:44.512093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from schema.table_factory import create_table_from_schema
+from schema.raw.game_changes import GAME_FINGERPRINTS_SPEC, GAME_CHANGES_SPEC
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1a7c9d2b40'
+down_revision: Union[str, Sequence[str], None] = 'ca3831ae2b67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    """Upgrade schema."""
+    create_table_from_schema('raw', GAME_FINGERPRINTS_SPEC)
+    create_table_from_schema('raw', GAME_CHANGES_SPEC)
+    op.create_index('game_changes_detected_at_idx', 'game_changes', ['detected_at'], schema='raw')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('game_changes_detected_at_idx', table_name='game_changes', schema='raw')
+    op.drop_table('game_changes', schema='raw')
+    op.drop_table('game_fingerprints', schema='raw')
@@ -0,0 +1,44 @@
+"""add production.agg_game_pitch_type
+
+Revision ID: 9c4d2e7f1a36
+Revises: 5e1a7c9d2b40
+Create Date: 2026-10-17 14:03:27.804415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from schema.table_factory import create_table_from_schema
+from schema.production.agg_tables import AGG_GAME_PITCH_TYPE_SPEC
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d2e7f1a36'
+down_revision: Union[str, Sequence[str], None] = '5e1a7c9d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    """Upgrade schema."""
+    create_table_from_schema('production', AGG_GAME_PITCH_TYPE_SPEC)
+    op.create_index(
+        'agg_game_pitch_type_game_pitcher_idx',
+        'agg_game_pitch_type',
+        ['game_pk', 'pitcher_id'],
+        schema='production'
+    )
+    op.create_index(
+        'agg_game_pitch_type_pitcher_idx',
+        'agg_game_pitch_type',
+        ['pitcher_id', 'pitch_type'],
+        schema='production'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('agg_game_pitch_type_pitcher_idx', table_name='agg_game_pitch_type', schema='production')
+    op.drop_index('agg_game_pitch_type_game_pitcher_idx', table_name='agg_game_pitch_type', schema='production')
+    op.drop_table('agg_game_pitch_type', schema='production')
@@ -0,0 +1,41 @@
+"""add loaded_at to raw.game_changes
+
+Revision ID: b8e2f4a6c013
+Revises: 2f8b6a1d4c93
+Create Date: 2026-10-17 21:05:36.118027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2f4a6c013'
+down_revision: Union[str, Sequence[str], None] = '2f8b6a1d4c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    """Upgrade schema."""
+    # Existing rows stay NULL: nothing recorded whether their runs finished,
+    # so the first incremental run after this reloads them all
+    op.add_column(
+        'game_changes',
+        sa.Column('loaded_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        schema='raw'
+    )
+    op.create_index(
+        'game_changes_unloaded_idx',
+        'game_changes',
+        ['change_id'],
+        schema='raw',
+        postgresql_where=sa.text('loaded_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('game_changes_unloaded_idx', table_name='game_changes', schema='raw')
+    op.drop_column('game_changes', 'loaded_at', schema='raw')
@@ -1,17 +1,19 @@
-from ingestion.ingest_boxscores import fetch_and_load_boxscores
+from ingestion.ingest_boxscores import fetch_and_load_boxscores, replay_and_load_boxscores
 from ingestion.ingest_team_dim import fetch_team_dim
 from ingestion.ingest_statcast import extract_and_save_statcast
-from ingestion.ingest_dim_player import extract_and_save_dim_player
+from ingestion.ingest_dim_player import extract_and_save_dim_player, commit_dim_player_snapshot
 
-from transformation.staging.load_table import load_table
+from transformation.staging.load_table import load_table, load_staging_fanout
 from utils.sql_runner import run_sql_registry
-from transformation.production.sql_registry import SQL_REGISTRY
+from transformation.production.sql_registry import SQL_REGISTRY, SQL_SOURCE_TABLES
 
 from utils.utils import build_db_url
+from utils.change_tracking import unloaded_game_changes, mark_game_changes_loaded
 
 from sqlalchemy import create_engine
 import pandas as pd
 
+import os
 import argparse
 import logging
 logging.basicConfig(
@@ -27,24 +29,36 @@ engine = create_engine(build_db_url())
 DIM_PLAYER_PARQUET = 'data/dim_player.parquet'
 # default data dir is 'data'
 
-def ingestion(start_date: str, end_date: str, data_dir: str) -> str:
+def ingestion(start_date: str, end_date: str, data_dir: str, replay_boxscores: bool = False) -> str:
     with engine.begin() as conn:
         team_ids = fetch_team_dim()
 
-        fetch_and_load_boxscores(start_date, end_date, team_ids = None, engine=engine)
+        if replay_boxscores:
+            # only the run's window, not every landed game
+            replay_and_load_boxscores(start_date=start_date, end_date=end_date)
+        else:
+            fetch_and_load_boxscores(start_date, end_date)
         return extract_and_save_statcast(start_date, end_date, data_dir=data_dir, engine=engine)
         
 
-def load_staging(parquet: str):
-    load_table('statcast_pitches', parquet)
-    load_table('statcast_at_bats', parquet)
-    load_table('statcast_batted_balls', parquet)
-
-def load_production(parquet: str): 
-    extract_and_save_dim_player(parquet)
-    load_table('dim_game')
-    load_table('dim_player', parquet)
-    run_sql_registry(SQL_REGISTRY)
+def load_staging(parquet: str, game_pks: list[int] = None, start_date: str = None, end_date: str = None):
+    # the partitioned dataset is shared by every pull, so read only the run's
+    # window from it; a single legacy parquet file is the pull itself
+    if not os.path.isdir(parquet):
+        start_date = end_date = None
+    # one read + shared derivations, then pitches/at_bats/batted_balls in parallel
+    load_staging_fanout(parquet, start_date=start_date, end_date=end_date, game_pks=game_pks)
+
+def load_production(parquet: str, game_pks: list[int] = None): 
+    # only players new or changed since the last snapshot are upserted
+    player_changes = extract_and_save_dim_player(parquet)
+    load_table('dim_game', game_pks=game_pks)
+    if player_changes is not None:
+        load_table('dim_player', player_changes)
+        # the snapshot advances only after the changes are in the table
+        commit_dim_player_snapshot(parquet)
+    # game_pks=None loads every game; otherwise only the changed ones
+    run_sql_registry(SQL_REGISTRY, params={'game_pks': game_pks}, sources=SQL_SOURCE_TABLES)
 
 
 def main():
@@ -61,6 +75,10 @@ def main():
                         help='skip staging if you already have staging tables in postgresql db')
     parser.add_argument('--skip-production', action='store_true',
                         help='skip load_production() and production SQL')
+    parser.add_argument('--replay-boxscores', action='store_true',
+                        help='rebuild raw boxscore rows from raw.landing_boxscores instead of the MLB API')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only transform/load games with changes not yet loaded (raw.game_changes)')
     
     # Path ovverides
     parser.add_argument('--parquet', type=str,
@@ -71,17 +89,35 @@ def main():
 
     args = parser.parse_args()
 
+    if args.incremental and args.skip_ingestion:
+        parser.error("--incremental needs ingestion to detect changed games")
+
     if args.skip_ingestion:
         if not args.parquet and not args.skip_staging:
             parser.error("--skip-ingestion requires --parquet to specify existing file")
     else:    
-        parquet = ingestion(args.start_date, args.end_date, args.data_dir)
+        parquet = ingestion(args.start_date, args.end_date, args.data_dir, args.replay_boxscores)
+
+    game_pks = None
+    start_date, end_date = args.start_date, args.end_date
+    if args.incremental:
+        # changes left by earlier runs that failed before production count
+        # too, so the read is not bounded by this run's window
+        game_pks, through_change_id = unloaded_game_changes()
+        print(f'Incremental run: {len(game_pks)} games added or changed')
+        if not game_pks:
+            return
+        start_date = end_date = None
 
     if not args.skip_staging:
-        load_staging(parquet)
+        load_staging(parquet, game_pks, start_date, end_date)
 
     if not args.skip_production:
-        load_production(DIM_PLAYER_PARQUET)
+        load_production(DIM_PLAYER_PARQUET, game_pks)
+        if args.incremental:
+            # only once production has committed; a failure above leaves
+            # the changes pending for the next run
+            mark_game_changes_loaded(through_change_id)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,41 +1,65 @@
 import logging
 import json
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
 import pandas as pd
-from sqlalchemy import create_engine, Text, Table, Column, BigInteger, MetaData
+from sqlalchemy import create_engine, text, or_, Text, Table, Column, BigInteger, MetaData
 from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from utils.utils import build_db_url
-from utils.retry import build_retry_session
+from utils.retry import (
+    get_session,
+    get_limiter,
+    limited_get,
+    AdaptiveRateLimiter,
+)
+from utils.change_tracking import payload_fingerprint, record_game_changes
 
 logger=logging.getLogger(__name__)
-session=build_retry_session(timeout=15)
+
+BOXSCORE_URL = "https://statsapi.mlb.com/api/v1/game/{}/boxscore"
+SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+# schedule and boxscores share statsapi's session and limiter
+session=get_session(SCHEDULE_URL)
+REQUEST_TIMEOUT = 15
+FINAL_STATE = "Final"
+# abstractGameState is Final for these too, but no complete game was played
+# on that date; the game_pk is kept when it is rescheduled or resumed
+NOT_PLAYED_STATES = ("Postponed", "Cancelled", "Suspended")
+RAW_GAME_KEY = ['game_pk', 'home_team_id', 'away_team_id']
+RAW_GAME_UPSERT_CHUNK = 1000
+FETCH_MAX_WORKERS = 8
+FETCH_RATE_PER_SEC = 10.0
+LANDING_FLUSH_ROWS = 100
+LANDING_FLUSH_SECONDS = 30.0
+REPLAY_YIELD_PER = 200
 
 engine = create_engine(build_db_url(database='mlb_fantasy'), pool_pre_ping=True)
 
-def _fetch_game_table(start_date: str, end_date: str):
+def _parse_schedule(data: dict) -> tuple[list, list, dict]:
     """
-    Fetch game primary keys from MLB Stats API schedule endpoint.
+    Flatten a schedule response.
 
-    Args:
-        start_date: Start date in YYYY-MM-DD format
-        end_date: End date in YYYY-MM-DD format
-        team_id: Optional team ID to filter games (None = all teams)
+    A postponed or suspended game is listed on its original date and again
+    on the date it is played, under the same game_pk. Dates are in order, so
+    the index keeps the latest occurrence.
 
     Returns:
-        List of game_pk integers
+        (raw.dim_game rows, raw.schedule_games rows, {game_date: all final})
+        for non-spring games
     """
-    game_pks = []
     rows = []
-
-    schedule_url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&startDate={start_date}&endDate={end_date}"
-
-    response = session.get(schedule_url, timeout=session.timeout)
-    response.raise_for_status()
-    data = response.json()
+    index_rows = {}
+    days = {}
 
     schedule = data.get("dates") or {}
     for day in schedule:
         games = day.get("games") or []
+        day_final = True
         for game in games:
             team_info = game.get('teams') or {}
             home = team_info.get('home')
@@ -47,6 +71,7 @@ def _fetch_game_table(start_date: str, end_date: str):
             away_record = away.get('leagueRecord')
 
             venue = game.get('venue')
+            status = game.get('status') or {}
 
             if game.get("gameType", " ").lower() != "s":
                 game_pk = game.get("gamePk")
@@ -69,10 +94,143 @@ def _fetch_game_table(start_date: str, end_date: str):
                     'games_in_series_text': game.get('gamesInSeries'),
                     'series_in_game_number_text': game.get('seriesGameNumber')
                 })
-                if game_pk not in game_pks:
-                    game_pks.append(game_pk)
+                index_rows[game_pk] = {
+                    'game_pk': game_pk,
+                    'game_date': day.get('date'),
+                    'game_type': game.get('gameType'),
+                    'abstract_state': status.get('abstractGameState'),
+                    'detailed_state': status.get('detailedState'),
+                }
+                day_final = day_final and status.get('abstractGameState') == FINAL_STATE
+        days[day.get('date')] = day_final
+
+    return rows, list(index_rows.values()), days
+
+
+def _complete_days(start_date: str, end_date: str) -> set:
+    """Dates in range whose schedule is final (never re-fetched)."""
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT game_date
+            FROM raw.schedule_days
+            WHERE all_final
+                AND game_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+        """), {'start_date': start_date, 'end_date': end_date})
+        return set(result.scalars())
+
+
+def _incomplete_ranges(start_date: str, end_date: str, complete: set) -> list[tuple[str, str]]:
+    """Contiguous [start, end] runs of dates not in complete."""
+    ranges = []
+    run_start = None
+    d = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    while d <= end:
+        if d in complete:
+            if run_start is not None:
+                ranges.append((run_start.isoformat(), (d - timedelta(days=1)).isoformat()))
+                run_start = None
+        elif run_start is None:
+            run_start = d
+        d += timedelta(days=1)
+    if run_start is not None:
+        ranges.append((run_start.isoformat(), end.isoformat()))
+    return ranges
+
+
+def _save_schedule_index(start_date: str, end_date: str, index_rows: list, days: dict):
+    """
+    Upsert game statuses and mark each date in [start_date, end_date]. Dates
+    with no games count as final once they are in the past.
+    """
+    today = date.today()
+    games_per_day = Counter(r['game_date'] for r in index_rows)
+    day_rows = []
+    d = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    while d <= end:
+        key = d.isoformat()
+        n_games = games_per_day[key]
+        if key in days:
+            all_final = days[key]
+        else:
+            all_final = d < today
+        day_rows.append({'game_date': key, 'game_count': n_games, 'all_final': all_final})
+        d += timedelta(days=1)
+
+    with engine.begin() as conn:
+        if index_rows:
+            conn.execute(text("""
+                INSERT INTO raw.schedule_games (game_pk, game_date, game_type, abstract_state, detailed_state)
+                VALUES (:game_pk, :game_date, :game_type, :abstract_state, :detailed_state)
+                ON CONFLICT (game_pk) DO UPDATE SET
+                    game_date = EXCLUDED.game_date,
+                    game_type = EXCLUDED.game_type,
+                    abstract_state = EXCLUDED.abstract_state,
+                    detailed_state = EXCLUDED.detailed_state,
+                    updated_at = now()
+                WHERE (raw.schedule_games.game_date, raw.schedule_games.abstract_state, raw.schedule_games.detailed_state)
+                    IS DISTINCT FROM (EXCLUDED.game_date, EXCLUDED.abstract_state, EXCLUDED.detailed_state)
+                    -- a re-fetch of the original date must not undo a reschedule
+                    AND EXCLUDED.game_date >= raw.schedule_games.game_date
+            """), index_rows)
+        conn.execute(text("""
+            INSERT INTO raw.schedule_days (game_date, game_count, all_final)
+            VALUES (:game_date, :game_count, :all_final)
+            ON CONFLICT (game_date) DO UPDATE SET
+                game_count = EXCLUDED.game_count,
+                all_final = EXCLUDED.all_final,
+                fetched_at = now()
+        """), day_rows)
+
+
+def _indexed_game_pks(start_date: str, end_date: str) -> list:
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT game_pk
+            FROM raw.schedule_games
+            WHERE game_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+            ORDER BY game_date, game_pk
+        """), {'start_date': start_date, 'end_date': end_date})
+        return [int(pk) for pk in result.scalars()]
 
-    return game_pks, pd.DataFrame(rows)
+
+def _fetch_game_table(start_date: str, end_date: str):
+    """
+    Fetch game primary keys from MLB Stats API schedule endpoint.
+
+    Dates recorded as final in raw.schedule_days are served from the schedule
+    index; only the remaining date runs are requested, and their games and
+    statuses are written back to raw.schedule_games / raw.schedule_days.
+
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+
+    Returns:
+        (game_pks in range ordered by date, raw.dim_game rows for the fetched runs)
+    """
+    rows = []
+
+    ranges = _incomplete_ranges(start_date, end_date, _complete_days(start_date, end_date))
+    if not ranges:
+        logger.info(f"Schedule {start_date} to {end_date} is final; no schedule requests")
+
+    for run_start, run_end in ranges:
+        response = limited_get(
+            session,
+            SCHEDULE_URL,
+            get_limiter(SCHEDULE_URL),
+            params={'sportId': 1, 'startDate': run_start, 'endDate': run_end},
+            timeout=REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+
+        run_rows, index_rows, days = _parse_schedule(response.json())
+        _save_schedule_index(run_start, run_end, index_rows, days)
+        rows.extend(run_rows)
+
+    return _indexed_game_pks(start_date, end_date), pd.DataFrame(rows)
 
 
 metadata = MetaData()
@@ -84,156 +242,416 @@ landing = Table(
     schema="raw",
 )
 
-def insert_raw_payload(game_pk, data_payload):
-    with engine.begin() as conn:
-        stmt = pg_insert(landing).values(
-            source="MLB_stats_api",
-            game_pk=game_pk,
-            payload=data_payload,
-        ).on_conflict_do_nothing(
-            index_elements=["game_pk"]
+class RawPayloadWriter:
+    """
+    Buffers boxscore payloads and lands them in raw.landing_boxscores with one
+    multi-row insert per flush instead of one transaction per game.
+
+    A flush happens when `flush_rows` payloads are buffered, when `flush_seconds`
+    have passed since the last flush (checked on add), or on close(). The
+    buffer is swapped out under the lock and written outside it, so fetch
+    threads never wait on another thread's insert. A second add for a
+    game_pk that is still buffered is counted as a duplicate and ignored.
+
+    Every flushed payload is fingerprinted and compared with
+    raw.game_fingerprints; new and changed games are recorded in
+    raw.game_changes in the same transaction. An existing landing row is
+    replaced only when the re-fetched payload differs from it, and
+    unchanged re-fetches are counted as duplicates.
+
+    A failed flush does not raise in the fetch thread that triggered it: the
+    batch's game_pks are kept in `failed`, and close() / check() raise once
+    for all of them. Safe to share across fetch threads.
+    """
+
+    def __init__(
+        self,
+        engine=engine,
+        flush_rows: int = LANDING_FLUSH_ROWS,
+        flush_seconds: float = LANDING_FLUSH_SECONDS,
+        source: str = "MLB_stats_api",
+    ):
+        self.engine = engine
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.source = source
+        self.flushed = 0
+        self.duplicates = 0
+        self.flushes = 0
+        self.landed: list = []
+        self.failed: dict = {}
+        self._buffer: dict = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, game_pk, data_payload):
+        with self._lock:
+            if game_pk in self._buffer:
+                # First payload wins, as it would in the table
+                self.duplicates += 1
+                return
+            self._buffer[game_pk] = data_payload
+            due = (
+                len(self._buffer) >= self.flush_rows
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+            batch = self._take_locked() if due else None
+        if batch:
+            self._write(batch)
+
+    def flush(self):
+        with self._lock:
+            batch = self._take_locked()
+        if batch:
+            self._write(batch)
+
+    def _take_locked(self) -> dict:
+        self._last_flush = time.monotonic()
+        batch, self._buffer = self._buffer, {}
+        return batch
+
+    def _write(self, buffered: dict):
+        batch = [
+            {"source": self.source, "game_pk": game_pk, "payload": payload}
+            for game_pk, payload in buffered.items()
+        ]
+
+        stmt = pg_insert(landing).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["game_pk"],
+            set_={"source": stmt.excluded.source, "payload": stmt.excluded.payload},
+            where=landing.c.payload.is_distinct_from(stmt.excluded.payload),
+        ).returning(landing.c.game_pk)
+
+        # Fingerprint every payload, not only new ones, so upstream
+        # corrections to an already landed boxscore are detected
+        fingerprints = pd.DataFrame({
+            'game_pk': list(buffered),
+            'content_hash': [payload_fingerprint(payload) for payload in buffered.values()],
+        })
+
+        try:
+            with self.engine.begin() as conn:
+                landed = [row.game_pk for row in conn.execute(stmt)]
+                record_game_changes('boxscore', fingerprints, conn=conn)
+        except Exception as exc:
+            logger.error(f"Failed to land {len(batch)} boxscore payloads: {exc}")
+            with self._lock:
+                for game_pk in buffered:
+                    self.failed[game_pk] = exc
+            return
+
+        inserted = len(landed)
+        with self._lock:
+            self.landed.extend(landed)
+            self.flushed += inserted
+            self.duplicates += len(batch) - inserted
+            self.flushes += 1
+        logger.info(
+            f"Landed {inserted} new or changed boxscore payloads ({len(batch) - inserted} unchanged)"
         )
-        conn.execute(stmt)
 
-def fetch_boxscores(game_pks: list) -> list:
-    boxscore_base_url = "https://statsapi.mlb.com/api/v1/game/{}/boxscore"
+    def check(self):
+        """Raise if any flush failed, naming every game_pk that was not landed."""
+        with self._lock:
+            failed = dict(self.failed)
+        if failed:
+            game_pks = sorted(failed)
+            raise RuntimeError(
+                f"Failed to land {len(game_pks)} boxscore payloads "
+                f"(game_pks {game_pks[:10]}{'...' if len(game_pks) > 10 else ''}): "
+                f"{next(iter(failed.values()))}"
+            ) from next(iter(failed.values()))
+
+    def close(self):
+        self.flush()
+        self.check()
+
+    def stats(self) -> dict:
+        return {
+            'flushed': self.flushed,
+            'duplicates': self.duplicates,
+            'flushes': self.flushes,
+            'failed': len(self.failed),
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def _parse_boxscore(game_pk, data: dict) -> tuple[list, list]:
+    """Flatten one boxscore payload into pitching and batting row dicts (row_num unset)."""
     pitching_rows = []
     batting_rows = []
-    pitching_row = 0
-    batting_row = 0
 
+    teams = data.get("teams") or {}
+    for side in ['away', 'home']:
+        s = teams.get(side) or {}
+        team_data = s.get("team") or {}
+        player_data = s.get("players") or {}
+
+        team_id = team_data.get("id")
+        for player_idx, player in player_data.items():
+            batter_stats = player.get('stats') or {}
+            batter_data = player.get('person') or {}
+            position = player.get('position') or {}
+
+            batting_stats = batter_stats.get('batting') or {}
+            fielding_stats =batter_stats.get('fielding') or {}
+
+            pitcher_stats = player.get("stats") or {}
+            pitcher_data = player.get("person") or {}
+
+            pitching_stats = pitcher_stats.get("pitching") or {}
+
+            if pitching_stats:
+                pitching_rows.append({
+                    "row_num": None,
+                    "pitcher_id": pitcher_data.get("id"),
+                    "pitcher_name": pitcher_data.get("fullName"),
+                    "game_pk": game_pk,
+                    "team_id": team_id,
+                    "team_name": team_data.get("name"),
+                    "is_starter_text": pitching_stats.get("gamesStarted"),
+                    "fly_outs_text": pitching_stats.get("flyOuts"),
+                    "ground_outs_text": pitching_stats.get("groundOuts"),
+                    "air_outs_text": pitching_stats.get("airOuts"),
+                    "runs_text": pitching_stats.get("runs"),
+                    "doubles_text": pitching_stats.get("doubles"),
+                    "triples_text": pitching_stats.get("triples"),
+                    "home_runs_text": pitching_stats.get("homeRuns"),
+                    "strike_outs_text": pitching_stats.get("strikeOuts"),
+                    "walks_text": pitching_stats.get("baseOnBalls"),
+                    "intentional_walks_text": pitching_stats.get("intentionalWalks"),
+                    "hits_text": pitching_stats.get("hits"),
+                    "hit_by_pitch_text": pitching_stats.get("hitByPitch"),
+                    "at_bats_text": pitching_stats.get("atBats"),
+                    "caught_stealing_text": pitching_stats.get("caughtStealing"),
+                    "stolen_bases_text": pitching_stats.get("stolenBases"),
+                    "stolen_base_percentage_text": pitching_stats.get("stolenBasePercentage"),
+                    "number_of_pitches_text": pitching_stats.get("numberOfPitches"),
+                    "innings_pitched_text": pitching_stats.get("inningsPitched"),
+                    "wins_text": pitching_stats.get("wins"),
+                    "losses_text": pitching_stats.get("losses"),
+                    "saves_text": pitching_stats.get("saves"),
+                    "save_opportunities_text": pitching_stats.get("saveOpportunities"),
+                    "holds_text": pitching_stats.get("holds"),
+                    "blown_saves_text": pitching_stats.get("blownSaves"),
+                    "earned_runs_text": pitching_stats.get("earnedRuns"),
+                    "batters_faced_text": pitching_stats.get("battersFaced"),
+                    "outs_text": pitching_stats.get("outs"),
+                    "complete_game_text": pitching_stats.get("completeGames"),
+                    "shutout_text": pitching_stats.get("shutouts"),
+                    "pitches_thrown_text": pitching_stats.get("pitchesThrown"),
+                    "balls_text": pitching_stats.get("balls"),
+                    "strikes_text": pitching_stats.get("strikes"),
+                    "strike_percentage_text": pitching_stats.get("strikePercentage"),
+                    "hit_batsmen_text": pitching_stats.get("hitBatsmen"),
+                    "balks_text": pitching_stats.get("balks"),
+                    "wild_pitches_text": pitching_stats.get("wildPitches"),
+                    "pickoffs_text": pitching_stats.get("pickoffs"),
+                    "rbi_text": pitching_stats.get("rbi"),
+                    "games_finished_text": pitching_stats.get("gamesFinished"),
+                    "runs_scored_per_9_text": pitching_stats.get("runsScoredPer9"),
+                    "home_runs_per_9_text": pitching_stats.get("homeRunsPer9"),
+                    "inherited_runners_text": pitching_stats.get("inheritedRunners"),
+                    "inherited_runners_scored_text": pitching_stats.get("inheritedRunnersScored"),
+                    "catchers_interference_text": pitching_stats.get("catchersInterference"),
+                    "sac_bunts_text": pitching_stats.get("sacBunts"),
+                    "sac_flies_text": pitching_stats.get("sacFlies"),
+                    "passed_ball_text": pitching_stats.get("passedBall"),
+                    "pop_outs_text": pitching_stats.get("popOuts"),
+                    "line_outs_text": pitching_stats.get("lineOuts"),
+                    "source": "MLB_stats_api"
+                })
+
+            if batting_stats:
+                batting_rows.append({
+                    'row_num': None,
+                    'batter_id': batter_data.get('id'),
+                    'batter_name': batter_data.get('fullName'),
+                    'game_pk': game_pk,
+                    'team_id': team_id,
+                    'team_name': team_data.get('name'),
+                    'position': position.get('abbreviation'),
+                    'ground_outs_text': batting_stats.get('groundOuts'),
+                    'air_outs_text': batting_stats.get('airOuts'),
+                    'runs_text': batting_stats.get('runs'),
+                    'doubles_text': batting_stats.get('doubles'),
+                    'triples_text': batting_stats.get('triples'),
+                    'home_runs_text': batting_stats.get('homeRuns'),
+                    'strikeouts_text': batting_stats.get('strikeOuts'),
+                    'walks_text': batting_stats.get('baseOnBalls'),
+                    'intentional_walks_text': batting_stats.get('intentionalWalks'),
+                    'hits_text': batting_stats.get('hits'),
+                    'hit_by_pitch_text': batting_stats.get('hitByPitch'),
+                    'at_bats_text': batting_stats.get('atBats'),
+                    'caught_stealing_text': batting_stats.get('caughtStealing'),
+                    'sb_text': batting_stats.get('stolenBases'),
+                    'sb_pct_text': batting_stats.get('stolenBasePercentage'),
+                    'plate_appearances_text': batting_stats.get('plateAppearances'),
+                    'total_bases_text': batting_stats.get('totalBases'),
+                    'rbi_text': batting_stats.get('rbi') ,
+                    'errors_text': fielding_stats.get('errors'),
+                    "source": "MLB_stats_api"
+                })
+
+    return pitching_rows, batting_rows
+
+def _fetch_one(game_pk, http, limiter: AdaptiveRateLimiter | None, writer: RawPayloadWriter) -> tuple[list, list]:
+    url = BOXSCORE_URL.format(game_pk)
+    if limiter is not None:
+        response = limited_get(http, url, limiter, timeout=REQUEST_TIMEOUT)
+    else:
+        response = http.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+
+    writer.add(game_pk, data)
+
+    return _parse_boxscore(game_pk, data)
+
+def fetch_boxscores(
+    game_pks: list,
+    max_workers: int = FETCH_MAX_WORKERS,
+    rate_per_sec: float | None = FETCH_RATE_PER_SEC,
+    writer: RawPayloadWriter | None = None,
+) -> list:
+    """
+    Fetch boxscores for game_pks concurrently and flatten them into rows.
+
+    Args:
+        game_pks: Games to fetch
+        max_workers: Concurrent requests in flight (1 = serial); beyond
+            DEFAULT_POOL_MAXSIZE the extra connections are not kept alive
+        rate_per_sec: Starting and maximum per-host request rate; backs off
+            on 429/503 and trips a circuit breaker on repeated failures.
+            The limiter is process-wide per host, so its state carries over
+            from earlier calls and its rate is fixed by the first caller
+            (None = unlimited; 429/503 responses then fail their game)
+        writer: Buffered raw.landing_boxscores writer (a default one is
+            created and flushed here if not provided)
+
+    Returns:
+        (pitching_rows, batting_rows), ordered by game_pks with sequential row_num
+
+    Raises:
+        RuntimeError: If any payload could not be landed in raw.landing_boxscores
+    """
+    limiter = get_limiter(BOXSCORE_URL, rate_per_sec) if rate_per_sec else None
+    http = get_session(BOXSCORE_URL)
+
+    owns_writer = writer is None
+    if owns_writer:
+        writer = RawPayloadWriter()
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(_fetch_one, game_pk, http, limiter, writer): game_pk
+                for game_pk in game_pks
+            }
+            for future in as_completed(futures):
+                game_pk = futures[future]
+                try:
+                    results[game_pk] = future.result()
+                except Exception as exc:
+                    logger.error(f"Skipping game_pk {game_pk}: {exc}")
+    finally:
+        if owns_writer:
+            writer.flush()
+            stats = writer.stats()
+            logger.info(
+                f"raw.landing_boxscores: {stats['flushed']} payloads landed or updated, "
+                f"{stats['duplicates']} unchanged or duplicate, {stats['failed']} failed"
+            )
+        if limiter is not None:
+            for host, m in limiter.metrics().items():
+                logger.info(
+                    f"{host}: {m['requests']} requests so far, now at {m['rate']:.2f} req/s, "
+                    f"{m['throttled']} throttled, {m['retries']} retries, "
+                    f"{m['breaker_trips']} breaker trips"
+                )
+
+    # Landing failures surface here, for every game in the failed batches
+    writer.check()
+
+    pitching_rows = []
+    batting_rows = []
     for game_pk in game_pks:
-        try:
-            url = boxscore_base_url.format(game_pk)
-            response = session.get(url, timeout=session.timeout)
-            response.raise_for_status()
-            data = response.json()
-
-            insert_raw_payload(game_pk, data)
-
-            teams = data.get("teams") or {}
-            for side in ['away', 'home']:
-                s = teams.get(side) or {}
-                team_data = s.get("team") or {}
-                player_data = s.get("players") or {}
-
-                team_id = team_data.get("id")
-                for player_idx, player in player_data.items():
-                    batter_stats = player.get('stats') or {}
-                    batter_data = player.get('person') or {}
-                    position = player.get('position') or {}
-
-                    batting_stats = batter_stats.get('batting') or {}
-                    fielding_stats =batter_stats.get('fielding') or {}
-
-                    pitcher_stats = player.get("stats") or {}
-                    pitcher_data = player.get("person") or {}
-
-                    pitching_stats = pitcher_stats.get("pitching") or {}
-
-                    if pitching_stats:
-                        pitching_rows.append({
-                            "row_num": pitching_row,
-                            "pitcher_id": pitcher_data.get("id"),
-                            "pitcher_name": pitcher_data.get("fullName"),
-                            "game_pk": game_pk,
-                            "team_id": team_id,
-                            "team_name": team_data.get("name"),
-                            "is_starter_text": pitching_stats.get("gamesStarted"),
-                            "fly_outs_text": pitching_stats.get("flyOuts"),
-                            "ground_outs_text": pitching_stats.get("groundOuts"),
-                            "air_outs_text": pitching_stats.get("airOuts"),
-                            "runs_text": pitching_stats.get("runs"),
-                            "doubles_text": pitching_stats.get("doubles"),
-                            "triples_text": pitching_stats.get("triples"),
-                            "home_runs_text": pitching_stats.get("homeRuns"),
-                            "strike_outs_text": pitching_stats.get("strikeOuts"),
-                            "walks_text": pitching_stats.get("baseOnBalls"),
-                            "intentional_walks_text": pitching_stats.get("intentionalWalks"),
-                            "hits_text": pitching_stats.get("hits"),
-                            "hit_by_pitch_text": pitching_stats.get("hitByPitch"),
-                            "at_bats_text": pitching_stats.get("atBats"),
-                            "caught_stealing_text": pitching_stats.get("caughtStealing"),
-                            "stolen_bases_text": pitching_stats.get("stolenBases"),
-                            "stolen_base_percentage_text": pitching_stats.get("stolenBasePercentage"),
-                            "number_of_pitches_text": pitching_stats.get("numberOfPitches"),
-                            "innings_pitched_text": pitching_stats.get("inningsPitched"),
-                            "wins_text": pitching_stats.get("wins"),
-                            "losses_text": pitching_stats.get("losses"),
-                            "saves_text": pitching_stats.get("saves"),
-                            "save_opportunities_text": pitching_stats.get("saveOpportunities"),
-                            "holds_text": pitching_stats.get("holds"),
-                            "blown_saves_text": pitching_stats.get("blownSaves"),
-                            "earned_runs_text": pitching_stats.get("earnedRuns"),
-                            "batters_faced_text": pitching_stats.get("battersFaced"),
-                            "outs_text": pitching_stats.get("outs"),
-                            "complete_game_text": pitching_stats.get("completeGames"),
-                            "shutout_text": pitching_stats.get("shutouts"),
-                            "pitches_thrown_text": pitching_stats.get("pitchesThrown"),
-                            "balls_text": pitching_stats.get("balls"),
-                            "strikes_text": pitching_stats.get("strikes"),
-                            "strike_percentage_text": pitching_stats.get("strikePercentage"),
-                            "hit_batsmen_text": pitching_stats.get("hitBatsmen"),
-                            "balks_text": pitching_stats.get("balks"),
-                            "wild_pitches_text": pitching_stats.get("wildPitches"),
-                            "pickoffs_text": pitching_stats.get("pickoffs"),
-                            "rbi_text": pitching_stats.get("rbi"),
-                            "games_finished_text": pitching_stats.get("gamesFinished"),
-                            "runs_scored_per_9_text": pitching_stats.get("runsScoredPer9"),
-                            "home_runs_per_9_text": pitching_stats.get("homeRunsPer9"),
-                            "inherited_runners_text": pitching_stats.get("inheritedRunners"),
-                            "inherited_runners_scored_text": pitching_stats.get("inheritedRunnersScored"),
-                            "catchers_interference_text": pitching_stats.get("catchersInterference"),
-                            "sac_bunts_text": pitching_stats.get("sacBunts"),
-                            "sac_flies_text": pitching_stats.get("sacFlies"),
-                            "passed_ball_text": pitching_stats.get("passedBall"),
-                            "pop_outs_text": pitching_stats.get("popOuts"),
-                            "line_outs_text": pitching_stats.get("lineOuts"),
-                            "source": "MLB_stats_api"
-                        })
-
-                        pitching_row += 1
-
-                    if batting_stats:
-                        batting_rows.append({
-                            'row_num': batting_row,
-                            'batter_id': batter_data.get('id'),
-                            'batter_name': batter_data.get('fullName'),
-                            'game_pk': game_pk,
-                            'team_id': team_id,
-                            'team_name': team_data.get('name'),
-                            'position': position.get('abbreviation'),
-                            'ground_outs_text': batting_stats.get('groundOuts'),
-                            'air_outs_text': batting_stats.get('airOuts'),
-                            'runs_text': batting_stats.get('runs'),
-                            'doubles_text': batting_stats.get('doubles'),
-                            'triples_text': batting_stats.get('triples'),
-                            'home_runs_text': batting_stats.get('homeRuns'),
-                            'strikeouts_text': batting_stats.get('strikeOuts'),
-                            'walks_text': batting_stats.get('baseOnBalls'),
-                            'intentional_walks_text': batting_stats.get('intentionalWalks'),
-                            'hits_text': batting_stats.get('hits'),
-                            'hit_by_pitch_text': batting_stats.get('hitByPitch'),
-                            'at_bats_text': batting_stats.get('atBats'),
-                            'caught_stealing_text': batting_stats.get('caughtStealing'),
-                            'sb_text': batting_stats.get('stolenBases'),
-                            'sb_pct_text': batting_stats.get('stolenBasePercentage'),
-                            'plate_appearances_text': batting_stats.get('plateAppearances'),
-                            'total_bases_text': batting_stats.get('totalBases'),
-                            'rbi_text': batting_stats.get('rbi') ,
-                            'errors_text': fielding_stats.get('errors'),
-                            "source": "MLB_stats_api"
-                        })
-                        
-                        batting_row += 1
-        except Exception as exc:
-            logger.error(f"Skipping game_pk {game_pk}: {exc}")
+        if game_pk not in results:
             continue
-        
+        game_pitching, game_batting = results.pop(game_pk)
+        for row in game_pitching:
+            row['row_num'] = len(pitching_rows)
+            pitching_rows.append(row)
+        for row in game_batting:
+            row['row_num'] = len(batting_rows)
+            batting_rows.append(row)
+
     return pitching_rows, batting_rows
 
+def _number_rows(rows: list) -> list:
+    for i, row in enumerate(rows):
+        row['row_num'] = i
+    return rows
+
+def replay_boxscores(game_pks: list | None = None, yield_per: int = REPLAY_YIELD_PER) -> list:
+    """
+    Rebuild boxscore rows from payloads already in raw.landing_boxscores,
+    without calling the MLB API.
+
+    Payloads are streamed with a server-side cursor and flattened with the
+    same mapping fetch_boxscores uses.
+
+    Args:
+        game_pks: Games to replay (None = every landed game)
+        yield_per: Rows fetched per server-side cursor round trip
+
+    Returns:
+        (pitching_rows, batting_rows) in the fetch_boxscores shape
+    """
+    query = "SELECT game_pk, payload FROM raw.landing_boxscores"
+    params = {}
+    if game_pks is not None:
+        query += " WHERE game_pk = ANY(:game_pks)"
+        params['game_pks'] = [int(pk) for pk in game_pks]
+    query += " ORDER BY game_pk"
+
+    pitching_rows = []
+    batting_rows = []
+    n_games = 0
+
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=yield_per
+        ).execute(text(query), params)
+
+        for game_pk, payload in result:
+            if isinstance(payload, str):
+                payload = json.loads(payload)
+            try:
+                game_pitching, game_batting = _parse_boxscore(game_pk, payload)
+            except Exception as exc:
+                logger.error(f"Skipping replay of game_pk {game_pk}: {exc}")
+                continue
+            pitching_rows.extend(game_pitching)
+            batting_rows.extend(game_batting)
+            n_games += 1
+
+    logger.info(f"Replayed {n_games} landed boxscores")
+    return _number_rows(pitching_rows), _number_rows(batting_rows)
+
 def load_to_psql(df: pd.DataFrame, table_name: str):
     with engine.begin() as conn:
+        # games are only fetched when not fully loaded; drop any partial load
+        conn.execute(
+            text(f"DELETE FROM raw.{table_name} WHERE game_pk = ANY(:game_pks)"),
+            {'game_pks': [int(pk) for pk in df['game_pk'].unique()]}
+        )
         df.to_sql(
             table_name,
             conn,
@@ -245,17 +663,112 @@ def load_to_psql(df: pd.DataFrame, table_name: str):
         )
 
 
-def fetch_and_load_boxscores(start_date: str, end_date: str):
-    game_pks = []
+def upsert_raw_dim_game(df: pd.DataFrame) -> int:
+    """
+    Upsert schedule rows into raw.dim_game on (game_pk, home_team_id,
+    away_team_id); rows whose values did not change are left untouched.
+
+    Returns:
+        Rows inserted or updated
+    """
+    df = df.drop_duplicates(subset=RAW_GAME_KEY, keep='last')
+    records = [
+        {
+            k: (str(v) if k.endswith('_text') and v is not None else v)
+            for k, v in rec.items()
+        }
+        for rec in df.to_dict('records')
+    ]
+
+    if not records:
+        return 0
+
+    raw_game = Table('dim_game', MetaData(), schema='raw', autoload_with=engine)
+    update_cols = [c for c in df.columns if c not in RAW_GAME_KEY]
+
+    # One multi-VALUES statement per chunk keeps each under Postgres's
+    # 65,535 bind-parameter limit on multi-season backfills
+    upserted = 0
+    with engine.begin() as conn:
+        for i in range(0, len(records), RAW_GAME_UPSERT_CHUNK):
+            stmt = pg_insert(raw_game).values(records[i:i + RAW_GAME_UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=RAW_GAME_KEY,
+                set_={c: stmt.excluded[c] for c in update_cols},
+                where=or_(*[raw_game.c[c].is_distinct_from(stmt.excluded[c]) for c in update_cols])
+            )
+            upserted += conn.execute(stmt).rowcount
+    return upserted
+
+
+def games_to_fetch(game_pks: list, final_only: bool = True) -> list:
+    """
+    Drop games whose rows are already in raw.pitching_boxscores and
+    raw.batting_boxscores (and, with final_only, games the schedule index
+    does not have as final, or has as postponed, cancelled or suspended)
+    before any request is made.
+
+    Landing rows are committed during the fetch but the raw tables are loaded
+    afterwards, so the check is against the raw tables: a game that was
+    landed but never loaded (failed load, killed process) is fetched again,
+    and its landing payload is replaced if it changed. Not-played games
+    would land an empty boxscore while the game_pk is still to be played.
 
+    Returns:
+        The remaining game_pks, in input order
+    """
+    if not game_pks:
+        return []
+
+    params = {'game_pks': [int(pk) for pk in game_pks]}
+    with engine.connect() as conn:
+        loaded = set(conn.execute(text("""
+            SELECT p.game_pk
+            FROM (SELECT DISTINCT game_pk FROM raw.pitching_boxscores WHERE game_pk = ANY(:game_pks)) p
+            JOIN (SELECT DISTINCT game_pk FROM raw.batting_boxscores WHERE game_pk = ANY(:game_pks)) b
+                ON b.game_pk = p.game_pk
+        """), params).scalars())
+
+        final = None
+        if final_only:
+            final = set(conn.execute(text("""
+                SELECT game_pk
+                FROM raw.schedule_games
+                WHERE game_pk = ANY(:game_pks)
+                    AND abstract_state = :final_state
+                    AND NOT (coalesce(detailed_state, '') LIKE ANY(:not_played))
+            """), {
+                **params,
+                'final_state': FINAL_STATE,
+                'not_played': [f"{state}%" for state in NOT_PLAYED_STATES],
+            }).scalars())
+
+    pending = [pk for pk in game_pks if pk not in loaded]
+    todo = [pk for pk in pending if final is None or pk in final]
+    logger.info(
+        f"Boxscores: fetching {len(todo)} of {len(game_pks)} games "
+        f"({len(game_pks) - len(pending)} already loaded, "
+        f"{len(pending) - len(todo)} not final or not played)"
+    )
+    return todo
+
+
+def fetch_and_load_boxscores(start_date: str, end_date: str, final_only: bool = True):
     game_pks, dim_game_df = _fetch_game_table(start_date, end_date)
     if not dim_game_df.empty:
-        load_to_psql(dim_game_df, 'dim_game')
+        n = upsert_raw_dim_game(dim_game_df)
+        print(f'raw.dim_game: {n} of {len(dim_game_df)} games inserted or updated')
     else:
         print('No dim_game dataframe to load')
 
     print(f'Found {len(game_pks)} games')
 
+    # Games whose raw rows are loaded are not requested again
+    game_pks = games_to_fetch(game_pks, final_only=final_only)
+    if not game_pks:
+        print('No new boxscores to fetch')
+        return
+
     pitching_boxscore, batting_boxscore = fetch_boxscores(game_pks)
 
     if len(pitching_boxscore) > 0:
@@ -268,4 +781,61 @@ def fetch_and_load_boxscores(start_date: str, end_date: str):
         df_bat = pd.DataFrame(batting_boxscore)
         load_to_psql(df_bat, 'batting_boxscores')
     else:
-        print('No batting boxscores to load')
\ No newline at end of file
+        print('No batting boxscores to load')
+
+def replay_and_load_boxscores(
+    game_pks: list | None = None,
+    replace: bool = True,
+    start_date: str | None = None,
+    end_date: str | None = None,
+):
+    """
+    Re-derive raw.pitching_boxscores / raw.batting_boxscores from
+    raw.landing_boxscores.
+
+    Args:
+        game_pks: Games to replay (None = every landed game)
+        replace: Delete existing raw rows for the replayed games first, so the
+            staging DISTINCT ON picks up the new mapping
+        start_date / end_date: Only replay games the schedule index
+            (raw.schedule_games) has in this inclusive date range
+    """
+    if start_date is not None or end_date is not None:
+        if start_date is None or end_date is None:
+            raise ValueError("Pass both start_date and end_date to scope a replay")
+        scheduled = _indexed_game_pks(start_date, end_date)
+        if game_pks is not None:
+            wanted = {int(pk) for pk in game_pks}
+            scheduled = [pk for pk in scheduled if pk in wanted]
+        game_pks = scheduled
+        if not game_pks:
+            logger.warning(f"No indexed games between {start_date} and {end_date}; nothing to replay")
+            return
+
+    pitching_boxscore, batting_boxscore = replay_boxscores(game_pks)
+
+    for rows, table_name in (
+        (pitching_boxscore, 'pitching_boxscores'),
+        (batting_boxscore, 'batting_boxscores'),
+    ):
+        if not rows:
+            print(f'No {table_name} to replay')
+            continue
+
+        df = pd.DataFrame(rows)
+        with engine.begin() as conn:
+            if replace:
+                conn.execute(
+                    text(f"DELETE FROM raw.{table_name} WHERE game_pk = ANY(:game_pks)"),
+                    {'game_pks': [int(pk) for pk in df['game_pk'].unique()]}
+                )
+            df.to_sql(
+                table_name,
+                conn,
+                schema='raw',
+                if_exists='append',
+                index=False,
+                method="multi",
+                chunksize=50
+            )
+        print(f'Replayed {len(df)} rows into raw.{table_name}')
@@ -1,16 +1,98 @@
+import os
 import json
 import pandas as pd
 from datetime import datetime, date
 
 from sqlalchemy import create_engine, text
 from utils.utils import build_db_url
-from utils.retry import build_retry_session
-
-session = build_retry_session(timeout=15)
-
-def extract_and_save_dim_player(parquet_path: str):
-    players_url = 'https://statsapi.mlb.com/api/v1/sports/1/players'
-
+from utils.retry import get_session, get_limiter
+from utils.http_cache import get_json_cached
+
+PLAYERS_URL = 'https://statsapi.mlb.com/api/v1/sports/1/players'
+session = get_session(PLAYERS_URL)
+ROSTER_CACHE_NAME = os.path.join('cache', 'mlb_players.json')
+
+
+def _player_row(player: dict, today: date) -> dict:
+    current_team = player.get('currentTeam')
+    primary_position = player.get('primaryPosition')
+    bat_side = player.get('batSide')
+    pitch_hand = player.get('pitchHand')
+
+    if player.get('draftYear') is None:
+        draft_year = 0
+    else:
+        draft_year = player.get('draftYear')
+
+    birth_date = player.get('birthDate')
+    birth_date_dt = datetime.strptime(birth_date, '%Y-%m-%d').date()
+    age = today.year - birth_date_dt.year - ((today.month, today.day) < (birth_date_dt.month, birth_date_dt.day))
+
+    return {
+        'player_id': player.get('id'),
+        'full_name': player.get('fullName'),
+        'team_id': current_team.get('id'),
+        'first_name': player.get('useName'),
+        'last_name': player.get('useLastName'),
+        'birth_date': birth_date_dt,
+        'age': age,
+        'height': player.get('height'),
+        'weight': player.get('weight'),
+        'active': player.get('active'),
+        'primary_position_code': primary_position.get('code'),
+        'primary_position': primary_position.get('abbreviation'),
+        'draft_year' : draft_year,
+        'mlb_debut_date': player.get('mlbDebutDate'),
+        'bat_side': bat_side.get('code'),
+        'pitch_hand': pitch_hand.get('code'),
+        'sz_top': player.get('strikeZoneTop'),
+        'sz_bot': player.get('strikeZoneBottom')
+    }
+
+
+def _row_keys(df: pd.DataFrame) -> pd.Series:
+    """player_id -> comparable attribute string (NaN/None and dtype differences normalized)."""
+    cols = sorted(df.columns)
+    values = df[cols].astype(object).where(df[cols].notna(), None)
+    return pd.Series(
+        [json.dumps(row, default=str) for row in values.itertuples(index=False, name=None)],
+        index=df['player_id'].to_numpy()
+    )
+
+
+def changed_players(df_new: pd.DataFrame, df_old: pd.DataFrame | None) -> pd.DataFrame:
+    """Rows of df_new that are new or whose attributes differ from df_old (by player_id)."""
+    if df_old is None or df_old.empty or df_new.empty:
+        return df_new
+    if set(df_old.columns) != set(df_new.columns):
+        return df_new
+
+    new_keys = _row_keys(df_new)
+    old_keys = _row_keys(df_old[df_new.columns])
+    old = old_keys.reindex(new_keys.index)
+    changed = (old != new_keys).to_numpy()
+    return df_new[changed]
+
+
+def extract_and_save_dim_player(parquet_path: str, roster_cache: str = None) -> str | None:
+    """
+    Build dim_player rows for every player seen in staging.statcast_pitches.
+
+    The /sports/1/players roster is revalidated against a cached snapshot
+    (ETag / If-Modified-Since) rather than re-downloaded. Players that are new
+    or changed since the snapshot at parquet_path are written next to it as
+    <name>_changes.parquet. The new full snapshot is staged as
+    <name>_pending.parquet and only replaces parquet_path when
+    commit_dim_player_snapshot is called after a successful load, so a failed
+    load is diffed and retried on the next run.
+
+    Args:
+        parquet_path: Full dim_player snapshot
+        roster_cache: Roster JSON snapshot (default: cache/ next to parquet_path)
+
+    Returns:
+        Path to the changes parquet, or None when no player changed
+    """
     engine = create_engine(build_db_url())
 
     sql_query = '''
@@ -23,71 +105,69 @@ def extract_and_save_dim_player(parquet_path: str):
         WHERE batter IS NOT NULL;
     '''
 
-    player_ids = []
-    showing_ids = []
-    
-    with engine.begin() as conn: 
+    player_ids = set()
+
+    with engine.begin() as conn:
         rows = conn.execute(text(sql_query))
-        
+
         id_list = rows.fetchall()
-        
+
         if id_list:
-            player_ids = [x[0] for x in id_list]
+            player_ids = {x[0] for x in id_list}
             print(f"players: {len(player_ids)}")
         else:
             print("no id_list")
 
-    response = session.get(players_url, timeout=session.timeout)
-    response.raise_for_status()
+    if roster_cache is None:
+        roster_cache = os.path.join(os.path.dirname(parquet_path) or '.', ROSTER_CACHE_NAME)
 
-    data = response.json()
+    data, roster_changed = get_json_cached(
+        session, PLAYERS_URL, roster_cache, timeout=15, limiter=get_limiter(PLAYERS_URL)
+    )
+    if not roster_changed:
+        print("Roster not modified; using cached snapshot")
 
-    players = data.get('people') or []
+    # Keyed index: one dict lookup per seen player instead of a list scan per roster entry
+    players_by_id = {player.get('id'): player for player in data.get('people') or []}
 
-    player_list = []
+    today = date.today()
+    player_list = [
+        _player_row(players_by_id[player_id], today)
+        for player_id in sorted(player_ids)
+        if player_id in players_by_id
+    ]
 
-    for player in players:
-        if player.get('id') not in player_ids:
-            continue
+    df = pd.DataFrame(player_list)
 
-        current_team = player.get('currentTeam')
-        primary_position = player.get('primaryPosition')
-        bat_side = player.get('batSide')
-        pitch_hand = player.get('pitchHand')
+    df_old = pd.read_parquet(parquet_path) if os.path.exists(parquet_path) else None
+    df_changed = changed_players(df, df_old)
+    print(f"dim_player: {len(df_changed)} of {len(df)} players new or changed")
 
-        if player.get('draftYear') is None:
-            draft_year = 0
-        else:
-            draft_year = player.get('draftYear')
-
-        today = date.today()
-        birth_date = player.get('birthDate')
-        birth_date_dt = datetime.strptime(birth_date, '%Y-%m-%d').date()
-        age = today.year - birth_date_dt.year - ((today.month, today.day) < (birth_date_dt.month, birth_date_dt.day))
-
-        player_list.append({
-            'player_id': player.get('id'),
-            'full_name': player.get('fullName'),
-            'team_id': current_team.get('id'),
-            'first_name': player.get('useName'),
-            'last_name': player.get('useLastName'),
-            'birth_date': birth_date_dt,
-            'age': age,
-            'height': player.get('height'),
-            'weight': player.get('weight'),
-            'active': player.get('active'),
-            'primary_position_code': primary_position.get('code'),
-            'primary_position': primary_position.get('abbreviation'),
-            'draft_year' : draft_year,
-            'mlb_debut_date': player.get('mlbDebutDate'),
-            'bat_side': bat_side.get('code'),
-            'pitch_hand': pitch_hand.get('code'),
-            'sz_top': player.get('strikeZoneTop'),
-            'sz_bot': player.get('strikeZoneBottom')
-        })
-
-        showing_ids.append(player.get('id'))
+    df.to_parquet(_pending_path(parquet_path))
 
-    df = pd.DataFrame(player_list)
-    
-    df.to_parquet(parquet_path)
+    if df_changed.empty:
+        commit_dim_player_snapshot(parquet_path)
+        return None
+
+    changes_path = f"{os.path.splitext(parquet_path)[0]}_changes.parquet"
+    df_changed.to_parquet(changes_path)
+    return changes_path
+
+
+def _pending_path(parquet_path: str) -> str:
+    return f"{os.path.splitext(parquet_path)[0]}_pending.parquet"
+
+
+def commit_dim_player_snapshot(parquet_path: str) -> bool:
+    """
+    Promote the pending snapshot written by extract_and_save_dim_player to
+    parquet_path. Call only once its changes are loaded.
+
+    Returns:
+        False when there was no pending snapshot
+    """
+    pending = _pending_path(parquet_path)
+    if not os.path.exists(pending):
+        return False
+    os.replace(pending, parquet_path)
+    return True
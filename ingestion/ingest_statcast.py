@@ -6,15 +6,28 @@ import hashlib
 import json
 import uuid
 import logging
+from datetime import date, datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from utils.utils import build_db_url
 from utils.retry import retry_call
+from utils.statcast_dataset import write_statcast_dataset
+from utils.change_tracking import game_fingerprints, record_game_changes
 
 logger = logging.getLogger(__name__)
 
 STATCAST_TIMEOUT = 90
 STATCAST_MAX_RETRIES = 3
 STATCAST_BACKOFF_FACTOR = 1.5
+STATCAST_WINDOW_DAYS = 7
+STATCAST_MAX_WORKERS = 4
+STATCAST_WINDOW_TYPE = "statcast_pitcher_window"
+
+# Cache freshness: a pull made at least CACHE_FROZEN_AFTER_DAYS after its
+# end_date already has the late Statcast corrections and is always reused;
+# earlier pulls are reused only within CACHE_MAX_AGE_HOURS of being made.
+CACHE_FROZEN_AFTER_DAYS = 3
+CACHE_MAX_AGE_HOURS = 12
 
 engine = create_engine(build_db_url(database='mlb_fantasy'), pool_pre_ping=False)
 
@@ -49,21 +62,13 @@ def extract_sprint_speed(year, attempts=50):
 
     return df
 
-def write_and_register_parquet(
+def register_landing_file(
     df: pd.DataFrame,
     start_date: str,
     end_date: str,
-    query_params:dict,
-    base_folder: str = "E:/data_analytics/mlb_pipeline/data/"
+    query_params: dict,
+    file_path: str
 ) -> str:
-    os.makedirs(base_folder, exist_ok=True)
-
-    run_id = str(uuid.uuid4())
-    file_name = f"statcast_pitching_{start_date}_{end_date}_{run_id}.parquet"
-    file_path = os.path.join(base_folder, file_name)
-
-    df.to_parquet(file_path, index=False)
-
     row_count = len(df)
     schema_signature = "|".join(
         f"{col}:{str(dtype)}" for col, dtype in df.dtypes.items()
@@ -72,7 +77,7 @@ def write_and_register_parquet(
     schema_hash = hashlib.sha256(schema_signature.encode("utf-8")).hexdigest()
 
     with engine.begin() as conn:
-        conn.execute(text("""
+        run_id = conn.execute(text("""
             INSERT INTO raw.landing_statcast_files (
                 start_date,
                 end_date,
@@ -89,6 +94,7 @@ def write_and_register_parquet(
                 :file_path,
                 :query_params
             )
+            RETURNING run_id
         """),
         {
             "start_date": start_date,
@@ -98,33 +104,241 @@ def write_and_register_parquet(
             "file_path": file_path,
             "query_params": json.dumps(query_params),
         }
-    )
+    ).scalar()
+
+    return str(run_id)
+
+def write_and_register_parquet(
+    df: pd.DataFrame,
+    start_date: str,
+    end_date: str,
+    query_params:dict,
+    base_folder: str = "E:/data_analytics/mlb_pipeline/data/"
+) -> str:
+    os.makedirs(base_folder, exist_ok=True)
+
+    run_id = str(uuid.uuid4())
+    file_name = f"statcast_pitching_{start_date}_{end_date}_{run_id}.parquet"
+    file_path = os.path.join(base_folder, file_name)
+
+    df.to_parquet(file_path, index=False)
+
+    register_landing_file(df, start_date, end_date, query_params, file_path)
 
     return file_path
 
+def write_and_register_dataset(
+    df: pd.DataFrame,
+    start_date: str,
+    end_date: str,
+    query_params: dict,
+    dataset_dir: str
+) -> str:
+    """
+    Write df into the season/game_date partitioned dataset at dataset_dir
+    (replacing the partitions it covers), register it as one landing file and
+    record the games it added or changed against raw.game_fingerprints.
+
+    dataset_dir is shared by every pull; the registered start_date/end_date
+    are the pull's partition bounds, and readers must pass them to
+    read_statcast_source to get only this pull back.
+    """
+    n = write_statcast_dataset(df, dataset_dir)
+    logger.info(f"Wrote {n} rows to dataset {dataset_dir}")
+
+    run_id = register_landing_file(df, start_date, end_date, query_params, dataset_dir)
+    changed = record_game_changes('statcast', game_fingerprints(df), run_id=run_id)
+    print(f"Statcast pull changed {len(changed)} games")
+
+    return dataset_dir
+
+def date_windows(start_date: str, end_date: str, window_days: int = STATCAST_WINDOW_DAYS) -> list[tuple[str, str]]:
+    """Split an inclusive date range into consecutive [start, end] windows."""
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    if end < start:
+        raise ValueError(f"end_date {end_date} is before start_date {start_date}")
+
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=window_days - 1), end)
+        windows.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + timedelta(days=1)
+    return windows
+
+def is_cache_fresh(
+    end_date,
+    pulled_at: datetime,
+    frozen_after_days: int = CACHE_FROZEN_AFTER_DAYS,
+    max_age_hours: float = CACHE_MAX_AGE_HOURS,
+    now: datetime | None = None,
+) -> bool:
+    """Whether a registered pull of [.., end_date] made at pulled_at can be reused."""
+    if now is None:
+        now = datetime.now(timezone.utc)
+    if isinstance(end_date, str):
+        end_date = date.fromisoformat(end_date)
+    if pulled_at.tzinfo is None:
+        pulled_at = pulled_at.replace(tzinfo=timezone.utc)
+
+    # Frozen only if the pull itself happened after the window settled
+    if pulled_at.astimezone(timezone.utc).date() >= end_date + timedelta(days=frozen_after_days):
+        return True
+
+    return now - pulled_at <= timedelta(hours=max_age_hours)
+
+def find_cached_pull(query_params: dict, **freshness) -> str | None:
+    """
+    Latest registered parquet for exactly these query_params that still exists
+    on disk and passes is_cache_fresh, or None.
+    """
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT end_date, pulled_at, file_path
+            FROM raw.landing_statcast_files
+            WHERE query_params = CAST(:query_params AS JSONB)
+            ORDER BY pulled_at DESC
+        """), {"query_params": json.dumps(query_params)}).fetchall()
+
+    for end_date, pulled_at, file_path in rows:
+        if not os.path.exists(file_path):
+            continue
+        if is_cache_fresh(end_date, pulled_at, **freshness):
+            return file_path
+        return None
+    return None
+
+def landed_windows(start_date: str, end_date: str, **freshness) -> dict[tuple[str, str], str]:
+    """
+    Window parts registered in raw.landing_statcast_files that still exist and
+    pass is_cache_fresh, keyed by (start_date, end_date).
+    """
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT start_date, end_date, pulled_at, file_path
+            FROM raw.landing_statcast_files
+            WHERE query_params->>'type' = :type
+            AND start_date >= :start_date
+            AND end_date <= :end_date
+            ORDER BY pulled_at
+        """), {"type": STATCAST_WINDOW_TYPE, "start_date": start_date, "end_date": end_date}).fetchall()
+
+    # later pulls of the same window win
+    landed = {}
+    for window_start, window_end, pulled_at, file_path in rows:
+        if os.path.exists(file_path) and is_cache_fresh(window_end, pulled_at, **freshness):
+            landed[(str(window_start), str(window_end))] = file_path
+    return landed
+
+def _extract_window(start_date: str, end_date: str, parts_dir: str) -> str:
+    df = extract_statcast(start_date, end_date)
+    query_params = {
+        "type": STATCAST_WINDOW_TYPE,
+        "start_date": start_date,
+        "end_date": end_date
+    }
+    return write_and_register_parquet(df, start_date, end_date, query_params, parts_dir)
+
+def extract_statcast_windows(
+    start_date: str,
+    end_date: str,
+    parts_dir: str,
+    window_days: int = STATCAST_WINDOW_DAYS,
+    max_workers: int = STATCAST_MAX_WORKERS,
+    use_cache: bool = True,
+) -> list[str]:
+    """
+    Pull Statcast in date windows on a worker pool, checkpointing each window
+    to its own registered parquet part.
+
+    Each window gets its own retry_call budget. Windows already registered in
+    raw.landing_statcast_files that pass is_cache_fresh are reused, so a failed
+    run resumes from the windows it has not landed yet and past-date windows
+    are never pulled twice (use_cache=False forces a full re-pull).
+
+    Returns:
+        Part file paths in date order
+
+    Raises:
+        RuntimeError if any window still fails after its retries (good windows
+        are already checkpointed)
+    """
+    windows = date_windows(start_date, end_date, window_days)
+    done = landed_windows(start_date, end_date) if use_cache else {}
+
+    todo = [w for w in windows if w not in done]
+    logger.info(
+        f"Statcast {start_date} to {end_date}: {len(windows)} windows, "
+        f"{len(windows) - len(todo)} already landed"
+    )
+
+    failed = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(_extract_window, w[0], w[1], parts_dir): w
+            for w in todo
+        }
+        for future in as_completed(futures):
+            window = futures[future]
+            try:
+                done[window] = future.result()
+            except Exception as exc:
+                logger.error(f"Statcast window {window[0]} to {window[1]} failed: {exc}")
+                failed[window] = exc
+
+    if failed:
+        raise RuntimeError(
+            f"{len(failed)} Statcast windows failed: {sorted(failed)}. "
+            f"Re-run to resume from the landed windows."
+        )
+
+    return [done[w] for w in windows]
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DEFAULT_DATA_DIR = os.path.join(BASE_DIR, 'data')
 
 
-def extract_and_save_statcast(years: list, start_date: str, end_date: str, data_dir: str = None, engine=None) -> str:
+def extract_and_save_statcast(years: list, start_date: str, end_date: str, data_dir: str = None, engine=None, use_cache: bool = True) -> str:
     """
-    Callable entry point for pipeline - extracts statcast data and saves to parquet.
+    Callable entry point for pipeline - extracts statcast data and saves it to a
+    partitioned parquet dataset.
 
     Args:
         start_date: Start date in YYYY-MM-DD format
         end_date: End date in YYYY-MM-DD format
-        data_dir: Directory for output parquet file (default: project data/)
+        data_dir: Root for window parts and the partitioned dataset (default: project data/)
         engine: SQLAlchemy engine (uses module default if not provided)
+        use_cache: Reuse a fresh registered pull with the same query params
 
     Returns:
-        Path to the saved parquet file
+        Path to the season=/game_date= partitioned Statcast dataset; it holds
+        every landed pull, so read it with start_date/end_date
     """
     if data_dir is None:
         data_dir = DEFAULT_DATA_DIR
 
-    print(f"Extracting statcast data from {start_date} to {end_date}...")
-    df = extract_statcast(start_date, end_date)
-    print(f"Extracted {len(df)} pitch records")
+    query_params = {
+        "type": "statcast_pitcher",
+        "start_date": start_date,
+        "end_date": end_date
+    }
+
+    file_path = find_cached_pull(query_params) if use_cache else None
+    if file_path is not None:
+        print(f"Reusing cached statcast pull: {file_path}")
+    else:
+        print(f"Extracting statcast data from {start_date} to {end_date}...")
+        parts = extract_statcast_windows(
+            start_date, end_date, os.path.join(data_dir, 'statcast_parts'), use_cache=use_cache
+        )
+        frames = [part for part in (pd.read_parquet(p) for p in parts) if not part.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        print(f"Extracted {len(df)} pitch records from {len(parts)} windows")
+
+        file_path = write_and_register_dataset(
+            df, start_date, end_date, query_params, os.path.join(data_dir, 'statcast')
+        )
+        print(f"Saved statcast dataset to: {file_path}")
 
     df_run = pd.DataFrame()
     for year in years:
@@ -133,13 +347,4 @@ def extract_and_save_statcast(years: list, start_date: str, end_date: str, data_
     if not df_run.empty:
         df_run.to_parquet('data/sprint_speed.parquet')
 
-    query_params = {
-        "type": "statcast_pitcher",
-        "start_date": start_date,
-        "end_date": end_date
-    }
-
-    file_path = write_and_register_parquet(df, start_date, end_date, query_params, data_dir)
-    print(f"Saved parquet to: {file_path}")
-
     return file_path
\ No newline at end of file
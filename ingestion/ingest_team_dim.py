@@ -3,14 +3,13 @@ import json
 
 from sqlalchemy import create_engine, text
 from utils.utils import build_db_url
-from utils.retry import build_retry_session
+from utils.retry import get_session, get_limiter, limited_get
 
-session=build_retry_session()
+TEAMS_URL = 'https://statsapi.mlb.com/api/v1/teams'
+session=get_session(TEAMS_URL)
 
 def fetch_team_dim() -> list[int]:
-    teams_url = 'https://statsapi.mlb.com/api/v1/teams'
-
-    response = session.get(teams_url, timeout=session.timeout)
+    response = limited_get(session, TEAMS_URL, get_limiter(TEAMS_URL), timeout=10)
     response.raise_for_status()
 
     data = response.json()
@@ -0,0 +1,104 @@
+from schema.spec_engine import TableSpec, ColumnSpec
+
+# Per-game pitch-type profile (v_game_level_pitch_type_profile), maintained
+# game by game by load_game_pitch_type_agg.sql
+AGG_GAME_PITCH_TYPE_COLS: dict[str, ColumnSpec] = {
+    'agg_id': ColumnSpec(
+        name='agg_id',
+        dtype='BigInteger',
+        nullable=False,
+        primary_key=True,
+        identity=True  # BIGSERIAL
+    ),
+    'game_pk': ColumnSpec(
+        name='game_pk',
+        dtype='BigInteger',
+        nullable=False
+    ),
+    'pitcher_id': ColumnSpec(
+        name='pitcher_id',
+        dtype='BigInteger',
+        nullable=False
+    ),
+    'pitch_type': ColumnSpec(
+        name='pitch_type',
+        dtype='Text'
+    ),
+    'batter_stand': ColumnSpec(
+        name='batter_stand',
+        dtype='Text'
+    ),
+    'pitch_name': ColumnSpec(
+        name='pitch_name',
+        dtype='Text'
+    ),
+    'pitches': ColumnSpec(
+        name='pitches',
+        dtype='Integer',
+        nullable=False
+    ),
+    'avg_move_in': ColumnSpec(
+        name='avg_move_in',
+        dtype='Float'
+    ),
+    'avg_ivb_in': ColumnSpec(
+        name='avg_ivb_in',
+        dtype='Float'
+    ),
+    'bat_contact_rate': ColumnSpec(
+        name='bat_contact_rate',
+        dtype='Float'
+    ),
+    'batted_balls': ColumnSpec(
+        name='batted_balls',
+        dtype='Integer'
+    ),
+    'inplay_contact_rate': ColumnSpec(
+        name='inplay_contact_rate',
+        dtype='Float'
+    ),
+    'csw_pct': ColumnSpec(
+        name='csw_pct',
+        dtype='Float'
+    ),
+    'swing_rate': ColumnSpec(
+        name='swing_rate',
+        dtype='Float'
+    ),
+    'whiff_rate': ColumnSpec(
+        name='whiff_rate',
+        dtype='Float'
+    ),
+    'avg_xwoba_on_bip': ColumnSpec(
+        name='avg_xwoba_on_bip',
+        dtype='Float'
+    ),
+    'hard_hit_rate_on_bip': ColumnSpec(
+        name='hard_hit_rate_on_bip',
+        dtype='Float'
+    ),
+    'sweet_spot_rate_on_bip': ColumnSpec(
+        name='sweet_spot_rate_on_bip',
+        dtype='Float'
+    ),
+    'usage_pct': ColumnSpec(
+        name='usage_pct',
+        dtype='Float'
+    ),
+    'total_pitches': ColumnSpec(
+        name='total_pitches',
+        dtype='Integer'
+    ),
+    'created_at': ColumnSpec(
+        name='created_at',
+        dtype='TIMESTAMP(timezone=True)',
+        nullable=False,
+        server_default='now()'
+    ),
+}
+
+AGG_GAME_PITCH_TYPE_SPEC = TableSpec(
+    name='agg_game_pitch_type',
+    pk=['agg_id'],
+    columns=AGG_GAME_PITCH_TYPE_COLS
+)
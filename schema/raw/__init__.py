@@ -8,6 +8,18 @@ from schema.raw.boxscores import (
     LANDING_BOXSCORES_SPEC,
     LANDING_BOXSCORES_COLUMNS
 )
+from schema.raw.game_changes import (
+    GAME_FINGERPRINTS_SPEC,
+    GAME_FINGERPRINTS_COLUMNS,
+    GAME_CHANGES_SPEC,
+    GAME_CHANGES_COLUMNS
+)
+from schema.raw.schedule import (
+    SCHEDULE_GAMES_SPEC,
+    SCHEDULE_GAMES_COLUMNS,
+    SCHEDULE_DAYS_SPEC,
+    SCHEDULE_DAYS_COLUMNS
+)
 
 __all__ = [
     'LANDING_STATCAST_FILES_SPEC',
@@ -16,4 +28,12 @@ __all__ = [
     'PITCHING_BOXSCORES_COLUMNS',
     'LANDING_BOXSCORES_SPEC',
     'LANDING_BOXSCORES_COLUMNS',
+    'GAME_FINGERPRINTS_SPEC',
+    'GAME_FINGERPRINTS_COLUMNS',
+    'GAME_CHANGES_SPEC',
+    'GAME_CHANGES_COLUMNS',
+    'SCHEDULE_GAMES_SPEC',
+    'SCHEDULE_GAMES_COLUMNS',
+    'SCHEDULE_DAYS_SPEC',
+    'SCHEDULE_DAYS_COLUMNS',
 ]
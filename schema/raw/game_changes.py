@@ -0,0 +1,85 @@
+from schema.spec_engine import ColumnSpec, TableSpec
+
+# Latest content fingerprint per game and source ('statcast', 'boxscore')
+GAME_FINGERPRINTS_COLUMNS: dict[str, ColumnSpec] = {
+    'game_pk': ColumnSpec(
+        name='game_pk',
+        dtype='BigInteger',
+        nullable=False,
+        primary_key=True
+    ),
+    'source': ColumnSpec(
+        name='source',
+        dtype='Text',
+        nullable=False,
+        primary_key=True
+    ),
+    'content_hash': ColumnSpec(
+        name='content_hash',
+        dtype='Text',
+        nullable=False
+    ),
+    'row_count': ColumnSpec(
+        name='row_count',
+        dtype='Integer'
+    ),
+    'updated_at': ColumnSpec(
+        name='updated_at',
+        dtype='TIMESTAMP(timezone=True)',
+        nullable=False,
+        server_default='now()'
+    ),
+}
+
+GAME_FINGERPRINTS_SPEC = TableSpec(
+    name='game_fingerprints',
+    pk=['game_pk', 'source'],
+    columns=GAME_FINGERPRINTS_COLUMNS
+)
+
+# One row per game added or changed by an ingestion run
+GAME_CHANGES_COLUMNS: dict[str, ColumnSpec] = {
+    'change_id': ColumnSpec(
+        name='change_id',
+        dtype='BigInteger',
+        nullable=False,
+        primary_key=True,
+        identity=True
+    ),
+    'detected_at': ColumnSpec(
+        name='detected_at',
+        dtype='TIMESTAMP(timezone=True)',
+        nullable=False,
+        server_default='now()'
+    ),
+    'run_id': ColumnSpec(
+        name='run_id',
+        dtype='UUID'
+    ),
+    'source': ColumnSpec(
+        name='source',
+        dtype='Text',
+        nullable=False
+    ),
+    'game_pk': ColumnSpec(
+        name='game_pk',
+        dtype='BigInteger',
+        nullable=False
+    ),
+    'change_type': ColumnSpec(
+        name='change_type',
+        dtype='Text',
+        nullable=False
+    ),
+    # set once an incremental run has loaded the game through production
+    'loaded_at': ColumnSpec(
+        name='loaded_at',
+        dtype='TIMESTAMP(timezone=True)'
+    ),
+}
+
+GAME_CHANGES_SPEC = TableSpec(
+    name='game_changes',
+    pk=['change_id'],
+    columns=GAME_CHANGES_COLUMNS
+)
@@ -0,0 +1,72 @@
+from schema.spec_engine import ColumnSpec, TableSpec
+
+# Schedule index: one row per (non-spring) game with its latest status
+SCHEDULE_GAMES_COLUMNS: dict[str, ColumnSpec] = {
+    'game_pk': ColumnSpec(
+        name='game_pk',
+        dtype='BigInteger',
+        nullable=False,
+        primary_key=True
+    ),
+    'game_date': ColumnSpec(
+        name='game_date',
+        dtype='DATE',
+        nullable=False
+    ),
+    'game_type': ColumnSpec(
+        name='game_type',
+        dtype='Text'
+    ),
+    'abstract_state': ColumnSpec(
+        name='abstract_state',
+        dtype='Text'
+    ),
+    'detailed_state': ColumnSpec(
+        name='detailed_state',
+        dtype='Text'
+    ),
+    'updated_at': ColumnSpec(
+        name='updated_at',
+        dtype='TIMESTAMP(timezone=True)',
+        nullable=False,
+        server_default='now()'
+    ),
+}
+
+SCHEDULE_GAMES_SPEC = TableSpec(
+    name='schedule_games',
+    pk=['game_pk'],
+    columns=SCHEDULE_GAMES_COLUMNS
+)
+
+# One row per fetched schedule date; all_final days are never fetched again
+SCHEDULE_DAYS_COLUMNS: dict[str, ColumnSpec] = {
+    'game_date': ColumnSpec(
+        name='game_date',
+        dtype='DATE',
+        nullable=False,
+        primary_key=True
+    ),
+    'game_count': ColumnSpec(
+        name='game_count',
+        dtype='Integer',
+        nullable=False
+    ),
+    'all_final': ColumnSpec(
+        name='all_final',
+        dtype='Boolean',
+        nullable=False
+    ),
+    'fetched_at': ColumnSpec(
+        name='fetched_at',
+        dtype='TIMESTAMP(timezone=True)',
+        nullable=False,
+        server_default='now()'
+    ),
+}
+
+SCHEDULE_DAYS_SPEC = TableSpec(
+    name='schedule_days',
+    pk=['game_date'],
+    columns=SCHEDULE_DAYS_COLUMNS
+)
@@ -1,10 +1,11 @@
 from __future__ import annotations
-from typing import Callable, Optional, Any
+from typing import Callable, Optional, Any, Iterable
 
 import numpy as np
 import pandas as pd
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from utils.statcast_utils import assert_pk_unique
 
@@ -15,6 +16,7 @@ class ColumnSpec:
     nullable: bool = True
     bounds: Optional[tuple[float, float]] = None
     derive: Optional[Callable[[pd.DataFrame], pd.Series]] = None
+    derive_from: list[str] | None = None # source columns the derive reads
     original_name: str | None = None
     primary_key: bool = False
     server_default: str | None = None  # 'now()', 'gen_random_uuid()'
@@ -28,24 +30,115 @@ class TableSpec:
     table_rules: list[Callable[[pd.DataFrame], dict[str, int]]] | None = None
     row_filters: list[Callable[[pd.DataFrame], pd.DataFrame]] | None = None
     unique_constraints: list[tuple[str, list[str]]] | None = None
+    _plan: SpecPlan | None = field(default=None, init=False, repr=False, compare=False)
 
+    def compile(self, refresh: bool = False) -> SpecPlan:
+        """
+        Resolve this spec into an immutable SpecPlan, cached on the spec.
+        Specs are treated as constants; pass refresh=True after mutating one.
+        """
+        if self._plan is None or refresh:
+            self._plan = _compile_spec(self)
+        return self._plan
 
-def _coerce_series(s: pd.Series, dtype: str) -> pd.Series:
+@dataclass(frozen=True)
+class ColumnStep:
+    name: str
+    dtype: str | None
+    coerce: Callable[[pd.Series], pd.Series] | None
+    bounds: tuple[float, float] | None
+    derive: Callable[[pd.DataFrame], pd.Series] | None
+    nullable: bool
+
+@dataclass(frozen=True)
+class SpecPlan:
+    """Execution plan for apply_table_spec, built once per spec by TableSpec.compile()."""
+    name: str
+    pk: tuple[str, ...]
+    renames: tuple[tuple[str, str], ...]   # (original_name, name) in spec order
+    steps: tuple[ColumnStep, ...]          # spec column order == derive order
+    not_null: tuple[str, ...]
+    table_rules: tuple[Callable[[pd.DataFrame], dict[str, int]], ...]
+    row_filters: tuple[Callable[[pd.DataFrame], pd.DataFrame], ...]
+
+def _compile_spec(spec: TableSpec) -> SpecPlan:
+    columns = list(spec.columns.values())
+    return SpecPlan(
+        name=spec.name,
+        pk=tuple(spec.pk),
+        renames=tuple(
+            (c.original_name, c.name) for c in columns if c.original_name
+        ),
+        steps=tuple(
+            ColumnStep(
+                name=c.name,
+                dtype=c.dtype,
+                coerce=_coercer_for(c.dtype) if c.dtype else None,
+                bounds=tuple(c.bounds) if c.bounds else None,
+                derive=c.derive,
+                nullable=c.nullable,
+            )
+            for c in columns
+        ),
+        not_null=tuple(c.name for c in columns if not c.nullable),
+        table_rules=tuple(spec.table_rules or ()),
+        row_filters=tuple(spec.row_filters or ()),
+    )
+
+
+def required_source_columns(*specs: TableSpec) -> list[str]:
+    """
+    Source columns needed to apply the given specs: each column's name and
+    original_name, plus the derive_from dependencies of derived columns.
+    Derived columns themselves are not read from the source.
+    """
+    cols: dict[str, None] = {}
+    for spec in specs:
+        for colspec in spec.columns.values():
+            if colspec.derive is not None:
+                for dep in colspec.derive_from or []:
+                    cols[dep] = None
+                continue
+            cols[colspec.name] = None
+            if colspec.original_name:
+                cols[colspec.original_name] = None
+    return list(cols)
+
+_TEXT_DTYPE = re.compile(r'^(Text|String\(\d+\))$')
+
+def _to_int64(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s, errors="coerce").astype("Int64")
+
+def _to_float64(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s, errors="coerce").astype("float64")
+
+def _to_string(s: pd.Series) -> pd.Series:
+    return s.astype("string")
+
+def _to_boolean(s: pd.Series) -> pd.Series:
+    return s.astype("boolean")
+
+def _to_datetime(s: pd.Series) -> pd.Series:
+    return pd.to_datetime(s, errors="coerce")
+
+@lru_cache(maxsize=None)
+def _coercer_for(dtype: str) -> Callable[[pd.Series], pd.Series]:
     if dtype in ('SmallInteger', 'BigInteger', 'Integer'):
-        return pd.to_numeric(s, errors="coerce").astype("Int64")
+        return _to_int64
     if dtype == 'REAL':
-        return pd.to_numeric(s, errors="coerce").astype("float64")
-
-    pattern = re.compile(r'^(Text|String\(\d+\))$')
-    if pattern.match(dtype):
-        return s.astype("string")
+        return _to_float64
+    if _TEXT_DTYPE.match(dtype):
+        return _to_string
     if dtype == "Boolean":
-        return s.astype("boolean")
+        return _to_boolean
     if dtype in ("DATE", "DateTime"):
-        return pd.to_datetime(s, errors="coerce")
+        return _to_datetime
 
     # fallback
-    return s.astype(dtype)
+    return lambda s: s.astype(dtype)
+
+def _coerce_series(s: pd.Series, dtype: str) -> pd.Series:
+    return _coercer_for(dtype)(s)
 
 def _apply_bounds_one(df: pd.DataFrame, col: str, bounds: tuple[float, float]) -> int:
     lo, hi = bounds
@@ -56,8 +149,26 @@ def _apply_bounds_one(df: pd.DataFrame, col: str, bounds: tuple[float, float]) -
         df.loc[mask, col] = np.nan
     return n
 
-def apply_table_spec(df: pd.DataFrame, spec: TableSpec) -> tuple[pd.DataFrame, dict[str, Any]]:
-    df = df.copy()
+def apply_table_spec(
+    df: pd.DataFrame,
+    spec: TableSpec,
+    derived: Iterable[str] = (),
+    copy: bool = True
+) -> tuple[pd.DataFrame, dict[str, Any]]:
+    """
+    Apply a TableSpec: renames, derives, coercion, bounds, rules, filters,
+    not-null checks and PK dedup.
+
+    Args:
+        derived: Names of derive columns already computed upstream (e.g. by a
+            shared fan-out pass). They are coerced/bounded but not re-derived.
+        copy: If False, the caller hands over ownership of df and it is
+            mutated column by column instead of being copied up front. Row
+            filters and PK dedup still return new frames when they drop rows.
+    """
+    if copy:
+        df = df.copy()
+    derived = set(derived)
 
     report: dict[str, Any] = {
         'table': spec.name,
@@ -70,79 +181,73 @@ def apply_table_spec(df: pd.DataFrame, spec: TableSpec) -> tuple[pd.DataFrame, d
         'not_nullable_violations': {}
     }
 
-    rename_map = {}
-    for _, colspec in spec.columns.items():
-        if colspec.original_name and colspec.original_name in df.columns:
-            if colspec.name not in df.columns:
-                rename_map[colspec.original_name] = colspec.name
+    plan = spec.compile()
+
+    rename_map = {
+        original: name
+        for original, name in plan.renames
+        if original in df.columns and name not in df.columns
+    }
 
     if rename_map:
-        df = df.rename(columns=rename_map)
+        if copy:
+            df = df.rename(columns=rename_map)
+        else:
+            df.rename(columns=rename_map, inplace=True)
  
     # Coerce + Bound
-    for _, colspec in spec.columns.items():
-        col = colspec.name
+    for step in plan.steps:
+        col = step.name
 
-        if colspec.derive is not None:
+        if step.derive is not None:
             try:
-                df[col] = colspec.derive(df)
-                report["derived_columns"][col] = True
+                if col in derived and col in df.columns:
+                    report["derived_columns"][col] = 'precomputed'
+                else:
+                    df[col] = step.derive(df)
+                    report["derived_columns"][col] = True
             except KeyError as e:
                 report['derived_columns'][col] = f"failed_missing_dep:{str(e)}"
                 continue
 
-            if colspec.dtype:
-                df[col] = _coerce_series(df[col], colspec.dtype)
-                report['type_coercions'][col] = colspec.dtype
-
-            if colspec.bounds:
-                n = _apply_bounds_one(df, col, colspec.bounds)
-                report['invalid_bounds'][col] = n
-
-            continue
-
-        if col not in df.columns:
-            if not colspec.nullable:
+        elif col not in df.columns:
+            if not step.nullable:
                 report['missing_required_columns'].append(col)
             continue
-        
-        if colspec.dtype:
-            df[col] = _coerce_series(df[col], colspec.dtype)
-            report['type_coercions'][col] = colspec.dtype
 
-        if colspec.bounds:
-            n = _apply_bounds_one(df, col, colspec.bounds)
+        if step.coerce is not None:
+            df[col] = step.coerce(df[col])
+            report['type_coercions'][col] = step.dtype
+
+        if step.bounds:
+            n = _apply_bounds_one(df, col, step.bounds)
             report['invalid_bounds'][col] = n
 
-    
     # Table rules
-    if spec.table_rules:
-        for rule_fn in spec.table_rules:
-            violations = rule_fn(df)
-            for k, v in violations.items():
-                report['rule_violations'][k] = report['rule_violations'].get(k, 0) + int(v)
+    for rule_fn in plan.table_rules:
+        violations = rule_fn(df)
+        for k, v in violations.items():
+            report['rule_violations'][k] = report['rule_violations'].get(k, 0) + int(v)
 
-    if spec.row_filters:
-        for fn in spec.row_filters:
-            df = fn(df)
+    for fn in plan.row_filters:
+        df = fn(df)
 
     # Not null checks
-    for key, colspec in spec.columns.items():
-        col = colspec.name
-        if not colspec.nullable and col in df.columns:
+    for col in plan.not_null:
+        if col in df.columns:
             n_null = int(df[col].isna().sum())
             if n_null:
                 report['not_nullable_violations'][col] = n_null
 
 
     # PK uniqueness enforcement (drops dupes)
-    missing_pk = [k for k in spec.pk if k not in df.columns]
+    missing_pk = [k for k in plan.pk if k not in df.columns]
     if missing_pk:
         raise ValueError(f"Missing PK columns for {spec.name}: {missing_pk}. "
                          f"Available columns: {list(df.columns)}")
 
 
-    df = assert_pk_unique(df, spec.pk)
+    df = assert_pk_unique(df, list(plan.pk))
 
     report['rows_out'] = int(len(df))
     return df, report
@@ -5,7 +5,7 @@ from schema.shared.helpers import merge_columns
 import numpy as np
 import pandas as pd
 
-from utils.statcast_utils import (is_called_strike, is_whiff, is_swing, is_foul)
+from utils.statcast_utils import (is_called_strike, is_whiff, is_swing, is_foul, map_series)
 
 AT_BAT_CALC: dict[str, ColumnSpec] = {
     'pitch_number': ColumnSpec(
@@ -51,22 +51,26 @@ AT_BAT_CALC: dict[str, ColumnSpec] = {
     'is_whiff': ColumnSpec(
         name='is_whiff',
         dtype='Boolean',
-        derive = lambda df: df['description'].map(is_whiff)
+        derive = lambda df: map_series(df['description'], is_whiff),
+        derive_from=['description']
     ),
     'is_called_strike': ColumnSpec(
         name='is_called_strike',
         dtype='Boolean',
-        derive = lambda df: df['description'].map(is_called_strike)
+        derive = lambda df: map_series(df['description'], is_called_strike),
+        derive_from=['description']
     ),
     'is_swing': ColumnSpec(
         name='is_swing',
         dtype='Boolean',
-        derive = lambda df: df['description'].map(is_swing)
+        derive = lambda df: map_series(df['description'], is_swing),
+        derive_from=['description']
     ),
     'is_foul': ColumnSpec(
         name='is_foul',
         dtype='Boolean',
-        derive=lambda df: df['description'].map(is_foul)
+        derive=lambda df: map_series(df['description'], is_foul),
+        derive_from=['description']
     ),
     'bat_score_diff': ColumnSpec(
         name='bat_score_diff',
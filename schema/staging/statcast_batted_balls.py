@@ -1,7 +1,7 @@
 from schema.shared.statcast_common import COMMON_PITCH_STAGING_COLUMNS
 from schema.spec_engine import ColumnSpec, TableSpec
 from schema.shared.helpers import merge_columns
-from utils.statcast_utils import is_homerun, is_bip
+from utils.statcast_utils import is_homerun, is_bip, map_series
 
 import pandas as pd
 
@@ -94,12 +94,13 @@ STATCAST_BATTED_BALLS_ONLY: dict[str, ColumnSpec] = {
     'is_homerun': ColumnSpec(
         name='is_homerun',
         dtype='Boolean',
-        derive=lambda df: df['events'].map(is_homerun)
+        derive=lambda df: map_series(df['events'], is_homerun),
+        derive_from=['events']
     )
 }
 
 def rule_in_play(df: pd.DataFrame) -> pd.DataFrame:
-    mask = df["description"].map(is_bip).fillna(False)
+    mask = map_series(df['description'], is_bip).fillna(False)
     return df[mask]
 
 STATCAST_BATTED_BALLS_COLUMNS = merge_columns(
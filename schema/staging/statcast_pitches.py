@@ -2,7 +2,7 @@ from schema.spec_engine import ColumnSpec, TableSpec
 from schema.shared.helpers import merge_columns
 from schema.shared.statcast_common import COMMON_PITCH_STAGING_COLUMNS
 
-from utils.statcast_utils import (is_bip, is_whiff, is_swing, is_called_strike, is_ball, map_pitch_result, is_foul)
+from utils.statcast_utils import (is_bip, is_whiff, is_swing, is_called_strike, is_ball, map_pitch_result, is_foul, map_series)
 
 import pandas as pd
 import numpy as np
@@ -223,37 +223,44 @@ STATCAST_PITCH_ONLY: dict[str, ColumnSpec] = {
     'pitch_result_type': ColumnSpec(
         name='pitch_result_type',
         dtype='Text',
-        derive= lambda df: df['description'].map(map_pitch_result)
+        derive= lambda df: map_series(df['description'], map_pitch_result),
+        derive_from=['description']
     ),
     'is_bip': ColumnSpec(
         name='is_bip',
         dtype='Boolean',
-        derive = lambda df: df['description'].map(is_bip)
+        derive = lambda df: map_series(df['description'], is_bip),
+        derive_from=['description']
     ),
     'is_whiff': ColumnSpec(
         name='is_whiff',
         dtype='Boolean',
-        derive = lambda df: df['description'].map(is_whiff)
+        derive = lambda df: map_series(df['description'], is_whiff),
+        derive_from=['description']
     ),
     'is_called_strike': ColumnSpec(
         name='is_called_strike',
         dtype='Boolean',
-        derive = lambda df: df['description'].map(is_called_strike)
+        derive = lambda df: map_series(df['description'], is_called_strike),
+        derive_from=['description']
     ),
     'is_ball': ColumnSpec(
         name='is_ball',
         dtype='Boolean',
-        derive = lambda df: df['description'].map(is_ball)
+        derive = lambda df: map_series(df['description'], is_ball),
+        derive_from=['description']
     ),
     'is_swing': ColumnSpec(
         name='is_swing',
         dtype='Boolean',
-        derive = lambda df: df['description'].map(is_swing)
+        derive = lambda df: map_series(df['description'], is_swing),
+        derive_from=['description']
     ),
     'is_foul': ColumnSpec(
         name='is_foul',
         dtype='Boolean',
-        derive=lambda df: df['description'].map(is_foul)
+        derive=lambda df: map_series(df['description'], is_foul),
+        derive_from=['description']
     )
 }
 
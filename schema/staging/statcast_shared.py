@@ -0,0 +1,35 @@
+from schema.spec_engine import ColumnSpec, TableSpec
+from schema.shared.helpers import merge_columns
+from schema.shared.statcast_common import COMMON_PITCH_STAGING_COLUMNS
+from schema.staging.statcast_pitches import STATCAST_PITCHES_SPEC
+from schema.staging.statcast_at_bats import STATCAST_AT_BATS_INPUT_SPEC
+from schema.staging.statcast_batted_balls import STATCAST_BATTED_BALLS_SPEC
+
+# Shared pitch-level base for the staging fan-out: common keys, the outcome
+# text columns and every derive the pitch-level specs share. Applied once per
+# read; per-table specs then reuse the derived flags instead of recomputing.
+
+_FANOUT_SPECS = (STATCAST_PITCHES_SPEC, STATCAST_AT_BATS_INPUT_SPEC, STATCAST_BATTED_BALLS_SPEC)
+
+STATCAST_SHARED_DERIVED: dict[str, ColumnSpec] = {
+    name: colspec
+    for spec in _FANOUT_SPECS
+    for name, colspec in spec.columns.items()
+    if colspec.derive is not None
+}
+
+STATCAST_SHARED_COLUMNS = merge_columns(
+    COMMON_PITCH_STAGING_COLUMNS,
+    {
+        'pitch_number': STATCAST_PITCHES_SPEC.columns['pitch_number'],
+        'description': STATCAST_PITCHES_SPEC.columns['description'],
+        'events': STATCAST_BATTED_BALLS_SPEC.columns['events'],
+    },
+    STATCAST_SHARED_DERIVED
+)
+
+STATCAST_SHARED_SPEC = TableSpec(
+    name='statcast_shared',
+    pk=['game_pk', 'game_counter', 'pitch_number'],
+    columns=STATCAST_SHARED_COLUMNS
+)
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from schema.spec_engine import apply_table_spec
+from schema.staging.statcast_at_bats import STATCAST_AT_BATS_INPUT_SPEC, STATCAST_AT_BATS_SPEC
+from transformation.builders.build_at_bats import (
+    OUTS_BY_EVENT,
+    PITCH_FLAG_TOTALS,
+    build_statcast_at_bats,
+    build_statcast_at_bats_parallel,
+)
+from utils.statcast_utils import (
+    is_bip, is_called_strike, is_foul, is_strikeout, is_swing, is_walk, is_whiff,
+    map_pitch_result, map_series,
+)
+
+DESCRIPTIONS = [
+    'ball', 'called_strike', 'swinging_strike', 'foul', 'hit_into_play',
+    'blocked_ball', 'foul_tip', 'hit_by_pitch', 'Foul_Bunt', None,
+]
+EVENTS = [
+    'field_out', 'strikeout', 'walk', 'single', 'home_run', 'double_play',
+    'intent_walk', 'sac_fly', 'strikeout_double_play', None,
+]
+
+
+def raw_pitches(n_games: int = 6, seed: int = 11) -> pd.DataFrame:
+    """Pitch-level Statcast-shaped frame, shuffled so builders must sort."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for g in range(n_games):
+        game_pk = 745000 + g
+        score = 0
+        for ab in range(1, 40):
+            n = int(rng.integers(1, 8))
+            runs = int(rng.integers(0, 3)) if rng.random() < 0.2 else 0
+            for p in range(1, n + 1):
+                last = p == n
+                rows.append({
+                    'game_pk': game_pk, 'at_bat_number': ab, 'game_date': '2025-04-01',
+                    'pitcher': 600000 + 10 * g + ab // 9, 'batter': 500000 + ab % 9,
+                    'pitch_number': p, 'bat_score': score, 'fld_score': 2,
+                    'on_1b': None, 'on_2b': None, 'on_3b': None,
+                    'stand': 'R', 'p_throws': 'L',
+                    'post_bat_score': score + (runs if last else 0),
+                    'description': DESCRIPTIONS[int(rng.integers(0, len(DESCRIPTIONS)))],
+                    'inning': 1 + ab // 7, 'inning_topbot': 'Top',
+                    'events': EVENTS[int(rng.integers(0, len(EVENTS)))] if last else None,
+                    'balls': min(p - 1, 3), 'strikes': min(p - 1, 2), 'outs_when_up': ab % 3,
+                    'n_thruorder_pitcher': 1 + ab // 9,
+                })
+            score += runs
+    return pd.DataFrame(rows).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def merge_based_at_bats(df: pd.DataFrame) -> pd.DataFrame:
+    """The groupby + merge at-bat build that the one-pass build replaced."""
+    df, _ = apply_table_spec(df, STATCAST_AT_BATS_INPUT_SPEC)
+    df_sorted = df.sort_values(by=['game_pk', 'game_counter', 'pitch_number'])
+    keys = ['game_pk', 'game_counter']
+
+    flag_sums = (
+        df_sorted
+        .assign(**{c: df_sorted[c].astype('Int64') for c in PITCH_FLAG_TOTALS})
+        .groupby(keys, sort=False)
+        .agg(**{total: (flag, 'sum') for flag, total in PITCH_FLAG_TOTALS.items()})
+        .reset_index()
+    )
+    ab = df_sorted.groupby(keys, sort=False).tail(1)
+    ab = ab.sort_values(by=keys).sort_values(by=['game_pk', 'pitcher', 'game_counter'])
+    ab['pitcher_pa_number'] = (ab.groupby(['game_pk', 'pitcher'], sort=False).cumcount() + 1).astype('Int64')
+    ab['last_pitch_number'] = ab['pitch_number']
+    ab = ab.merge(flag_sums, on=keys, how='left', validate='one_to_one')
+    ab['rbi'] = pd.to_numeric(ab['post_bat_score'] - ab['bat_score'], errors='coerce').fillna(0).clip(lower=0)
+    counts = df_sorted.groupby(keys, sort=False).size().rename('total_pitches').reset_index()
+    ab = ab.merge(counts, on=keys, how='left', validate='one_to_one')
+    ab['outs_on_ab'] = ab['events'].map(OUTS_BY_EVENT).fillna(0).astype('Int64')
+    ab['is_bip'] = ab['description'].map(is_bip).fillna(False)
+    ab['is_strikeout'] = ab['events'].map(is_strikeout).fillna(False)
+    ab['is_walk'] = ab['events'].map(is_walk).fillna(False)
+    ab, _ = apply_table_spec(ab, STATCAST_AT_BATS_SPEC)
+    return ab
+
+
+@pytest.mark.parametrize('fn', [
+    is_bip, is_whiff, is_called_strike, is_swing, is_foul, map_pitch_result,
+])
+@pytest.mark.parametrize('values', [
+    pd.Series(DESCRIPTIONS * 3, index=np.arange(30) * 2, name='description'),
+    pd.Series(DESCRIPTIONS, dtype='string', name='description'),
+    pd.Series([None, np.nan, pd.NA], dtype=object, name='description'),
+    pd.Series([], dtype=object, name='description'),
+])
+def test_map_series_matches_row_wise_map(fn, values):
+    expected = values.map(lambda v: fn(None if pd.isna(v) else v))
+
+    out = map_series(values, fn)
+
+    assert out.index.equals(values.index)
+    assert out.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('fn', [is_walk, is_strikeout])
+def test_map_series_matches_row_wise_map_for_events(fn):
+    values = pd.Series(EVENTS * 2, name='events')
+
+    assert map_series(values, fn).tolist() == values.map(fn).tolist()
+
+
+def test_one_pass_at_bat_build_matches_merge_based_build():
+    df = raw_pitches()
+
+    pd.testing.assert_frame_equal(build_statcast_at_bats(df), merge_based_at_bats(df))
+
+
+def test_partitioned_at_bat_build_matches_whole_frame_build():
+    df = raw_pitches(n_games=9, seed=3)
+
+    pd.testing.assert_frame_equal(
+        build_statcast_at_bats_parallel(df, max_workers=2),
+        build_statcast_at_bats(df),
+    )
+
+
+def test_at_bat_build_leaves_the_input_untouched():
+    df = raw_pitches(n_games=2)
+    before = df.copy()
+
+    build_statcast_at_bats(df)
+
+    pd.testing.assert_frame_equal(df, before)
@@ -0,0 +1,71 @@
+from utils.http_cache import get_json_cached
+from utils.retry import AdaptiveRateLimiter, get_session
+
+
+def _versioned(state):
+    """Serve state['payload'] with ETag state['etag']; 304 when the client has it."""
+    def handler(path, headers):
+        if headers.get('If-None-Match') == state['etag']:
+            return 304, {'ETag': state['etag']}, None
+        return 200, {'ETag': state['etag']}, state['payload']
+    return handler
+
+
+def test_conditional_get_revalidates_the_snapshot(stub_server, tmp_path):
+    state = {'etag': '"v1"', 'payload': {'people': [{'id': 1}]}}
+    stub_server.handler = _versioned(state)
+    url = f"{stub_server.url}/api/v1/sports/1/players"
+    cache = str(tmp_path / 'players.json')
+    session = get_session(url)
+
+    data, changed = get_json_cached(session, url, cache)
+    assert (data, changed) == ({'people': [{'id': 1}]}, True)
+    assert 'If-None-Match' not in stub_server.requests[0][1]
+
+    data, changed = get_json_cached(session, url, cache)
+    assert (data, changed) == ({'people': [{'id': 1}]}, False)
+    assert stub_server.requests[1][1]['If-None-Match'] == '"v1"'
+
+    state.update(etag='"v2"', payload={'people': [{'id': 1}, {'id': 2}]})
+    data, changed = get_json_cached(session, url, cache)
+    assert (data, changed) == ({'people': [{'id': 1}, {'id': 2}]}, True)
+
+    data, changed = get_json_cached(session, url, cache)
+    assert changed is False
+    assert len(stub_server.requests) == 4
+
+
+def test_conditional_get_ignores_a_snapshot_for_other_params(stub_server, tmp_path):
+    state = {'etag': '"v1"', 'payload': {'season': 2025}}
+    stub_server.handler = _versioned(state)
+    url = f"{stub_server.url}/api/v1/sports/1/players"
+    cache = str(tmp_path / 'players.json')
+    session = get_session(url)
+
+    get_json_cached(session, url, cache, params={'season': 2025})
+    _, changed = get_json_cached(session, url, cache, params={'season': 2024})
+
+    assert changed is True
+    assert 'If-None-Match' not in stub_server.requests[1][1]
+
+
+def test_conditional_get_retries_throttles_through_the_limiter(stub_server, tmp_path):
+    calls = []
+
+    def handler(path, headers):
+        calls.append(path)
+        if len(calls) == 1:
+            return 429, {'Retry-After': '0'}, None
+        return 200, {'ETag': '"v1"'}, {'ok': True}
+
+    stub_server.handler = handler
+    url = f"{stub_server.url}/api/v1/teams"
+    limiter = AdaptiveRateLimiter(50.0)
+
+    data, changed = get_json_cached(
+        get_session(url), url, str(tmp_path / 'teams.json'), limiter=limiter
+    )
+
+    assert (data, changed) == ({'ok': True}, True)
+    m = next(iter(limiter.metrics().values()))
+    assert (m['throttled'], m['retries'], m['successes']) == (1, 1, 1)
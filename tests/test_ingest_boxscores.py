@@ -0,0 +1,72 @@
+import re
+
+import ingestion.ingest_boxscores as ib
+from utils.retry import get_limiter
+
+GAME_PKS = [745010 + i for i in range(8)]
+THROTTLED_GAME = GAME_PKS[2]
+MISSING_GAME = GAME_PKS[5]
+
+
+def _boxscore(game_pk):
+    def player(player_id):
+        return {
+            'person': {'id': player_id, 'fullName': f'Player {player_id}'},
+            'position': {'abbreviation': 'P'},
+            'stats': {'pitching': {'runs': 1}, 'batting': {'runs': 0}},
+        }
+    return {'teams': {
+        side: {
+            'team': {'id': 100 + i, 'name': side},
+            'players': {f'ID{game_pk}{i}': player(game_pk * 10 + i)},
+        }
+        for i, side in enumerate(['away', 'home'])
+    }}
+
+
+class _Writer:
+    def __init__(self):
+        self.payloads = {}
+
+    def add(self, game_pk, payload):
+        self.payloads[game_pk] = payload
+
+    def check(self):
+        pass
+
+
+def test_fetch_boxscores_against_stub_server(stub_server, monkeypatch):
+    throttled = []
+
+    def handler(path, headers):
+        game_pk = int(re.search(r'/game/(\d+)/boxscore', path).group(1))
+        if game_pk == MISSING_GAME:
+            return 404, {}, {'message': 'not found'}
+        if game_pk == THROTTLED_GAME and not throttled:
+            throttled.append(game_pk)
+            return 429, {'Retry-After': '0'}, None
+        return 200, {}, _boxscore(game_pk)
+
+    stub_server.handler = handler
+    boxscore_url = f"{stub_server.url}/api/v1/game/{{}}/boxscore"
+    monkeypatch.setattr(ib, 'BOXSCORE_URL', boxscore_url)
+    writer = _Writer()
+
+    pitching, batting = ib.fetch_boxscores(GAME_PKS, max_workers=4, rate_per_sec=50.0, writer=writer)
+
+    loaded = [pk for pk in GAME_PKS if pk != MISSING_GAME]
+    # rows come back in game_pks order with sequential row numbers,
+    # whatever order the concurrent fetches finished in
+    assert [r['game_pk'] for r in pitching] == [pk for pk in loaded for _ in range(2)]
+    assert [r['row_num'] for r in pitching] == list(range(len(pitching)))
+    assert [r['row_num'] for r in batting] == list(range(len(batting)))
+    assert sorted(writer.payloads) == loaded
+
+    paths = stub_server.paths()
+    assert paths.count(f'/api/v1/game/{THROTTLED_GAME}/boxscore') == 2
+    assert len(paths) == len(GAME_PKS) + 1
+
+    m = get_limiter(boxscore_url).metrics()[stub_server.url.split('//')[1]]
+    assert m['throttled'] == 1
+    assert m['retries'] == 1
+    assert m['breaker'] == 'closed'
@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+import pytest
+
+import utils.retry as retry
+
+
+def test_sessions_are_shared_per_host():
+    teams = retry.get_session('https://statsapi.mlb.com/api/v1/teams')
+    players = retry.get_session('https://statsapi.mlb.com/api/v1/sports/1/players')
+    other = retry.get_session('https://example.com/api')
+
+    assert teams is players
+    assert teams is not other
+
+
+def test_timed_call_fails_when_no_worker_starts_it(monkeypatch):
+    monkeypatch.setattr(retry, '_timeout_executor', None)
+    monkeypatch.setattr(retry, 'TIMEOUT_EXECUTOR_WORKERS', 2)
+    release = threading.Event()
+    blockers = [retry._get_timeout_executor().submit(release.wait) for _ in range(2)]
+
+    try:
+        started = time.monotonic()
+        with pytest.raises(FuturesTimeoutError):
+            retry.retry_call(lambda: 'ran', max_retries=0, timeout=0.2, label='saturated')
+        assert time.monotonic() - started < 2
+    finally:
+        release.set()
+        for f in blockers:
+            f.result()
+        retry._get_timeout_executor().shutdown()
+
+
+def _in_thread(fn, *args):
+    t = threading.Thread(target=fn, args=args)
+    t.start()
+    t.join()
+
+
+def test_only_the_half_open_probe_closes_the_breaker():
+    url = 'https://breaker.test/api'
+    limiter = retry.AdaptiveRateLimiter(100.0, breaker_threshold=2, breaker_cooldown=0.05)
+    for _ in range(2):
+        limiter.acquire(url)
+        limiter.record_failure(url)
+    assert limiter.metrics()['breaker.test']['breaker'] == 'open'
+
+    # a request sent before the breaker opened comes back late
+    _in_thread(limiter.record_success, url)
+    assert limiter.metrics()['breaker.test']['breaker'] == 'open'
+
+    limiter.acquire(url)  # waits out the cooldown and becomes the probe
+    assert limiter.metrics()['breaker.test']['breaker'] == 'half_open'
+    _in_thread(limiter.record_success, url)
+    _in_thread(limiter.record_failure, url)
+    assert limiter.metrics()['breaker.test']['breaker'] == 'half_open'
+
+    limiter.record_success(url)
+    m = limiter.metrics()['breaker.test']
+    assert m['breaker'] == 'closed'
+    assert m['breaker_trips'] == 1
+
+
+def test_failed_probe_reopens_the_breaker():
+    url = 'https://breaker.test/api'
+    limiter = retry.AdaptiveRateLimiter(100.0, breaker_threshold=1, breaker_cooldown=0.05)
+    limiter.acquire(url)
+    limiter.record_failure(url)
+
+    limiter.acquire(url)
+    limiter.record_failure(url)
+
+    m = limiter.metrics()['breaker.test']
+    assert m['breaker'] == 'open'
+    assert m['breaker_trips'] == 2
@@ -0,0 +1,67 @@
+import pytest
+
+import utils.sql_runner as sql_runner
+
+REGISTRY = [
+    {
+        'name': 'load_facts',
+        'script': 'load_facts.sql',
+        'tables': ['production.fact_pitch'],
+        'depends_on': ['staging.statcast_pitches'],
+        'params': ['game_pks']
+    },
+    {
+        'name': 'refresh_profiles',
+        'refresh': ['production.mv_profile'],
+        'full_only': True,
+        'tables': ['production.mv_profile'],
+        'depends_on': ['production.fact_pitch']
+    },
+    {
+        'name': 'load_report',
+        'script': 'load_report.sql',
+        'tables': ['production.report'],
+        'depends_on': ['production.mv_profile'],
+        'params': ['game_pks']
+    },
+]
+
+
+@pytest.fixture
+def ran(monkeypatch):
+    calls = []
+
+    def fake_script(path, engine, params):
+        calls.append((path, params))
+        return 1, []
+
+    def fake_refresh(views, engine, concurrently=True):
+        calls.append((tuple(views), None))
+        return 0
+
+    monkeypatch.setattr(sql_runner, 'run_sql_script', fake_script)
+    monkeypatch.setattr(sql_runner, 'refresh_materialized_views', fake_refresh)
+    return calls
+
+
+def test_full_only_entry_is_deferred_on_scoped_runs(ran):
+    results = sql_runner.run_sql_registry(
+        REGISTRY, engine=object(), params={'game_pks': [1, 2]},
+        sources=['staging.statcast_pitches'], max_workers=1
+    )
+
+    assert [r['status'] for r in results.values()] == ['success', 'deferred', 'success']
+    assert ran == [
+        ('load_facts.sql', {'game_pks': [1, 2]}),
+        ('load_report.sql', {'game_pks': [1, 2]}),
+    ]
+
+
+def test_full_only_entry_runs_when_unscoped(ran):
+    results = sql_runner.run_sql_registry(
+        REGISTRY, engine=object(), params={'game_pks': None},
+        sources=['staging.statcast_pitches'], max_workers=1
+    )
+
+    assert [r['status'] for r in results.values()] == ['success'] * 3
+    assert [call[0] for call in ran] == ['load_facts.sql', ('production.mv_profile',), 'load_report.sql']
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from utils.statcast_utils import PKDedupIndex
+
+PK = ['game_pk', 'game_counter', 'pitch_number']
+
+
+def _pitches(game_pk, pitch_numbers):
+    return pd.DataFrame({
+        'game_pk': game_pk,
+        'game_counter': 1,
+        'pitch_number': pitch_numbers,
+    })
+
+
+def test_split_seen_matches_a_set_over_many_batches():
+    rng = np.random.default_rng(7)
+    index = PKDedupIndex(PK)
+    seen = set()
+    repeated = 0
+
+    for _ in range(200):
+        df = _pitches(rng.integers(1, 40), rng.integers(1, 60, size=20))
+        fresh, again = index.split_seen(df)
+
+        keys = list(zip(df['game_pk'], df['pitch_number']))
+        expected = [k in seen for k in keys]
+        assert again['pitch_number'].tolist() == [k[1] for k, s in zip(keys, expected) if s]
+        assert len(fresh) == expected.count(False)
+        repeated += sum(expected)
+        seen.update(keys)
+
+    assert len(index) == len(seen)
+    assert index.stats()['cross_batch_duplicates'] == repeated
+    # sorted chunks are merged as they grow, so lookups stay logarithmic
+    assert len(index._chunks) <= int(np.log2(len(seen))) + 1
+
+
+def test_split_seen_reports_a_sample_instead_of_printing(capsys):
+    index = PKDedupIndex(PK, sample_size=2)
+    index.split_seen(_pitches(1, [1, 2, 3]))
+    index.split_seen(_pitches(1, [2, 3, 4]))
+    index.split_seen(_pitches(1, [1]))
+
+    assert capsys.readouterr().out == ''
+    stats = index.stats()
+    assert stats['cross_batch_duplicates'] == 3
+    assert stats['sample_keys'] == [
+        {'game_pk': 1, 'game_counter': 1, 'pitch_number': 2, 'batch': 2},
+        {'game_pk': 1, 'game_counter': 1, 'pitch_number': 3, 'batch': 2},
+    ]
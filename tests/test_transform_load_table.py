@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+from psycopg.adapt import PyFormat, Transformer
+from psycopg.postgres import types as pg_types
+from psycopg.pq import Format
+
+import transformation.staging.transform_load_table as tlt
+
+PK = ['game_pk', 'game_counter', 'pitch_number']
+TABLE_COLS = PK + ['v']
+
+
+class _Spec:
+    name = 'stream_test'
+    pk = PK
+
+
+def _report(df):
+    return {
+        'table': _Spec.name, 'rows_in': len(df), 'rows_out': len(df),
+        'missing_required_columns': [], 'type_coercions': {},
+        'invalid_bounds': {}, 'derived_columns': {},
+        'rule_violations': {}, 'not_nullable_violations': {},
+    }
+
+
+@pytest.fixture
+def merges(monkeypatch):
+    """Record each merge as (pitch_numbers, values, overwrite) instead of loading."""
+    calls = []
+
+    def fake_merge(engine, df, schema, table_name, spec, constraint, overwrite=False, **kwargs):
+        calls.append((list(df['pitch_number']), list(df['v']), overwrite))
+        return len(df)
+
+    monkeypatch.setattr(tlt, 'copy_merge_into_table', fake_merge)
+    monkeypatch.setattr(tlt, 'get_table_columns', lambda engine, schema, table: TABLE_COLS)
+    monkeypatch.setattr(tlt, 'apply_table_spec', lambda df, spec, derived=(), copy=True: (df, _report(df)))
+    monkeypatch.setattr(tlt, 'prepare_for_postgres', lambda df, spec, copy=True: df)
+    return calls
+
+
+def _batch(game_pk, pitch_numbers, values):
+    return pd.DataFrame({
+        'game_pk': [game_pk] * len(pitch_numbers),
+        'game_counter': [1] * len(pitch_numbers),
+        'pitch_number': pitch_numbers,
+        'v': values,
+    })
+
+
+def test_stream_keeps_overwrite_false_for_fresh_rows(merges):
+    batches = [
+        _batch(1, [1, 2], ['a', 'b']),
+        _batch(2, [1, 2], ['c', 'd']),
+        _batch(3, [1], ['e']),
+        _batch(4, [1, 2, 3], ['f', 'g', 'h']),
+    ]
+
+    n, report = tlt.transform_and_load_stream(
+        None, batches, _Spec, 'staging', 't', 'c', loader='copy', overwrite=False
+    )
+
+    assert n == 8
+    assert [overwrite for _, _, overwrite in merges] == [False] * 4
+    assert report['batches'] == 4
+    assert report['pk_dedup']['cross_batch_duplicates'] == 0
+
+
+def test_stream_overwrites_only_rows_repeated_across_batches(merges):
+    batches = [
+        _batch(1, [1, 2], ['early', 'a']),
+        _batch(1, [2, 3], ['late', 'b']),
+        _batch(2, [1], ['c']),
+    ]
+
+    n, report = tlt.transform_and_load_stream(
+        None, batches, _Spec, 'staging', 't', 'c', loader='copy', overwrite=False
+    )
+
+    assert n == 5
+    assert merges == [
+        ([1, 2], ['early', 'a'], False),
+        ([3], ['b'], False),
+        ([2], ['late'], True),
+        ([1], ['c'], False),
+    ]
+    assert report['pk_dedup']['cross_batch_duplicates'] == 1
+
+
+def test_stream_overwrite_true_applies_to_every_batch(merges):
+    batches = [_batch(g, [1], [str(g)]) for g in range(1, 4)]
+
+    tlt.transform_and_load_stream(
+        None, batches, _Spec, 'staging', 't', 'c', loader='copy', overwrite=True
+    )
+
+    assert [overwrite for _, _, overwrite in merges] == [True] * 3
+
+
+@pytest.mark.parametrize('udt, values', [
+    ('timestamptz', pd.Series([pd.Timestamp('2025-04-01 19:05'), pd.NaT])),
+    ('timestamptz', pd.Series(pd.to_datetime(['2025-04-01 19:05-04:00', None], utc=True))),
+    ('timestamp', pd.Series(pd.to_datetime(['2025-04-01 19:05+00:00', None], utc=True))),
+    ('numeric', pd.Series([0.1, np.nan, 3.25])),
+    ('int8', pd.Series([745123.0, np.nan])),
+    ('int4', pd.Series([1, None], dtype='Int64')),
+    ('date', pd.Series(['2025-04-01', None])),
+    ('text', pd.Series([1.5, None], dtype=object)),
+])
+def test_copy_values_dump_in_binary_copy_format(udt, values):
+    out = tlt._copy_values(values, udt)
+
+    assert out[1] is None
+    tx = Transformer()
+    tx.set_dumper_types([pg_types[udt].oid] * len(out), Format.BINARY)
+    tx.dump_sequence(out, [PyFormat.BINARY] * len(out))
+
+
+def test_copy_values_take_naive_timestamptz_as_utc():
+    out = tlt._copy_values(pd.Series([pd.Timestamp('2025-04-01 19:05')]), 'timestamptz')
+
+    assert out[0].isoformat() == '2025-04-01T19:05:00+00:00'
@@ -1,7 +1,10 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 
-from utils.statcast_utils import (is_bip, is_walk, is_strikeout)
+from utils.statcast_utils import (is_bip, is_walk, is_strikeout, map_series)
 
 from schema.spec_engine import apply_table_spec
 from schema.staging.statcast_at_bats import STATCAST_AT_BATS_INPUT_SPEC, STATCAST_AT_BATS_SPEC
@@ -26,37 +29,51 @@ PITCH_FLAG_TOTALS = {
     'is_swing': 'total_swings',
     'is_foul': 'total_fouls'
     }
-    
 
-def build_statcast_at_bats(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+AT_BAT_KEYS = ['game_pk', 'game_counter']
+
+# Game partitions handed to each worker in build_statcast_at_bats_parallel
+PARTITIONS_PER_WORKER = 4
 
-    df, _ = apply_table_spec(df, STATCAST_AT_BATS_INPUT_SPEC)
+def build_statcast_at_bats(df: pd.DataFrame, derived=(), game_pks=None) -> pd.DataFrame:
+    # apply_table_spec copies, so the caller's frame is left untouched
+    df, _ = apply_table_spec(df, STATCAST_AT_BATS_INPUT_SPEC, derived=derived)
 
     required = {"game_pk", "game_counter", "pitch_number", "bat_score", "post_bat_score"}
     missing = required - set(df.columns)
     if missing:
         raise ValueError(f"Missing required columns for at-bat build: {sorted(missing)}")
 
-    df_sorted = df.sort_values(by = ['game_pk', 'game_counter', 'pitch_number'])
-
-    flag_sums = (
-        df_sorted
-            .assign(**{c: df_sorted[c].astype('Int64') for c in PITCH_FLAG_TOTALS.keys()})
-            .groupby(['game_pk', 'game_counter'], sort=False)
-            .agg(
-                **{
-                    total_col: (pitch_col, "sum")
-                    for pitch_col, total_col in PITCH_FLAG_TOTALS.items()
-                }
-            )
-            .reset_index()
-    )
-
-    end = df_sorted.groupby(by=['game_pk', 'game_counter'], sort=False).tail(1)
-    
-    ab_level = end.sort_values(by=['game_pk', 'game_counter']).copy()
-    ab_level = ab_level.sort_values(by=['game_pk', 'pitcher', 'game_counter'])
+    if game_pks is not None:
+        df = df[df['game_pk'].isin(list(game_pks))]
+
+    # groupby drops null keys; keep doing the same
+    df = df.dropna(subset=AT_BAT_KEYS)
+    df_sorted = df.sort_values(by=['game_pk', 'game_counter', 'pitch_number'], kind='stable')
+
+    # One pass over the sorted pitches: an at-bat ends where the key changes,
+    # so the last pitch, pitch count and flag totals all come from the same
+    # segment boundaries instead of separate groupby + merge passes
+    n = len(df_sorted)
+    keys = [df_sorted[c].to_numpy() for c in AT_BAT_KEYS]
+    is_end = np.ones(n, dtype=bool)
+    if n:
+        changed = np.zeros(n - 1, dtype=bool)
+        for k in keys:
+            changed |= k[1:] != k[:-1]
+        is_end[:-1] = changed
+    ends = np.flatnonzero(is_end)
+    starts = np.concatenate(([0], ends[:-1] + 1)) if n else ends
+
+    ab_level = df_sorted.iloc[ends].reset_index(drop=True)
+    ab_level['total_pitches'] = ends - starts + 1
+
+    for pitch_col, total_col in PITCH_FLAG_TOTALS.items():
+        flags = df_sorted[pitch_col].astype('Int64').fillna(0).to_numpy(dtype='int64')
+        totals = np.add.reduceat(flags, starts) if n else flags
+        ab_level[total_col] = pd.array(totals, dtype='Int64')
+
+    ab_level = ab_level.sort_values(by=['game_pk', 'pitcher', 'game_counter']).reset_index(drop=True)
 
     ab_level['pitcher_pa_number'] = (
         ab_level.groupby(['game_pk', 'pitcher'], sort=False).cumcount() + 1
@@ -64,12 +81,9 @@ def build_statcast_at_bats(df: pd.DataFrame) -> pd.DataFrame:
 
     ab_level['last_pitch_number'] = ab_level['pitch_number']
 
-    ab_level = ab_level.merge(
-        flag_sums,
-        on=['game_pk', 'game_counter'],
-        how='left',
-        validate='one_to_one'
-    )
+    # Keep the column order of the former merge-based build
+    for total_col in PITCH_FLAG_TOTALS.values():
+        ab_level[total_col] = ab_level.pop(total_col)
 
     ab_level['rbi'] = ab_level['post_bat_score'] - ab_level['bat_score']
     ab_level['rbi'] = (
@@ -78,27 +92,66 @@ def build_statcast_at_bats(df: pd.DataFrame) -> pd.DataFrame:
         .clip(lower=0)
     )
 
-    pitch_counts = (
-        df_sorted
-            .groupby(['game_pk', 'game_counter'], sort=False)
-            .size()
-            .rename('total_pitches')
-            .reset_index()
-    )
-
-    ab_level = ab_level.merge(
-        pitch_counts,
-        on=['game_pk', 'game_counter'],
-        how='left',
-        validate='one_to_one'
-    )
+    ab_level['total_pitches'] = ab_level.pop('total_pitches')
 
     ab_level['outs_on_ab'] = ab_level['events'].map(OUTS_BY_EVENT).fillna(0).astype("Int64")
 
-    ab_level['is_bip'] = ab_level['description'].map(is_bip).fillna(False)
-    ab_level['is_strikeout'] = ab_level['events'].map(is_strikeout).fillna(False)
-    ab_level['is_walk'] = ab_level['events'].map(is_walk).fillna(False)
+    ab_level['is_bip'] = map_series(ab_level['description'], is_bip).fillna(False)
+    ab_level['is_strikeout'] = map_series(ab_level['events'], is_strikeout).fillna(False)
+    ab_level['is_walk'] = map_series(ab_level['events'], is_walk).fillna(False)
     
-    ab_level, _ = apply_table_spec(ab_level, STATCAST_AT_BATS_SPEC)
-
-    return ab_level
\ No newline at end of file
+    ab_level, _ = apply_table_spec(ab_level, STATCAST_AT_BATS_SPEC, copy=False)
+
+    return ab_level
+
+
+def partition_by_game(df: pd.DataFrame, n_partitions: int) -> list[pd.DataFrame]:
+    """
+    Split df into up to n_partitions frames of contiguous game_pk ranges, so
+    no game spans two partitions and concatenating built partitions keeps
+    the game_pk-leading output order.
+    """
+    game_pks = np.unique(pd.to_numeric(df['game_pk'], errors='coerce').dropna().to_numpy())
+    if len(game_pks) == 0:
+        return []
+
+    groups = np.array_split(game_pks, min(n_partitions, len(game_pks)))
+    pk = pd.to_numeric(df['game_pk'], errors='coerce').to_numpy()
+    return [df[(pk >= g[0]) & (pk <= g[-1])] for g in groups if len(g)]
+
+
+def build_statcast_at_bats_parallel(
+    df: pd.DataFrame,
+    derived=(),
+    game_pks=None,
+    max_workers: int | None = None
+) -> pd.DataFrame:
+    """
+    Build statcast_at_bats by game_pk partition across a process pool.
+
+    Every at-bat aggregate (including pitcher_pa_number) is per game, so the
+    partitioned build matches build_statcast_at_bats on the whole frame.
+
+    Args:
+        df: Pitch-level Statcast frame
+        derived: Columns already derived upstream (see apply_table_spec)
+        game_pks: Only build these games (e.g. the ones that changed)
+        max_workers: Worker processes (default os.cpu_count(); 1 = in process)
+    """
+    if game_pks is not None:
+        df = df[pd.to_numeric(df['game_pk'], errors='coerce').isin(list(game_pks))]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    partitions = partition_by_game(df, max_workers * PARTITIONS_PER_WORKER) if max_workers > 1 else []
+    if len(partitions) <= 1:
+        return build_statcast_at_bats(df, derived=derived)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(build_statcast_at_bats, part, derived=tuple(derived))
+            for part in partitions
+        ]
+        del partitions
+        parts = [f.result() for f in futures]
+
+    return pd.concat(parts, ignore_index=True)
@@ -4,19 +4,21 @@ from sqlalchemy import create_engine, text
 from utils.utils import build_db_url
 
 
-def build_dim_game(df: pd.DataFrame = None) -> pd.DataFrame:
+def build_dim_game(df: pd.DataFrame = None, game_pks: list[int] = None) -> pd.DataFrame:
     """
     Extract unique games from staging.statcast_pitches.
 
     Args:
         df: Ignored - data is sourced from staging table
+        game_pks: Only these games (None = all)
 
     Returns:
         DataFrame with unique games: game_pk, game_date, game_type, home_team, away_team
     """
     engine = create_engine(build_db_url())
 
-    query = text("""
+    where = "WHERE game_pk = ANY(:game_pks)" if game_pks is not None else ""
+    query = text(f"""
         SELECT DISTINCT
             game_pk,
             game_date,
@@ -24,7 +26,9 @@ def build_dim_game(df: pd.DataFrame = None) -> pd.DataFrame:
             home_team,
             away_team
         FROM staging.statcast_pitches
+        {where}
     """)
+    params = {'game_pks': [int(pk) for pk in game_pks]} if game_pks is not None else {}
 
     with engine.connect() as conn:
-        return pd.read_sql(query, conn)
+        return pd.read_sql(query, conn, params=params)
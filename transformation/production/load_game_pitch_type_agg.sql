@@ -0,0 +1,54 @@
+-- Optional bind parameters (NULL = no filter), supplied by utils/sql_runner:
+--   game_pks    bigint[] of games to load
+--   start_date  / end_date  inclusive dim_game.game_date window
+-- Per-game rows are replaced wholesale: game_pk filters push down through
+-- v_game_level_pitch_type_profile, so only the scoped games are aggregated.
+DELETE FROM production.agg_game_pitch_type a
+WHERE (CAST(:game_pks AS bigint[]) IS NULL OR a.game_pk = ANY(CAST(:game_pks AS bigint[])))
+    AND (
+        (CAST(:start_date AS date) IS NULL AND CAST(:end_date AS date) IS NULL)
+        OR a.game_pk IN (
+            SELECT g.game_pk
+            FROM production.dim_game g
+            WHERE g.game_date >= COALESCE(CAST(:start_date AS date), '-infinity'::date)
+                AND g.game_date <= COALESCE(CAST(:end_date AS date), 'infinity'::date)
+        )
+    );
+
+INSERT INTO production.agg_game_pitch_type (
+    game_pk, pitcher_id, pitch_type, batter_stand, pitch_name,
+    pitches, avg_move_in, avg_ivb_in, bat_contact_rate, batted_balls,
+    inplay_contact_rate, csw_pct, swing_rate, whiff_rate, avg_xwoba_on_bip,
+    hard_hit_rate_on_bip, sweet_spot_rate_on_bip, usage_pct, total_pitches
+)
+SELECT
+    v.game_pk,
+    v.pitcher_id,
+    v.pitch_type,
+    v.batter_stand,
+    v.pitch_name,
+    v.pitches,
+    v.avg_move_in,
+    v.avg_ivb_in,
+    v.bat_contact_rate,
+    v.batted_balls,
+    v.inplay_contact_rate,
+    v.csw_pct,
+    v.swing_rate,
+    v.whiff_rate,
+    v.avg_xwoba_on_bip,
+    v.hard_hit_rate_on_bip,
+    v.sweet_spot_rate_on_bip,
+    v.usage_pct,
+    v.total_pitches
+FROM production.v_game_level_pitch_type_profile v
+WHERE (CAST(:game_pks AS bigint[]) IS NULL OR v.game_pk = ANY(CAST(:game_pks AS bigint[])))
+    AND (
+        (CAST(:start_date AS date) IS NULL AND CAST(:end_date AS date) IS NULL)
+        OR v.game_pk IN (
+            SELECT g.game_pk
+            FROM production.dim_game g
+            WHERE g.game_date >= COALESCE(CAST(:start_date AS date), '-infinity'::date)
+                AND g.game_date <= COALESCE(CAST(:end_date AS date), 'infinity'::date)
+        )
+    );
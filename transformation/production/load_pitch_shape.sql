@@ -1,52 +1,119 @@
-INSERT INTO production.sat_pitch_shape (
-    pitch_id, release_pos_x, release_pos_y, release_pos_z, release_spin_rate,
-    release_extension, release_speed, spin_axis, pfx_x, pfx_z, vx0, vy0, vz0, 
-    ax, ay, az, plate_x, plate_z, sz_top, sz_bot
+-- Optional bind parameters (NULL = no filter), supplied by utils/sql_runner:
+--   game_pks    bigint[] of games to load
+--   start_date  / end_date  inclusive dim_game.game_date window
+WITH src AS (
+    SELECT
+        p.pitch_id,
+        sp.release_pos_x,
+        sp.release_pos_y,
+        sp.release_pos_z,
+        sp.release_spin_rate,
+        sp.release_extension,
+        sp.release_speed,
+        sp.spin_axis,
+        sp.pfx_x,
+        sp.pfx_z,
+        sp.vx0,
+        sp.vy0,
+        sp.vz0,
+        sp.ax,
+        sp.ay,
+        sp.az,
+        sp.plate_x,
+        sp.plate_z,
+        sp.sz_top,
+        sp.sz_bot
+    FROM production.fact_pitch p
+    JOIN staging.statcast_pitches sp
+        ON p.game_pk = sp.game_pk
+        AND p.game_counter = sp.game_counter
+        AND p.pitch_number = sp.pitch_number
+    WHERE (CAST(:game_pks AS bigint[]) IS NULL OR p.game_pk = ANY(CAST(:game_pks AS bigint[])))
+        AND (
+            (CAST(:start_date AS date) IS NULL AND CAST(:end_date AS date) IS NULL)
+            OR p.game_pk IN (
+                SELECT g.game_pk
+                FROM production.dim_game g
+                WHERE g.game_date >= COALESCE(CAST(:start_date AS date), '-infinity'::date)
+                    AND g.game_date <= COALESCE(CAST(:end_date AS date), 'infinity'::date)
+            )
+        )
+),
+upserted AS (
+    INSERT INTO production.sat_pitch_shape AS t (
+        pitch_id, release_pos_x, release_pos_y, release_pos_z, release_spin_rate,
+        release_extension, release_speed, spin_axis, pfx_x, pfx_z, vx0, vy0, vz0,
+        ax, ay, az, plate_x, plate_z, sz_top, sz_bot
+    )
+    SELECT * FROM src
+    ON CONFLICT (pitch_id) DO UPDATE
+    SET
+        release_pos_x = EXCLUDED.release_pos_x,
+        release_pos_y = EXCLUDED.release_pos_y,
+        release_pos_z = EXCLUDED.release_pos_z,
+        release_spin_rate = EXCLUDED.release_spin_rate,
+        release_extension = EXCLUDED.release_extension,
+        release_speed = EXCLUDED.release_speed,
+        spin_axis = EXCLUDED.spin_axis,
+        pfx_x = EXCLUDED.pfx_x,
+        pfx_z = EXCLUDED.pfx_z,
+        vx0 = EXCLUDED.vx0,
+        vy0 = EXCLUDED.vy0,
+        vz0 = EXCLUDED.vz0,
+        ax = EXCLUDED.ax,
+        ay = EXCLUDED.ay,
+        az = EXCLUDED.az,
+        plate_x = EXCLUDED.plate_x,
+        plate_z = EXCLUDED.plate_z,
+        sz_top = EXCLUDED.sz_top,
+        sz_bot = EXCLUDED.sz_bot
+    -- Only rewrite rows whose content changed; identical rows stay untouched
+    WHERE (
+        t.release_pos_x,
+        t.release_pos_y,
+        t.release_pos_z,
+        t.release_spin_rate,
+        t.release_extension,
+        t.release_speed,
+        t.spin_axis,
+        t.pfx_x,
+        t.pfx_z,
+        t.vx0,
+        t.vy0,
+        t.vz0,
+        t.ax,
+        t.ay,
+        t.az,
+        t.plate_x,
+        t.plate_z,
+        t.sz_top,
+        t.sz_bot
+    ) IS DISTINCT FROM (
+        EXCLUDED.release_pos_x,
+        EXCLUDED.release_pos_y,
+        EXCLUDED.release_pos_z,
+        EXCLUDED.release_spin_rate,
+        EXCLUDED.release_extension,
+        EXCLUDED.release_speed,
+        EXCLUDED.spin_axis,
+        EXCLUDED.pfx_x,
+        EXCLUDED.pfx_z,
+        EXCLUDED.vx0,
+        EXCLUDED.vy0,
+        EXCLUDED.vz0,
+        EXCLUDED.ax,
+        EXCLUDED.ay,
+        EXCLUDED.az,
+        EXCLUDED.plate_x,
+        EXCLUDED.plate_z,
+        EXCLUDED.sz_top,
+        EXCLUDED.sz_bot
+    )
+    RETURNING (xmax = 0) AS inserted
 )
 SELECT
-    p.pitch_id,
-    sp.release_pos_x,
-    sp.release_pos_y,
-    sp.release_pos_z,
-    sp.release_spin_rate,
-    sp.release_extension,
-    sp.release_speed,
-    sp.spin_axis,
-    sp.pfx_x,
-    sp.pfx_z,
-    sp.vx0,
-    sp.vy0,
-    sp.vz0,
-    sp.ax,
-    sp.ay,
-    sp.az,
-    sp.plate_x,
-    sp.plate_z,
-    sp.sz_top,
-    sp.sz_bot
-FROM production.fact_pitch p
-JOIN staging.statcast_pitches sp
-    ON p.game_pk = sp.game_pk
-    AND p.game_counter = sp.game_counter
-    AND p.pitch_number = sp.pitch_number
-ON CONFLICT (pitch_id) DO UPDATE
-SET
-    release_pos_x = EXCLUDED.release_pos_x,
-    release_pos_y = EXCLUDED.release_pos_y,
-    release_pos_z = EXCLUDED.release_pos_z,
-    release_spin_rate = EXCLUDED.release_spin_rate,
-    release_extension = EXCLUDED.release_extension,
-    release_speed = EXCLUDED.release_speed,
-    spin_axis = EXCLUDED.spin_axis,
-    pfx_x = EXCLUDED.pfx_x,
-    pfx_z = EXCLUDED.pfx_z,
-    vx0 = EXCLUDED.vx0,
-    vy0 = EXCLUDED.vy0,
-    vz0 = EXCLUDED.vz0,
-    ax = EXCLUDED.ax,
-    ay = EXCLUDED.ay,
-    az = EXCLUDED.az,
-    plate_x = EXCLUDED.plate_x,
-    plate_z = EXCLUDED.plate_z,
-    sz_top = EXCLUDED.sz_top,
-    sz_bot = EXCLUDED.sz_bot;
\ No newline at end of file
+    'production.sat_pitch_shape' AS target,
+    count(*) FILTER (WHERE inserted) AS inserted,
+    count(*) FILTER (WHERE NOT inserted) AS updated,
+    (SELECT count(*) FROM src) - count(*) AS unchanged
+FROM upserted;
@@ -1,128 +1,255 @@
-INSERT INTO production.fact_pa(
-    game_pk, pitcher_id, batter_id, game_counter,
-    last_pitch_number, pitcher_pa_number, times_through_order,
-    balls, strikes, outs_when_up, inning, inning_topbot, description,
-    events, bat_score, fld_score, post_bat_score,
-    bat_score_diff
+-- Optional bind parameters (NULL = no filter), supplied by utils/sql_runner:
+--   game_pks    bigint[] of games to load
+--   start_date  / end_date  inclusive dim_game.game_date window
+WITH src AS (
+    SELECT 
+        ab.game_pk,
+        ab.pitcher AS pitcher_id,
+        ab.batter AS batter_id,
+        ab.game_counter,
+        ab.last_pitch_number,
+        ab.pitcher_pa_number,
+        ab.times_through_order,
+        ab.balls,
+        ab.strikes,
+        ab.outs_when_up,
+        ab.inning,
+        ab.inning_topbot,
+        p.description,
+        ab.events,
+        ab.bat_score,
+        ab.fld_score,
+        ab.post_bat_score,
+        ab.bat_score_diff
+    FROM staging.statcast_at_bats ab
+    JOIN production.dim_game g
+        ON g.game_pk = ab.game_pk
+    JOIN staging.statcast_pitches p 
+        ON p.game_pk = ab.game_pk 
+        AND p.game_counter = ab.game_counter 
+        AND p.pitch_number = ab.last_pitch_number
+    WHERE g.game_type NOT IN ('E', 'S')
+        AND (CAST(:game_pks AS bigint[]) IS NULL OR ab.game_pk = ANY(CAST(:game_pks AS bigint[])))
+        AND (CAST(:start_date AS date) IS NULL OR g.game_date >= CAST(:start_date AS date))
+        AND (CAST(:end_date AS date) IS NULL OR g.game_date <= CAST(:end_date AS date))
+),
+upserted AS (
+    INSERT INTO production.fact_pa AS t (
+        game_pk, pitcher_id, batter_id, game_counter,
+        last_pitch_number, pitcher_pa_number, times_through_order,
+        balls, strikes, outs_when_up, inning, inning_topbot, description,
+        events, bat_score, fld_score, post_bat_score,
+        bat_score_diff
+    )
+    SELECT * FROM src
+    ON CONFLICT (game_pk, game_counter) DO UPDATE
+    SET pitcher_id = EXCLUDED.pitcher_id,
+        batter_id = EXCLUDED.batter_id,
+        game_counter = EXCLUDED.game_counter,
+        last_pitch_number = EXCLUDED.last_pitch_number,
+        pitcher_pa_number = EXCLUDED.pitcher_pa_number,
+        times_through_order = EXCLUDED.times_through_order,
+        balls = EXCLUDED.balls,
+        strikes = EXCLUDED.strikes,
+        outs_when_up = EXCLUDED.outs_when_up,
+        inning = EXCLUDED.inning,
+        inning_topbot = EXCLUDED.inning_topbot,
+        description = EXCLUDED.description,
+        events = EXCLUDED.events,
+        bat_score = EXCLUDED.bat_score,
+        fld_score = EXCLUDED.fld_score,
+        post_bat_score = EXCLUDED.post_bat_score,
+        bat_score_diff = EXCLUDED.bat_score_diff
+    -- Only rewrite rows whose content changed; identical rows stay untouched
+    WHERE (
+        t.pitcher_id,
+        t.batter_id,
+        t.game_counter,
+        t.last_pitch_number,
+        t.pitcher_pa_number,
+        t.times_through_order,
+        t.balls,
+        t.strikes,
+        t.outs_when_up,
+        t.inning,
+        t.inning_topbot,
+        t.description,
+        t.events,
+        t.bat_score,
+        t.fld_score,
+        t.post_bat_score,
+        t.bat_score_diff
+    ) IS DISTINCT FROM (
+        EXCLUDED.pitcher_id,
+        EXCLUDED.batter_id,
+        EXCLUDED.game_counter,
+        EXCLUDED.last_pitch_number,
+        EXCLUDED.pitcher_pa_number,
+        EXCLUDED.times_through_order,
+        EXCLUDED.balls,
+        EXCLUDED.strikes,
+        EXCLUDED.outs_when_up,
+        EXCLUDED.inning,
+        EXCLUDED.inning_topbot,
+        EXCLUDED.description,
+        EXCLUDED.events,
+        EXCLUDED.bat_score,
+        EXCLUDED.fld_score,
+        EXCLUDED.post_bat_score,
+        EXCLUDED.bat_score_diff
+    )
+    RETURNING (xmax = 0) AS inserted
 )
-SELECT 
-    ab.game_pk,
-    ab.pitcher AS pitcher_id,
-    ab.batter AS batter_id,
-    ab.game_counter,
-    ab.last_pitch_number,
-    ab.pitcher_pa_number,
-    ab.times_through_order,
-    ab.balls,
-    ab.strikes,
-    ab.outs_when_up,
-    ab.inning,
-    ab.inning_topbot,
-    p.description,
-    ab.events,
-    ab.bat_score,
-    ab.fld_score,
-    ab.post_bat_score,
-    ab.bat_score_diff
-FROM staging.statcast_at_bats ab
-JOIN production.dim_game g
-    ON g.game_pk = ab.game_pk
-JOIN staging.statcast_pitches p 
-    ON p.game_pk = ab.game_pk 
-    AND p.game_counter = ab.game_counter 
-    AND p.pitch_number = ab.last_pitch_number
-WHERE g.game_type NOT IN ('E', 'S')
-ON CONFLICT (game_pk, game_counter) DO UPDATE
-SET pitcher_id = EXCLUDED.pitcher_id,
-    batter_id = EXCLUDED.batter_id,
-    game_counter = EXCLUDED.game_counter,
-    last_pitch_number = EXCLUDED.last_pitch_number,
-    pitcher_pa_number = EXCLUDED.pitcher_pa_number,
-    times_through_order = EXCLUDED.times_through_order,
-    balls = EXCLUDED.balls,
-    strikes = EXCLUDED.strikes,
-    outs_when_up = EXCLUDED.outs_when_up,
-    inning = EXCLUDED.inning,
-    inning_topbot = EXCLUDED.inning_topbot,
-    description = EXCLUDED.description,
-    events = EXCLUDED.events,
-    bat_score = EXCLUDED.bat_score,
-    fld_score = EXCLUDED.fld_score,
-    post_bat_score = EXCLUDED.fld_score,
-    bat_score_diff = EXCLUDED.bat_score_diff;
+SELECT
+    'production.fact_pa' AS target,
+    count(*) FILTER (WHERE inserted) AS inserted,
+    count(*) FILTER (WHERE NOT inserted) AS updated,
+    (SELECT count(*) FROM src) - count(*) AS unchanged
+FROM upserted;
 
 
-INSERT INTO production.fact_pitch (
-    pa_id, game_pk, pitcher_id, batter_id, game_counter, pitch_number,
-    pitch_type, pitch_name, description, release_speed, effective_speed,
-    release_spin_rate, release_extension, spin_axis, pfx_x, pfx_z,
-    zone, plate_x, plate_z, balls, strikes, outs_when_up, bat_score_diff,
-    is_whiff, is_called_strike, is_bip, is_swing, is_foul, batter_stand
+WITH src AS (
+    SELECT
+        pa.pa_id,
+        p.game_pk,
+        p.pitcher AS pitcher_id,
+        p.batter AS batter_id,
+        p.game_counter,
+        p.pitch_number,
+        p.pitch_type,
+        p.pitch_name,
+        p.description,
+        p.release_speed,
+        p.effective_speed,
+        p.release_spin_rate,
+        p.release_extension,
+        p.spin_axis,
+        p.pfx_x,
+        p.pfx_z,
+        p.zone,
+        p.plate_x,
+        p.plate_z,
+        p.balls,
+        p.strikes,
+        p.outs_when_up,
+        p.bat_score_diff,
+        p.is_whiff,
+        p.is_called_strike,
+        p.is_bip,
+        p.is_swing,
+        p.is_foul,
+        p.stand
+    FROM staging.statcast_pitches p
+    JOIN production.fact_pa pa
+        ON pa.game_pk = p.game_pk
+        AND pa.game_counter = p.game_counter
+    JOIN production.dim_game g
+        ON pa.game_pk = g.game_pk
+    LEFT JOIN staging.pitching_boxscores pb
+        ON p.game_pk = pb.game_pk
+        AND p.pitcher = pb.pitcher_id
+    WHERE g.game_type NOT IN ('E', 'S')
+        AND (CAST(:game_pks AS bigint[]) IS NULL OR p.game_pk = ANY(CAST(:game_pks AS bigint[])))
+        AND (CAST(:start_date AS date) IS NULL OR g.game_date >= CAST(:start_date AS date))
+        AND (CAST(:end_date AS date) IS NULL OR g.game_date <= CAST(:end_date AS date))
+),
+upserted AS (
+    INSERT INTO production.fact_pitch AS t (
+        pa_id, game_pk, pitcher_id, batter_id, game_counter, pitch_number,
+        pitch_type, pitch_name, description, release_speed, effective_speed,
+        release_spin_rate, release_extension, spin_axis, pfx_x, pfx_z,
+        zone, plate_x, plate_z, balls, strikes, outs_when_up, bat_score_diff,
+        is_whiff, is_called_strike, is_bip, is_swing, is_foul, batter_stand
+    )
+    SELECT * FROM src
+    ON CONFLICT (game_pk, game_counter, pitch_number) DO UPDATE
+    SET pa_id = EXCLUDED.pa_id,
+        pitcher_id = EXCLUDED.pitcher_id,
+        batter_id = EXCLUDED.batter_id,
+        pitch_type = EXCLUDED.pitch_type,
+        pitch_name = EXCLUDED.pitch_name,
+        description = EXCLUDED.description,
+        release_speed = EXCLUDED.release_speed,
+        effective_speed = EXCLUDED.effective_speed,
+        release_spin_rate = EXCLUDED.release_spin_rate,
+        release_extension = EXCLUDED.release_extension,
+        spin_axis = EXCLUDED.spin_axis,
+        pfx_x = EXCLUDED.pfx_x,
+        pfx_z = EXCLUDED.pfx_z,
+        zone = EXCLUDED.zone,
+        plate_x = EXCLUDED.plate_x,
+        plate_z = EXCLUDED.plate_z,
+        balls = EXCLUDED.balls,
+        strikes = EXCLUDED.strikes,
+        outs_when_up = EXCLUDED.outs_when_up,
+        bat_score_diff = EXCLUDED.bat_score_diff,
+        is_whiff = EXCLUDED.is_whiff,
+        is_called_strike = EXCLUDED.is_called_strike,
+        is_bip = EXCLUDED.is_bip,
+        is_swing = EXCLUDED.is_swing,
+        is_foul = EXCLUDED.is_foul,
+        batter_stand = EXCLUDED.batter_stand
+    -- Only rewrite rows whose content changed; identical rows stay untouched
+    WHERE (
+        t.pa_id,
+        t.pitcher_id,
+        t.batter_id,
+        t.pitch_type,
+        t.pitch_name,
+        t.description,
+        t.release_speed,
+        t.effective_speed,
+        t.release_spin_rate,
+        t.release_extension,
+        t.spin_axis,
+        t.pfx_x,
+        t.pfx_z,
+        t.zone,
+        t.plate_x,
+        t.plate_z,
+        t.balls,
+        t.strikes,
+        t.outs_when_up,
+        t.bat_score_diff,
+        t.is_whiff,
+        t.is_called_strike,
+        t.is_bip,
+        t.is_swing,
+        t.is_foul,
+        t.batter_stand
+    ) IS DISTINCT FROM (
+        EXCLUDED.pa_id,
+        EXCLUDED.pitcher_id,
+        EXCLUDED.batter_id,
+        EXCLUDED.pitch_type,
+        EXCLUDED.pitch_name,
+        EXCLUDED.description,
+        EXCLUDED.release_speed,
+        EXCLUDED.effective_speed,
+        EXCLUDED.release_spin_rate,
+        EXCLUDED.release_extension,
+        EXCLUDED.spin_axis,
+        EXCLUDED.pfx_x,
+        EXCLUDED.pfx_z,
+        EXCLUDED.zone,
+        EXCLUDED.plate_x,
+        EXCLUDED.plate_z,
+        EXCLUDED.balls,
+        EXCLUDED.strikes,
+        EXCLUDED.outs_when_up,
+        EXCLUDED.bat_score_diff,
+        EXCLUDED.is_whiff,
+        EXCLUDED.is_called_strike,
+        EXCLUDED.is_bip,
+        EXCLUDED.is_swing,
+        EXCLUDED.is_foul,
+        EXCLUDED.batter_stand
+    )
+    RETURNING (xmax = 0) AS inserted
 )
 SELECT
-    pa.pa_id,
-    p.game_pk,
-    p.pitcher AS pitcher_id,
-    p.batter AS batter_id,
-    p.game_counter,
-    p.pitch_number,
-    p.pitch_type,
-    p.pitch_name,
-    p.description,
-    p.release_speed,
-    p.effective_speed,
-    p.release_spin_rate,
-    p.release_extension,
-    p.spin_axis,
-    p.pfx_x,
-    p.pfx_z,
-    p.zone,
-    p.plate_x,
-    p.plate_z,
-    p.balls,
-    p.strikes,
-    p.outs_when_up,
-    p.bat_score_diff,
-    p.is_whiff,
-    p.is_called_strike,
-    p.is_bip,
-    p.is_swing,
-    p.is_foul,
-    p.stand
-FROM staging.statcast_pitches p
-JOIN production.fact_pa pa
-    ON pa.game_pk = p.game_pk
-    AND pa.game_counter = p.game_counter
-JOIN production.dim_game g
-    ON pa.game_pk = g.game_pk
-LEFT JOIN staging.pitching_boxscores pb
-    ON p.game_pk = pb.game_pk
-    AND p.pitcher = pb.pitcher_id
-WHERE g.game_type NOT IN ('E', 'S')
-ON CONFLICT (game_pk, game_counter, pitch_number) DO UPDATE
-SET pa_id = EXCLUDED.pa_id,
-    pitcher_id = EXCLUDED.pitcher_id,
-    batter_id = EXCLUDED.batter_id,
-    pitch_type = EXCLUDED.pitch_type,
-    pitch_name = EXCLUDED.pitch_name,
-    description = EXCLUDED.description,
-    release_speed = EXCLUDED.release_speed,
-    effective_speed = EXCLUDED.effective_speed,
-    release_spin_rate = EXCLUDED.release_spin_rate,
-    release_extension = EXCLUDED.release_extension,
-    spin_axis = EXCLUDED.spin_axis,
-    pfx_x = EXCLUDED.pfx_x,
-    pfx_z = EXCLUDED.pfx_z,
-    zone = EXCLUDED.zone,
-    plate_x = EXCLUDED.plate_x,
-    plate_z = EXCLUDED.plate_z,
-    balls = EXCLUDED.balls,
-    strikes = EXCLUDED.strikes,
-    outs_when_up = EXCLUDED.outs_when_up,
-    bat_score_diff = EXCLUDED.bat_score_diff,
-    is_whiff = EXCLUDED.is_whiff,
-    is_called_strike = EXCLUDED.is_called_strike,
-    is_bip = EXCLUDED.is_bip,
-    is_swing = EXCLUDED.is_swing,
-    is_foul = EXCLUDED.is_foul,
-    batter_stand = EXCLUDED.batter_stand
\ No newline at end of file
+    'production.fact_pitch' AS target,
+    count(*) FILTER (WHERE inserted) AS inserted,
+    count(*) FILTER (WHERE NOT inserted) AS updated,
+    (SELECT count(*) FROM src) - count(*) AS unchanged
+FROM upserted;
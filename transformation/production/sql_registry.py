@@ -1,27 +1,52 @@
 """SQL script registry for production table loads.
 
-This registry defines the order and configuration for SQL scripts that
-transform data from staging tables to production tables.
+This registry defines the configuration for SQL scripts that transform data
+from staging tables to production tables. Execution order comes from
+'tables' / 'depends_on' (see utils.sql_runner.run_sql_registry).
+
+Entries with 'params' accept those bind parameters from run_sql_registry to
+scope the load (game_pks, start_date/end_date); unset parameters are NULL and
+the script loads everything.
 """
 
+LOAD_SCOPE_PARAMS = ['game_pks', 'start_date', 'end_date']
+
+# Tables loaded outside this registry (Python staging/dim loads, raw
+# ingestion); run_sql_registry treats them as already available
+SQL_SOURCE_TABLES = [
+    'staging.statcast_pitches',
+    'staging.statcast_at_bats',
+    'staging.statcast_batted_balls',
+    'production.dim_game',
+    'production.dim_player',
+    'raw.pitching_boxscores',
+    'raw.batting_boxscores',
+]
+
 SQL_REGISTRY = [
     {
         'name': 'load_facts',
         'script': 'transformation/production/production_load_facts.sql',
         'tables': ['production.fact_pa', 'production.fact_pitch'],
-        'depends_on': ['staging.statcast_at_bats', 'staging.statcast_pitches', 'production.dim_game']
+        'depends_on': [
+            'staging.statcast_at_bats', 'staging.statcast_pitches', 'production.dim_game',
+            'staging.pitching_boxscores'
+        ],
+        'params': LOAD_SCOPE_PARAMS
     },
     {
         'name': 'load_pitch_shape',
         'script': 'transformation/production/load_pitch_shape.sql',
         'tables': ['production.sat_pitch_shape'],
-        'depends_on': ['production.fact_pitch']
+        'depends_on': ['production.fact_pitch'],
+        'params': LOAD_SCOPE_PARAMS
     },
     {
         'name': 'load_batted_balls',
         'script': 'transformation/production/load_batted_balls.sql',
         'tables': ['production.sat_batted_balls'],
-        'depends_on': ['production.fact_pitch', 'production.dim_player', 'staging.statcast_batted_balls']
+        'depends_on': ['production.fact_pitch', 'production.dim_player', 'staging.statcast_batted_balls'],
+        'params': LOAD_SCOPE_PARAMS
     },
     {
         'name': 'transform_pitching_boxscores',
@@ -34,5 +59,29 @@ SQL_REGISTRY = [
         'script': 'transformation/staging/transform_batting_boxscores.sql',
         'tables': ['staging.batting_boxscores'],
         'depends_on': ['raw.batting_boxscores']
+    },
+    {
+        'name': 'load_game_pitch_type_agg',
+        'script': 'transformation/production/load_game_pitch_type_agg.sql',
+        'tables': ['production.agg_game_pitch_type'],
+        'depends_on': [
+            'production.sat_pitch_shape', 'production.fact_pitch',
+            'production.sat_batted_balls', 'production.dim_player'
+        ],
+        'params': LOAD_SCOPE_PARAMS
+    },
+    {
+        # Materialized views created by alembic revision 7d3e9a1c5b28. A
+        # refresh rebuilds every pitch, so scoped (incremental) runs defer it
+        # and the views catch up on the next full run
+        'name': 'refresh_pitch_profiles',
+        'refresh': ['production.mv_pitch_shape_features', 'production.mv_pitch_type_profile'],
+        'concurrently': True,
+        'full_only': True,
+        'tables': ['production.mv_pitch_shape_features', 'production.mv_pitch_type_profile'],
+        'depends_on': [
+            'production.sat_pitch_shape', 'production.fact_pitch',
+            'production.sat_batted_balls', 'production.dim_player'
+        ]
     }
 ]
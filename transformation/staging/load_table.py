@@ -1,16 +1,20 @@
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from sqlalchemy import create_engine
 from utils.utils import build_db_url
-from transformation.staging.transform_load_table import transform_and_load
+from utils.statcast_dataset import read_statcast_source, iter_statcast_batches, align_batches_on
+from transformation.staging.transform_load_table import transform_and_load, transform_and_load_stream
 
 from schema.staging.statcast_pitches import STATCAST_PITCHES_SPEC
 from schema.staging.statcast_batted_balls import STATCAST_BATTED_BALLS_SPEC
-from schema.staging.statcast_at_bats import STATCAST_AT_BATS_SPEC
+from schema.staging.statcast_at_bats import STATCAST_AT_BATS_SPEC, STATCAST_AT_BATS_INPUT_SPEC
+from schema.spec_engine import required_source_columns, apply_table_spec
+from schema.staging.statcast_shared import STATCAST_SHARED_SPEC, STATCAST_SHARED_DERIVED
 from schema.production.dim_tables import DIM_PLAYER_SPEC, DIM_TEAM_SPEC, DIM_GAME_SPEC
 from schema.production.sat_tables import SAT_BATTED_BALLS_SPEC, SAT_PITCH_SHAPE_SPEC
-from transformation.builders.build_at_bats import build_statcast_at_bats
+from transformation.builders.build_at_bats import build_statcast_at_bats, build_statcast_at_bats_parallel
 from transformation.builders.build_dim_game import build_dim_game
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -23,6 +27,7 @@ REGISTRY = {
         'table': 'statcast_pitches',
         'constraint': 'statcast_pitches_pkey',
         'source': 'parquet',
+        'columns': required_source_columns(STATCAST_PITCHES_SPEC),
         'builder': None
     },
     'statcast_batted_balls': {
@@ -31,6 +36,7 @@ REGISTRY = {
         'table': 'statcast_batted_balls',
         'constraint': 'statcast_batted_balls_pkey',
         'source': 'parquet',
+        'columns': required_source_columns(STATCAST_BATTED_BALLS_SPEC),
         'builder': None
     },
     'statcast_at_bats': {
@@ -39,7 +45,9 @@ REGISTRY = {
         'table': 'statcast_at_bats',
         'constraint': 'statcast_at_bats_pkey',
         'source': 'parquet',
-        'builder': build_statcast_at_bats
+        'columns': required_source_columns(STATCAST_AT_BATS_INPUT_SPEC, STATCAST_AT_BATS_SPEC),
+        'builder': build_statcast_at_bats,
+        'parallel_builder': build_statcast_at_bats_parallel
     },
     'dim_player': {
         'spec': DIM_PLAYER_SPEC,
@@ -47,7 +55,9 @@ REGISTRY = {
         'table': 'dim_player',
         'constraint': 'dim_player_pkey',
         'source': 'parquet',
-        'builder': None
+        'builder': None,
+        # team, age, active etc. change; the refreshed values must win
+        'overwrite': True
     },
     'dim_game': {
         'spec': DIM_GAME_SPEC,
@@ -59,7 +69,17 @@ REGISTRY = {
     }
 }
 
-def load_table(table_key: str, parquet_path: str = None):
+def load_table(
+    table_key: str,
+    parquet_path: str = None,
+    loader: str = 'copy',
+    start_date: str = None,
+    end_date: str = None,
+    memory_report: bool = False,
+    batch_rows: int = None,
+    build_workers: int = None,
+    game_pks: list[int] = None
+):
     if table_key not in REGISTRY:
         raise ValueError(f"Unknown table '{table_key}'. Options: {list(REGISTRY)}")
 
@@ -70,17 +90,56 @@ def load_table(table_key: str, parquet_path: str = None):
 
     builder = cfg.get("builder")
 
+    if batch_rows and source == 'parquet':
+        # Streaming: bounded memory, batches re-cut on game_pk so builders
+        # always see whole games
+        if parquet_path is None:
+            parquet_path = PARQUET_PATH
+        batches = align_batches_on(
+            iter_statcast_batches(
+                parquet_path,
+                columns=cfg.get('columns'),
+                batch_rows=batch_rows,
+                start_date=start_date,
+                end_date=end_date,
+                game_pks=game_pks
+            ),
+            key='game_pk'
+        )
+        n, report = transform_and_load_stream(
+            engine,
+            batches,
+            spec=cfg['spec'],
+            schema=cfg['schema'],
+            table=cfg['table'],
+            constraint=cfg['constraint'],
+            loader=loader,
+            builder=builder,
+            overwrite=cfg.get('overwrite', False)
+        )
+        print(report)
+        return
+
     if source == 'staging':
         # Builder fetches data from staging tables
         if builder is None:
             raise ValueError(f"Table '{table_key}' has source='staging' but no builder")
-        df_raw = builder(None)
+        df_raw = builder(None) if game_pks is None else builder(None, game_pks=game_pks)
     else:
-        # Source is parquet
+        # Source is a parquet file or a season=/game_date= dataset directory
         if parquet_path is None:
             parquet_path = PARQUET_PATH
-        df_raw = pd.read_parquet(parquet_path)
-        if builder is not None:
+        # Only read the source columns the spec (and builder) use; None = all
+        df_raw = read_statcast_source(
+            parquet_path,
+            columns=cfg.get('columns'),
+            start_date=start_date,
+            end_date=end_date,
+            game_pks=game_pks
+        )
+        if build_workers and cfg.get('parallel_builder') is not None:
+            df_raw = cfg['parallel_builder'](df_raw, max_workers=build_workers)
+        elif builder is not None:
             df_raw = builder(df_raw)
 
     n, report = transform_and_load(
@@ -89,19 +148,128 @@ def load_table(table_key: str, parquet_path: str = None):
         spec=cfg['spec'],
         schema=cfg['schema'],
         table=cfg['table'],
-        constraint=cfg['constraint']
+        constraint=cfg['constraint'],
+        loader=loader,
+        # df_raw is owned here, so the copy loader can transform it in place
+        inplace=(loader == 'copy'),
+        memory_report=memory_report,
+        overwrite=cfg.get('overwrite', False)
     )
 
     print(report)
 
+STAGING_FANOUT = ['statcast_pitches', 'statcast_at_bats', 'statcast_batted_balls']
+
+def load_staging_fanout(
+    parquet_path: str = None,
+    table_keys: list[str] = None,
+    loader: str = 'copy',
+    start_date: str = None,
+    end_date: str = None,
+    max_workers: int = None,
+    game_pks: list[int] = None
+) -> dict[str, dict]:
+    """
+    Load several parquet-sourced staging tables from one read of the source.
+
+    The union of the tables' columns is read once, STATCAST_SHARED_SPEC
+    (renames, key coercion, outcome-flag derives) is applied once, and each
+    table is then built and loaded from that shared base concurrently, each
+    on its own pooled connection. game_pks limits the read to those games
+    (e.g. changed_game_pks for an incremental run).
+
+    Returns:
+        Dict of table key -> DQ report
+    """
+    if table_keys is None:
+        table_keys = STAGING_FANOUT
+    if parquet_path is None:
+        parquet_path = PARQUET_PATH
+
+    for key in table_keys:
+        if key not in REGISTRY:
+            raise ValueError(f"Unknown table '{key}'. Options: {list(REGISTRY)}")
+        if REGISTRY[key].get('source', 'parquet') != 'parquet':
+            raise ValueError(f"Table '{key}' is not parquet-sourced and cannot fan out")
+
+    columns = {}
+    for key in table_keys:
+        for col in REGISTRY[key].get('columns') or []:
+            columns[col] = None
+    columns = list(columns) if all(REGISTRY[k].get('columns') for k in table_keys) else None
+
+    df_raw = read_statcast_source(
+        parquet_path,
+        columns=columns,
+        start_date=start_date,
+        end_date=end_date,
+        game_pks=game_pks
+    )
+    df_base, base_report = apply_table_spec(df_raw, STATCAST_SHARED_SPEC)
+    del df_raw
+    print(base_report)
+
+    derived = list(STATCAST_SHARED_DERIVED)
+    engine = create_engine(build_db_url(), pool_size=max(5, len(table_keys)))
+
+    def _load(key: str) -> dict:
+        cfg = REGISTRY[key]
+        builder = cfg.get('builder')
+        df = builder(df_base, derived=derived) if builder is not None else df_base
+        _, report = transform_and_load(
+            engine,
+            df,
+            spec=cfg['spec'],
+            schema=cfg['schema'],
+            table=cfg['table'],
+            constraint=cfg['constraint'],
+            loader=loader,
+            derived=derived,
+            # df_base is shared by every thread: each path must copy before
+            # coercing, never transform it in place
+            inplace=False
+        )
+        return report
+
+    reports = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(table_keys)) as executor:
+        futures = {key: executor.submit(_load, key) for key in table_keys}
+        for key, future in futures.items():
+            reports[key] = future.result()
+            print(reports[key])
+
+    return reports
+
 def main():
     parser = argparse.ArgumentParser()
 
     parser.add_argument("table", help=f"One of: {', '.join(REGISTRY.keys())}")
     parser.add_argument("--parquet", default=PARQUET_PATH)
+    parser.add_argument("--loader", default='copy', choices=['copy', 'insert'],
+                        help="copy: binary COPY into temp table + one merge; insert: row-wise upserts")
+    parser.add_argument("--start-date", help="game_date lower bound (dataset sources only)")
+    parser.add_argument("--end-date", help="game_date upper bound (dataset sources only)")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="report tracemalloc peak relative to the source frame, and peak RSS")
+    parser.add_argument("--batch-rows", type=int,
+                        help="stream the parquet source in batches of this many rows")
+    parser.add_argument("--build-workers", type=int,
+                        help="build by game_pk partition across this many processes (tables with a parallel builder)")
+    parser.add_argument("--game-pks", type=int, nargs="+",
+                        help="only load these games (dataset sources and staging builders)")
     args = parser.parse_args()
 
-    load_table(args.table, parquet_path=args.parquet)
+    load_table(
+        args.table,
+        parquet_path=args.parquet,
+        loader=args.loader,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        memory_report=args.memory_report,
+        batch_rows=args.batch_rows,
+        build_workers=args.build_workers,
+        game_pks=args.game_pks
+    )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
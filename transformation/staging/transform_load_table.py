@@ -1,11 +1,18 @@
 import pandas as pd
 import numpy as np
+from contextlib import nullcontext
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import create_engine, text, Table, MetaData, func
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import insert
-from typing import Optional, Tuple, Any
+from typing import Optional, Tuple, Any, Callable, Iterable
 
-from schema.spec_engine import apply_table_spec, TableSpec, _coerce_series
+from schema.spec_engine import apply_table_spec, TableSpec
+from utils.memory import PeakMemory, frame_bytes
+from utils.statcast_utils import PKDedupIndex
+
+COPY_CHUNK_ROWS = 50_000
 
 def get_table_columns(engine, schema: str, table: str) -> list[str]:
     sql = text("""
@@ -19,7 +26,15 @@ def get_table_columns(engine, schema: str, table: str) -> list[str]:
         rows = conn.execute(sql, {"schema": schema, "table": table}).fetchall()
     return [r[0] for r in rows]
 
-def align_df_to_table(df: pd.DataFrame, table_cols: list[str]) -> pd.DataFrame:
+def align_df_to_table(df: pd.DataFrame, table_cols: list[str], copy: bool = True) -> pd.DataFrame:
+    if not copy:
+        # Owned frame: only drop extras in place. Missing columns are left to
+        # the table's NULL/defaults and column order to the COPY column list.
+        extras = [c for c in df.columns if c not in table_cols]
+        if extras:
+            df.drop(columns=extras, inplace=True)
+        return df
+
     df = df.copy()
 
     # add missing cols as nulls
@@ -31,18 +46,29 @@ def align_df_to_table(df: pd.DataFrame, table_cols: list[str]) -> pd.DataFrame:
     df = df[[c for c in table_cols if c in df.columns]].copy()
     return df
 
-def prepare_for_postgres(df, spec: TableSpec):
+def prepare_for_postgres(df, spec: TableSpec, copy: bool = True):
+    if not copy:
+        # Owned frame, column at a time. Nulls are left as NA; the COPY
+        # loader turns them into None while streaming.
+        for col in df.columns:
+            s = df[col]
+            if pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+                empty = s.eq("").fillna(False).astype(bool)
+                if empty.any():
+                    df.loc[empty, col] = None
+
+        for step in spec.compile().steps:
+            if step.name in df.columns and step.coerce is not None:
+                df[step.name] = step.coerce(df[step.name])
+        return df
+
     df = df.copy()
 
     df = df.replace("", None)
 
-    for _, colspec in spec.columns.items():
-        col = colspec.name
-
-        if col not in df.columns:
-            continue
-        if colspec.dtype:
-            df[col] = _coerce_series(df[col], colspec.dtype)
+    for step in spec.compile().steps:
+        if step.name in df.columns and step.coerce is not None:
+            df[step.name] = step.coerce(df[step.name])
 
     df = df.where(df.notna(), None)
 
@@ -56,7 +82,14 @@ def insert_update_conflicts(
     spec: TableSpec,
     constraint: str,
     batch_size: int = 10_000,
+    overwrite: bool = False,
 ):
+    """
+    Row-wise INSERT ... ON CONFLICT upsert of df into schema.table_name.
+
+    Existing non-null values win (COALESCE(target, excluded)); with
+    overwrite=True df's columns replace the stored values instead.
+    """
     metadata = MetaData(schema=schema)
     table = Table(table_name, metadata, autoload_with=engine)
 
@@ -80,10 +113,17 @@ def insert_update_conflicts(
             excluded = stmt.excluded
             update_cols = [c.name for c in table.columns if c.name not in spec.pk]
 
-            set_clause = {
-                c: func.coalesce(getattr(table.c, c), getattr(excluded, c))
-                for c in update_cols
-            }
+            if overwrite:
+                # only df's columns; the rest would be set to their defaults
+                set_clause = {
+                    c: getattr(excluded, c)
+                    for c in update_cols if c in df.columns
+                }
+            else:
+                set_clause = {
+                    c: func.coalesce(getattr(table.c, c), getattr(excluded, c))
+                    for c in update_cols
+                }
 
             stmt = stmt.on_conflict_do_update(
                 constraint=constraint,
@@ -121,6 +161,140 @@ def insert_update_conflicts(
 
     return inserted
 
+def get_table_column_types(engine, schema: str, table: str) -> dict[str, str]:
+    sql = text("""
+        SELECT column_name, udt_name
+        FROM information_schema.columns
+        WHERE table_schema = :schema
+        AND table_name = :table
+        ORDER BY ordinal_position
+    """)
+    with engine.connect() as conn:
+        rows = conn.execute(sql, {"schema": schema, "table": table}).fetchall()
+    return {r[0]: r[1] for r in rows}
+
+INT_UDTS = ('int2', 'int4', 'int8')
+TEXT_UDTS = ('text', 'varchar', 'bpchar')
+
+def _copy_values(s: pd.Series, udt: str) -> list:
+    # Python natives with None for nulls, converted to what the binary dumper
+    # for the target column accepts: aware datetimes for timestamptz (naive
+    # values are taken as UTC), naive for timestamp, Decimal for numeric,
+    # int for integer columns that arrive as float because of nulls
+    if udt == 'date':
+        s = pd.to_datetime(s, errors='coerce').dt.date
+    elif udt == 'timestamptz':
+        s = pd.to_datetime(s, errors='coerce', utc=True)
+    elif udt == 'timestamp':
+        s = pd.to_datetime(s, errors='coerce')
+        if s.dt.tz is not None:
+            s = s.dt.tz_convert('UTC').dt.tz_localize(None)
+    s = s.astype(object)
+    values = s.where(s.notna(), None).tolist()
+
+    convert = None
+    if udt == 'numeric':
+        convert = lambda v: v if isinstance(v, Decimal) else Decimal(str(v))
+    elif udt in INT_UDTS:
+        convert = int
+    elif udt in TEXT_UDTS:
+        convert = str
+    if convert is not None:
+        values = [None if v is None else convert(v) for v in values]
+    return values
+
+def copy_merge_into_table(
+    engine,
+    df: pd.DataFrame,
+    schema: str,
+    table_name: str,
+    spec: TableSpec,
+    constraint: str,
+    overwrite: bool = False,
+) -> int:
+    """
+    Stream df into a temp table with binary COPY, then merge it into
+    schema.table_name in one INSERT ... ON CONFLICT statement.
+
+    Merge semantics match insert_update_conflicts: existing non-null values
+    win over incoming ones (COALESCE(target, excluded)), or with
+    overwrite=True the incoming values replace them.
+
+    Returns:
+        Number of rows inserted or updated by the merge
+    """
+    pk = spec.pk
+    null_pk = df[pk].isna().any(axis=1)
+    if null_pk.any():
+        bad = df.loc[null_pk, pk].head()
+        raise ValueError(f"Nulls found in primary key columns:\n{bad}")
+
+    col_types = get_table_column_types(engine, schema, table_name)
+    cols = [c for c in df.columns if c in col_types]
+    if not cols:
+        raise ValueError(f"No columns of {schema}.{table_name} found in dataframe")
+
+    tmp_name = f"tmp_{table_name}_load"
+    target = f'"{schema}"."{table_name}"'
+    col_list = ", ".join(f'"{c}"' for c in cols)
+    update_cols = [c for c in cols if c not in pk]
+    if overwrite:
+        set_clause = ",\n                ".join(f'"{c}" = EXCLUDED."{c}"' for c in update_cols)
+    else:
+        set_clause = ",\n                ".join(
+            f'"{c}" = COALESCE(t."{c}", EXCLUDED."{c}")' for c in update_cols
+        )
+    conflict_action = f"DO UPDATE SET {set_clause}" if update_cols else "DO NOTHING"
+
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        with conn.cursor() as cur:
+            cur.execute(
+                f'CREATE TEMP TABLE "{tmp_name}" '
+                f'(LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP'
+            )
+
+            with cur.copy(
+                f'COPY "{tmp_name}" ({col_list}) FROM STDIN (FORMAT BINARY)'
+            ) as copy:
+                copy.set_types([col_types[c] for c in cols])
+                # convert to Python values a chunk at a time to bound memory
+                for start in range(0, len(df), COPY_CHUNK_ROWS):
+                    part = df.iloc[start:start + COPY_CHUNK_ROWS]
+                    columns = [_copy_values(part[c], col_types[c]) for c in cols]
+                    for row in zip(*columns):
+                        copy.write_row(row)
+
+            cur.execute(f"""
+                INSERT INTO {target} AS t ({col_list})
+                SELECT {col_list} FROM "{tmp_name}"
+                ON CONFLICT ON CONSTRAINT "{constraint}"
+                {conflict_action}
+            """)
+            merged = cur.rowcount if cur.rowcount >= 0 else 0
+        conn.commit()
+    except Exception as e:
+        raw.rollback()
+        print("FAILED COPY merge into", f"{schema}.{table_name}")
+        print("ON CONFLICT target:", constraint)
+
+        diag = getattr(e, "diag", None)
+        if diag is not None:
+            primary = getattr(diag, "message_primary", None)
+            detail = getattr(diag, "message_detail", None)
+            if primary:
+                print("PG PRIMARY:", primary)
+            if detail:
+                print("PG DETAIL:", detail)
+        raise
+    finally:
+        raw.close()
+
+    return merged
+
+LOADERS = ('insert', 'copy')
+
 def transform_and_load(
     engine,
     df_raw: pd.DataFrame,
@@ -128,24 +302,196 @@ def transform_and_load(
     schema: str,
     table: str,
     constraint: str,
-    project: bool = False
+    project: bool = False,
+    loader: str = 'copy',
+    derived=(),
+    inplace: bool = False,
+    memory_report: bool = False,
+    overwrite: bool = False
 ) -> tuple[int, dict[str, Any]]:
-    df_clean, report = apply_table_spec(df_raw, spec)
+    """
+    Apply spec to df_raw and upsert the result into schema.table.
 
-    table_cols = get_table_columns(engine, schema, table)
-    df_load = align_df_to_table(df_clean, table_cols)
-    df_prep = prepare_for_postgres(df_load, spec)
-    n = insert_update_conflicts(
-        engine=engine,
-        df=df_prep,
-        schema=schema,
-        table_name=table,
-        spec=spec,
-        constraint=constraint,
-        batch_size=1
-    )
+    Args:
+        loader: 'insert' (row-wise ON CONFLICT upserts) or 'copy' (binary COPY + merge)
+        derived: Derive columns already computed upstream (see apply_table_spec)
+        inplace: Caller hands over df_raw; spec, alignment and prep mutate it
+            instead of copying. Requires loader='copy'.
+        memory_report: Add report['memory'] with the tracemalloc peak vs input
+            size and the process peak RSS (see utils.memory.PeakMemory)
+        overwrite: Incoming values replace stored ones instead of only
+            filling NULLs (for tables whose attributes change, e.g. dim_player)
+    """
+    if loader not in LOADERS:
+        raise ValueError(f"Unknown loader '{loader}'. Options: {list(LOADERS)}")
+    if inplace and loader != 'copy':
+        raise ValueError("inplace=True requires loader='copy'")
+
+    input_bytes = frame_bytes(df_raw) if memory_report else 0
+
+    with (PeakMemory() if memory_report else nullcontext()) as tracker:
+        table_cols = get_table_columns(engine, schema, table)
+        df_clean, report = apply_table_spec(df_raw, spec, derived=derived, copy=not inplace)
+        del df_raw
+        df_load = align_df_to_table(df_clean, table_cols, copy=not inplace)
+        del df_clean
+        df_prep = prepare_for_postgres(df_load, spec, copy=not inplace)
+        del df_load
+
+        if loader == 'copy':
+            n = copy_merge_into_table(
+                engine=engine,
+                df=df_prep,
+                schema=schema,
+                table_name=table,
+                spec=spec,
+                constraint=constraint,
+                overwrite=overwrite
+            )
+        else:
+            n = insert_update_conflicts(
+                engine=engine,
+                df=df_prep,
+                schema=schema,
+                table_name=table,
+                spec=spec,
+                constraint=constraint,
+                batch_size=1,
+                overwrite=overwrite
+            )
 
     report['rows_loaded'] = n
     report['db_columns'] = len(table_cols)
+    report['loader'] = loader
+    if tracker is not None:
+        report['memory'] = tracker.report(input_bytes)
+
+    return n, report
+
+def merge_reports(total: dict[str, Any] | None, report: dict[str, Any]) -> dict[str, Any]:
+    """Fold one batch's apply_table_spec report into a running total with the same keys."""
+    if total is None:
+        total = {
+            'table': report['table'],
+            'rows_in': 0,
+            'missing_required_columns': [],
+            'type_coercions': {},
+            'invalid_bounds': {},
+            'derived_columns': {},
+            'rule_violations': {},
+            'not_nullable_violations': {},
+            'rows_out': 0,
+        }
+
+    total['rows_in'] += report['rows_in']
+    total['rows_out'] += report['rows_out']
+    for col in report['missing_required_columns']:
+        if col not in total['missing_required_columns']:
+            total['missing_required_columns'].append(col)
+    total['type_coercions'].update(report['type_coercions'])
+    total['derived_columns'].update(report['derived_columns'])
+    for key in ('invalid_bounds', 'rule_violations', 'not_nullable_violations'):
+        for k, v in report[key].items():
+            total[key][k] = total[key].get(k, 0) + int(v)
+    return total
+
+def transform_and_load_stream(
+    engine,
+    batches: Iterable[pd.DataFrame],
+    spec: TableSpec,
+    schema: str,
+    table: str,
+    constraint: str,
+    loader: str = 'copy',
+    derived=(),
+    builder: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+    dedup: bool = True,
+    overwrite: bool = False,
+) -> tuple[int, dict[str, Any]]:
+    """
+    Streaming transform_and_load: apply spec to each batch and load it while
+    the next batch is being read and transformed (one load in flight).
+
+    Batches are owned by this function and transformed in place. Each batch
+    is merged in its own transaction. Use align_batches_on upstream when a
+    builder needs whole games per batch. With dedup=True a PKDedupIndex
+    finds rows whose PK an earlier batch already loaded; those are merged
+    with overwrite=True after the rest of their batch, so the last row wins
+    across batches as it does within one.
+
+    Returns:
+        (rows loaded, report) where report has the same keys as
+        transform_and_load's, summed over batches, plus 'batches' and
+        'pk_dedup' (when dedup=True)
+    """
+    if loader not in LOADERS:
+        raise ValueError(f"Unknown loader '{loader}'. Options: {list(LOADERS)}")
+
+    table_cols = get_table_columns(engine, schema, table)
+    load = copy_merge_into_table if loader == 'copy' else insert_update_conflicts
+    load_kwargs = {} if loader == 'copy' else {'batch_size': 10_000}
+    inplace = loader == 'copy'
+    index = PKDedupIndex(spec.pk) if dedup else None
+
+    total = None
+    n = 0
+    n_batches = 0
+    pending = None
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for batch in batches:
+            if builder is not None:
+                batch = builder(batch, derived=derived)
+
+            df_clean, report = apply_table_spec(batch, spec, derived=derived, copy=not inplace)
+            del batch
+            parts = [(df_clean, overwrite)]
+            if index is not None:
+                parts = list(zip(index.split_seen(df_clean), (overwrite, True)))
+            total = merge_reports(total, report)
+            del df_clean
+
+            # wait for the previous batch before queueing this one; the
+            # single worker runs the fresh and overwrite merges in order
+            if pending is not None:
+                n += sum(f.result() for f in pending)
+            pending = []
+            for part, part_overwrite in parts:
+                if part.empty:
+                    continue
+                df_load = align_df_to_table(part, table_cols, copy=not inplace)
+                df_prep = prepare_for_postgres(df_load, spec, copy=not inplace)
+                del df_load
+                pending.append(executor.submit(
+                    load,
+                    engine=engine,
+                    df=df_prep,
+                    schema=schema,
+                    table_name=table,
+                    spec=spec,
+                    constraint=constraint,
+                    overwrite=part_overwrite,
+                    **load_kwargs
+                ))
+                del df_prep
+            del parts, part
+            n_batches += 1
+
+        if pending is not None:
+            n += sum(f.result() for f in pending)
+
+    if total is None:
+        total = merge_reports(None, {
+            'table': spec.name, 'rows_in': 0, 'rows_out': 0,
+            'missing_required_columns': [], 'type_coercions': {},
+            'invalid_bounds': {}, 'derived_columns': {},
+            'rule_violations': {}, 'not_nullable_violations': {},
+        })
 
-    return n, report
\ No newline at end of file
+    total['rows_loaded'] = n
+    total['db_columns'] = len(table_cols)
+    total['loader'] = loader
+    total['batches'] = n_batches
+    if index is not None:
+        total['pk_dedup'] = index.stats()
+    return n, total
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""Per-game change tracking across ingestion runs (raw.game_fingerprints / raw.game_changes)."""
+import hashlib
+import json
+import logging
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from utils.utils import build_db_url
+
+logger = logging.getLogger(__name__)
+
+engine = create_engine(build_db_url(database='mlb_fantasy'))
+
+SOURCES = ('statcast', 'boxscore')
+
+
+def game_fingerprints(df: pd.DataFrame, key: str = 'game_pk') -> pd.DataFrame:
+    """
+    One content hash per game for a pitch-level frame.
+
+    Row hashes (columns in name order) are summed per game, so the
+    fingerprint does not depend on row order within the pull.
+
+    Returns:
+        DataFrame with game_pk, content_hash, row_count
+    """
+    if df.empty:
+        return pd.DataFrame(columns=['game_pk', 'content_hash', 'row_count'])
+
+    cols = sorted(c for c in df.columns if c != key)
+    row_hash = pd.util.hash_pandas_object(df[cols], index=False)
+    # uint64 sums wrap, which is what we want for a combining hash
+    grouped = row_hash.groupby(df[key].to_numpy(), sort=True)
+    out = pd.DataFrame({
+        'content_hash': grouped.sum().map(lambda h: f"{int(h):016x}"),
+        'row_count': grouped.size(),
+    })
+    out.index.name = 'game_pk'
+    return out.reset_index()
+
+
+def payload_fingerprint(payload: dict) -> str:
+    """Content hash for a JSON payload (key order independent)."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def record_game_changes(
+    source: str,
+    fingerprints: pd.DataFrame,
+    run_id: str | None = None,
+    conn=None
+) -> list[int]:
+    """
+    Upsert game fingerprints for a source and log the games that are new or
+    whose hash changed to raw.game_changes.
+
+    Args:
+        source: One of SOURCES
+        fingerprints: game_pk, content_hash and optionally row_count
+        run_id: raw.landing_statcast_files.run_id of the pull, if any
+        conn: Open connection to run in (a new transaction otherwise)
+
+    Returns:
+        Sorted game_pks that were added or changed
+    """
+    if source not in SOURCES:
+        raise ValueError(f"Unknown source '{source}'. Options: {SOURCES}")
+    if fingerprints.empty:
+        return []
+
+    params = {
+        'source': source,
+        'game_pks': [int(pk) for pk in fingerprints['game_pk']],
+        'hashes': [str(h) for h in fingerprints['content_hash']],
+        'row_counts': (
+            [int(n) if pd.notna(n) else None for n in fingerprints['row_count']]
+            if 'row_count' in fingerprints else [None] * len(fingerprints)
+        ),
+    }
+
+    # One round trip per source. xmax = 0 only for freshly inserted rows;
+    # unchanged games are filtered by the WHERE and not returned at all
+    upsert = text("""
+        INSERT INTO raw.game_fingerprints (game_pk, source, content_hash, row_count)
+        SELECT t.game_pk, :source, t.content_hash, t.row_count
+        FROM unnest(
+            CAST(:game_pks AS bigint[]),
+            CAST(:hashes AS text[]),
+            CAST(:row_counts AS integer[])
+        ) AS t(game_pk, content_hash, row_count)
+        ON CONFLICT (game_pk, source) DO UPDATE SET
+            content_hash = EXCLUDED.content_hash,
+            row_count = EXCLUDED.row_count,
+            updated_at = now()
+        WHERE raw.game_fingerprints.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        RETURNING game_pk, (xmax = 0) AS inserted
+    """)
+    log = text("""
+        INSERT INTO raw.game_changes (run_id, source, game_pk, change_type)
+        VALUES (:run_id, :source, :game_pk, :change_type)
+    """)
+
+    def _record(c) -> list[int]:
+        changes = [
+            {
+                'run_id': run_id,
+                'source': source,
+                'game_pk': int(hit.game_pk),
+                'change_type': 'added' if hit.inserted else 'changed',
+            }
+            for hit in c.execute(upsert, params)
+        ]
+        if changes:
+            c.execute(log, changes)
+        return sorted(ch['game_pk'] for ch in changes)
+
+    if conn is not None:
+        changed = _record(conn)
+    else:
+        with engine.begin() as c:
+            changed = _record(c)
+
+    logger.info(f"{source}: {len(changed)} of {len(fingerprints)} games added or changed")
+    return changed
+
+
+def changed_game_pks(
+    since: datetime | None = None,
+    run_id: str | None = None,
+    sources: tuple[str, ...] = SOURCES
+) -> list[int]:
+    """
+    Games recorded in raw.game_changes since a point in time and/or for one
+    landing run.
+
+    Returns:
+        Sorted distinct game_pks
+    """
+    if since is None and run_id is None:
+        raise ValueError("Pass since and/or run_id to bound the change set")
+
+    where = ["source = ANY(:sources)"]
+    params = {'sources': list(sources)}
+    if since is not None:
+        where.append("detected_at >= :since")
+        params['since'] = since
+    if run_id is not None:
+        where.append("run_id = :run_id")
+        params['run_id'] = run_id
+
+    query = text(f"""
+        SELECT DISTINCT game_pk
+        FROM raw.game_changes
+        WHERE {' AND '.join(where)}
+        ORDER BY game_pk
+    """)
+
+    with engine.connect() as conn:
+        return [int(pk) for pk in conn.execute(query, params).scalars()]
+
+
+def unloaded_game_changes(sources: tuple[str, ...] = SOURCES) -> tuple[list[int], int | None]:
+    """
+    Games with changes not yet marked loaded, across all runs.
+
+    A run that fails after ingestion leaves its changes unmarked, so the
+    next incremental run picks them up even though its own fingerprints
+    match and it records nothing new.
+
+    Returns:
+        (sorted distinct game_pks, highest change_id read) where the
+        change_id is passed to mark_game_changes_loaded once the load
+        commits; (empty list, None) when nothing is pending
+    """
+    query = text("""
+        SELECT game_pk, change_id
+        FROM raw.game_changes
+        WHERE loaded_at IS NULL
+        AND source = ANY(:sources)
+    """)
+
+    with engine.connect() as conn:
+        rows = conn.execute(query, {'sources': list(sources)}).fetchall()
+
+    if not rows:
+        return [], None
+    return sorted({int(r.game_pk) for r in rows}), max(int(r.change_id) for r in rows)
+
+
+def mark_game_changes_loaded(through_change_id: int, conn=None) -> int:
+    """
+    Mark pending raw.game_changes rows up to a change_id as loaded.
+
+    Changes recorded after unloaded_game_changes was read have higher ids
+    and stay pending for the next run.
+
+    Returns:
+        Number of rows marked
+    """
+    query = text("""
+        UPDATE raw.game_changes
+        SET loaded_at = now()
+        WHERE loaded_at IS NULL
+        AND change_id <= :through_change_id
+    """)
+    params = {'through_change_id': int(through_change_id)}
+
+    if conn is not None:
+        marked = conn.execute(query, params).rowcount
+    else:
+        with engine.begin() as c:
+            marked = c.execute(query, params).rowcount
+
+    logger.info(f"Marked {marked} game changes loaded (through change_id {through_change_id})")
+    return marked
@@ -0,0 +1,84 @@
+"""Conditional GET (ETag / Last-Modified) with an on-disk JSON snapshot."""
+import os
+import json
+import logging
+from datetime import datetime, timezone
+
+from utils.retry import DEFAULT_TIMEOUT, limited_get
+
+logger = logging.getLogger(__name__)
+
+
+def _read_json(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data) -> None:
+    # write-then-rename so a crash never leaves a truncated snapshot
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def get_json_cached(
+    session,
+    url: str,
+    cache_path: str,
+    params: dict = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    limiter=None
+) -> tuple[dict, bool]:
+    """
+    GET a JSON endpoint, revalidating a cached snapshot instead of
+    re-downloading it.
+
+    The snapshot's ETag / Last-Modified are sent as If-None-Match /
+    If-Modified-Since; a 304 returns the snapshot, anything else replaces it.
+
+    Args:
+        session: requests session (utils.retry.get_session)
+        url: Endpoint URL
+        cache_path: Snapshot file; validators are kept in <cache_path>.meta.json
+        params: Query parameters
+        timeout: Request timeout in seconds
+        limiter: Host's AdaptiveRateLimiter (utils.retry.get_limiter); the
+            request goes through limited_get when given
+
+    Returns:
+        (payload, changed) - changed is False when served from the snapshot
+    """
+    meta_path = f"{cache_path}.meta.json"
+    headers = {}
+    meta = {}
+    if os.path.exists(cache_path) and os.path.exists(meta_path):
+        meta = _read_json(meta_path)
+        if meta.get('url') == url and meta.get('params') == params:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+    if limiter is not None:
+        response = limited_get(session, url, limiter, params=params, headers=headers, timeout=timeout)
+    else:
+        response = session.get(url, params=params, headers=headers, timeout=timeout)
+
+    if response.status_code == 304 and headers:
+        logger.info(f"{url} not modified since {meta.get('fetched_at')}; using {cache_path}")
+        return _read_json(cache_path), False
+
+    response.raise_for_status()
+    data = response.json()
+
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    _write_json(cache_path, data)
+    _write_json(meta_path, {
+        'url': url,
+        'params': params,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'fetched_at': datetime.now(timezone.utc).isoformat(),
+    })
+    return data, True
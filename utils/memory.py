@@ -0,0 +1,77 @@
+"""Peak memory tracking for load reports."""
+import sys
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:  # optional, only used for peak RSS on Windows
+    psutil = None
+
+
+def frame_bytes(df) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def peak_rss_bytes() -> int | None:
+    """Process high-water RSS so far (None if the platform cannot report it)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes elsewhere
+        return int(peak) if sys.platform == 'darwin' else int(peak) * 1024
+    if psutil is not None:
+        peak = getattr(psutil.Process().memory_info(), 'peak_wset', None)
+        return int(peak) if peak is not None else None
+    return None
+
+
+class PeakMemory:
+    """
+    Context manager measuring the peak inside the block two ways:
+
+    - tracemalloc: peak bytes allocated through Python's allocators (numpy
+      and pandas buffers included) on top of what was live on entry.
+    - RSS: the process high-water mark on exit and how much the block raised
+      it. The high-water mark never goes down, so the growth is 0 when an
+      earlier step already peaked higher.
+    """
+
+    def __init__(self):
+        self.peak_bytes = 0
+        self.rss_peak_bytes = None
+        self.rss_peak_growth_bytes = None
+        self._started = False
+        self._baseline = 0
+        self._rss_baseline = None
+
+    def __enter__(self):
+        self._rss_baseline = peak_rss_bytes()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _, peak = tracemalloc.get_traced_memory()
+        self.peak_bytes = max(0, peak - self._baseline)
+        if self._started:
+            tracemalloc.stop()
+        self.rss_peak_bytes = peak_rss_bytes()
+        if self.rss_peak_bytes is not None and self._rss_baseline is not None:
+            self.rss_peak_growth_bytes = self.rss_peak_bytes - self._rss_baseline
+
+    def report(self, input_bytes: int) -> dict:
+        """peak_ratio = (input + tracemalloc peak extra) / input; ~2.0 means one extra copy."""
+        return {
+            'input_bytes': input_bytes,
+            'tracemalloc_peak_extra_bytes': self.peak_bytes,
+            'peak_ratio': round((input_bytes + self.peak_bytes) / input_bytes, 3) if input_bytes else None,
+            'rss_peak_bytes': self.rss_peak_bytes,
+            'rss_peak_growth_bytes': self.rss_peak_growth_bytes,
+        }
@@ -1,7 +1,10 @@
 import requests
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait as futures_wait, FIRST_COMPLETED
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -10,7 +13,28 @@ logger = logging.getLogger(__name__)
 DEFAULT_MAX_RETRIES=3
 DEFAULT_BACKOFF_FACTOR=1.0
 DEFAULT_TIMEOUT=10
+DEFAULT_POOL_CONNECTIONS=10
+DEFAULT_POOL_MAXSIZE=16
+DEFAULT_RATE_PER_SEC=10.0
+# Timed calls run on a shared pool. Calls that time out keep running there
+# (a thread cannot be killed); once MAX_ABANDONED_CALLS are still running,
+# retry_call stops retrying timeouts instead of piling up duplicate calls.
+# The remaining TIMEOUT_EXECUTOR_WORKERS - MAX_ABANDONED_CALLS slots bound
+# how many timed calls run at once; more concurrent callers queue, and the
+# timeout only starts when a call starts running. A call that cannot start
+# within its own timeout fails as a timeout.
+TIMEOUT_EXECUTOR_WORKERS=16
+MAX_ABANDONED_CALLS=8
 RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+# Throttling responses are handled by AdaptiveRateLimiter, not urllib3, so
+# sessions used with it retry only the remaining statuses
+THROTTLE_STATUS_CODES = (429, 503)
+ADAPTIVE_STATUS_CODES = tuple(c for c in RETRYABLE_STATUS_CODES if c not in THROTTLE_STATUS_CODES)
+AIMD_INCREASE = 0.5
+AIMD_DECREASE = 0.5
+AIMD_MIN_RATE = 0.5
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
 
 RETRYABLE_EXCEPTIONS = (
     requests.exceptions.ConnectionError,
@@ -24,7 +48,8 @@ def build_retry_session(
     max_retries=DEFAULT_MAX_RETRIES,
     backoff_factor=DEFAULT_BACKOFF_FACTOR,
     status_forcelist=None,
-    timeout=DEFAULT_TIMEOUT
+    pool_maxsize=DEFAULT_POOL_MAXSIZE,
+    pool_connections=DEFAULT_POOL_CONNECTIONS
 ):
     
     if status_forcelist is None:
@@ -36,15 +61,466 @@ def build_retry_session(
         status_forcelist=status_forcelist,
         allowed_methods=["GET"],
         raise_on_status=False,
+        # urllib3 retries any 429/503 carrying Retry-After, forcelist or not;
+        # without throttles in the forcelist they must reach the caller
+        respect_retry_after_header=any(c in status_forcelist for c in THROTTLE_STATUS_CODES),
     )
 
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize
+    )
     session = requests.Session()
     session.mount("https://", adapter)
     session.mount("http://", adapter)
-    session.timeout = timeout
     return session
 
+
+class HttpClientManager:
+    """
+    Process-wide registry of retrying sessions, one per host, so every
+    ingestion module calling that host reuses one keep-alive connection
+    pool. Timeouts are per request, not per session. Adaptive rate limiters
+    are held here too, one per host, so AIMD and breaker state carry across
+    calls and callers.
+
+    Host sessions leave THROTTLE_STATUS_CODES to the host's limiter: send
+    requests through limited_get(session, url, get_limiter(url)).
+    """
+
+    def __init__(self):
+        self._sessions: dict[str, requests.Session] = {}
+        self._limiters: dict[str, "AdaptiveRateLimiter"] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> requests.Session:
+        """Shared session for url's host."""
+        host = _host(url)
+        with self._lock:
+            if host not in self._sessions:
+                self._sessions[host] = build_retry_session(status_forcelist=ADAPTIVE_STATUS_CODES)
+            return self._sessions[host]
+
+    def limiter(self, url: str, rate: float = DEFAULT_RATE_PER_SEC) -> "AdaptiveRateLimiter":
+        """
+        Shared AdaptiveRateLimiter for url's host. The first caller's rate
+        becomes the host's maximum; later rates are ignored.
+        """
+        host = _host(url)
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = AdaptiveRateLimiter(rate)
+            return self._limiters[host]
+
+    def close_all(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._limiters.clear()
+
+
+http_clients = HttpClientManager()
+
+
+def get_session(url: str) -> requests.Session:
+    """Shared retrying session for url's host (see HttpClientManager)."""
+    return http_clients.get(url)
+
+
+def get_limiter(url: str, rate: float = DEFAULT_RATE_PER_SEC) -> "AdaptiveRateLimiter":
+    """Process-wide adaptive limiter for url's host (see HttpClientManager)."""
+    return http_clients.limiter(url, rate)
+
+
+_timeout_executor = None
+_timeout_executor_lock = threading.Lock()
+
+
+def _get_timeout_executor() -> ThreadPoolExecutor:
+    """Long-lived pool used by retry_call to bound call duration."""
+    global _timeout_executor
+    with _timeout_executor_lock:
+        if _timeout_executor is None:
+            _timeout_executor = ThreadPoolExecutor(
+                max_workers=TIMEOUT_EXECUTOR_WORKERS,
+                thread_name_prefix="retry-timeout"
+            )
+        return _timeout_executor
+
+
+_abandoned_calls = 0
+_abandoned_lock = threading.Lock()
+
+
+def _abandon(future):
+    """Count a timed-out call until it finally returns."""
+    global _abandoned_calls
+    with _abandoned_lock:
+        _abandoned_calls += 1
+
+    def _done(_):
+        global _abandoned_calls
+        with _abandoned_lock:
+            _abandoned_calls -= 1
+
+    future.add_done_callback(_done)
+
+
+def abandoned_calls() -> int:
+    """Timed-out retry_call calls that are still running."""
+    with _abandoned_lock:
+        return _abandoned_calls
+
+
+def _submit_timed(func, args, kwargs, start_timeout: float):
+    """
+    Submit func and return its future once it has started running.
+
+    Raises:
+        FuturesTimeoutError: If no worker picked it up within start_timeout
+            (every worker busy, e.g. with abandoned calls); it is cancelled
+    """
+    started = threading.Event()
+
+    def _call():
+        started.set()
+        return func(*args, **kwargs)
+
+    future = _get_timeout_executor().submit(_call)
+    if not started.wait(timeout=start_timeout) and future.cancel():
+        raise FuturesTimeoutError(
+            f"no timeout worker free within {start_timeout}s "
+            f"({abandoned_calls()} timed-out calls still running)"
+        )
+    return future
+
+class TokenBucket:
+    """Thread-safe token bucket: refills at `rate` tokens/sec up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available. Returns seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def set_rate(self, rate: float, capacity: float | None = None):
+        """Change the refill rate; banked tokens are clamped to the new capacity."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self.rate = rate
+            self.capacity = capacity if capacity is not None else max(1.0, rate)
+            self._tokens = min(self._tokens, self.capacity)
+
+
+def _host(url: str) -> str:
+    """Limiter key for a URL (its host), or the string itself if it has none."""
+    return urlsplit(url).netloc or url
+
+
+class HostRateLimiter:
+    """One TokenBucket per URL host, created on first use."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = _host(url)
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.capacity)
+            return self._buckets[host]
+
+    def acquire(self, url: str) -> float:
+        return self.bucket(url).acquire()
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After header (delta-seconds or HTTP-date) as seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _HostState:
+    """Adaptive rate, breaker state and counters for one host."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.paused_until = 0.0
+        self.consecutive_failures = 0
+        self.breaker = 'closed'
+        self.probe_in_flight = False
+        self.probe_started = 0.0
+        self.probe_thread = None
+        self.requests = 0
+        self.successes = 0
+        self.throttled = 0
+        self.failures = 0
+        self.retries = 0
+        self.breaker_trips = 0
+        self.waited = 0.0
+        self.cond = threading.Condition()
+
+
+class AdaptiveRateLimiter(HostRateLimiter):
+    """
+    Per-host limiter shared by every worker hitting the same API.
+
+    - AIMD: each success raises the host's rate by `increase` req/s (up to
+      the starting `rate`); a 429/503 multiplies it by `decrease` (down to
+      `min_rate`).
+    - Throttle responses pause the whole host for Retry-After seconds
+      (backoff_factor when the header is missing), not just the worker
+      that received them. Throttles arriving during that pause only extend
+      it: one decrease and one breaker failure per pause window.
+    - Circuit breaker: after `breaker_threshold` consecutive failures the
+      host is paused for `breaker_cooldown` seconds, then a single probe
+      request decides whether to close the breaker or trip it again. The
+      probe is tracked by thread: results of requests sent before the
+      breaker opened are counted but do not move it.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float = AIMD_MIN_RATE,
+        increase: float = AIMD_INCREASE,
+        decrease: float = AIMD_DECREASE,
+        breaker_threshold: int = BREAKER_THRESHOLD,
+        breaker_cooldown: float = BREAKER_COOLDOWN,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    ):
+        super().__init__(rate)
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.backoff_factor = backoff_factor
+        self._states: dict[str, _HostState] = {}
+
+    def _state(self, url: str) -> _HostState:
+        host = _host(url)
+        with self._lock:
+            if host not in self._states:
+                self._states[host] = _HostState(self.rate)
+            return self._states[host]
+
+    def _set_rate(self, url: str, state: _HostState, rate: float):
+        rate = min(self.max_rate, max(self.min_rate, rate))
+        if rate != state.rate:
+            state.rate = rate
+            self.bucket(url).set_rate(rate)
+
+    def acquire(self, url: str) -> float:
+        """Wait out any host pause / open breaker, then take a token. Returns seconds waited."""
+        state = self._state(url)
+        waited = 0.0
+        with state.cond:
+            while True:
+                now = time.monotonic()
+                if now < state.paused_until:
+                    wait = state.paused_until - now
+                elif state.breaker == 'closed':
+                    break
+                elif state.probe_in_flight and now - state.probe_started < self.breaker_cooldown:
+                    wait = state.probe_started + self.breaker_cooldown - now
+                else:
+                    # Cooldown over (or the last probe never reported back):
+                    # let exactly one caller probe the host
+                    state.breaker = 'half_open'
+                    state.probe_in_flight = True
+                    state.probe_started = now
+                    state.probe_thread = threading.get_ident()
+                    break
+                start = time.monotonic()
+                state.cond.wait(timeout=wait)
+                waited += time.monotonic() - start
+            state.requests += 1
+
+        waited += self.bucket(url).acquire()
+        with state.cond:
+            state.waited += waited
+        return waited
+
+    def _is_probe(self, state: _HostState) -> bool:
+        return (
+            state.breaker == 'half_open'
+            and state.probe_in_flight
+            and state.probe_thread == threading.get_ident()
+        )
+
+    def record_success(self, url: str):
+        state = self._state(url)
+        with state.cond:
+            state.successes += 1
+            if state.breaker != 'closed':
+                if not self._is_probe(state):
+                    return
+                logger.info("%s circuit breaker closed", _host(url))
+                state.breaker = 'closed'
+                state.probe_in_flight = False
+                state.probe_thread = None
+                state.cond.notify_all()
+            state.consecutive_failures = 0
+            self._set_rate(url, state, state.rate + self.increase)
+
+    def record_throttle(self, url: str, retry_after: float | None = None):
+        """
+        429/503: cut the rate and pause every caller of the host.
+
+        Requests already in flight when the pause started come back throttled
+        too; those only extend the pause, so one burst costs one decrease and
+        one breaker failure rather than one per worker.
+        """
+        state = self._state(url)
+        with state.cond:
+            state.throttled += 1
+            now = time.monotonic()
+            pause = retry_after if retry_after is not None else self.backoff_factor
+            in_window = now < state.paused_until
+            state.paused_until = max(state.paused_until, now + pause)
+            if in_window:
+                state.cond.notify_all()
+                return
+            self._set_rate(url, state, state.rate * self.decrease)
+            logger.warning(
+                "%s throttled; rate now %.2f req/s, pausing %.1fs",
+                _host(url), state.rate, pause
+            )
+            self._count_failure(url, state)
+
+    def record_failure(self, url: str):
+        """Connection error, timeout or 5xx that was not a throttle."""
+        state = self._state(url)
+        with state.cond:
+            state.failures += 1
+            self._count_failure(url, state)
+
+    def record_retry(self, url: str):
+        state = self._state(url)
+        with state.cond:
+            state.retries += 1
+
+    def _count_failure(self, url: str, state: _HostState):
+        if state.breaker != 'closed' and not self._is_probe(state):
+            return
+        state.consecutive_failures += 1
+        if state.breaker == 'half_open' or state.consecutive_failures >= self.breaker_threshold:
+            if state.breaker != 'open':
+                state.breaker_trips += 1
+                logger.error(
+                    "%s circuit breaker open after %d consecutive failures; pausing %.1fs",
+                    _host(url), state.consecutive_failures, self.breaker_cooldown
+                )
+            state.breaker = 'open'
+            state.probe_in_flight = False
+            state.probe_thread = None
+            state.paused_until = max(state.paused_until, time.monotonic() + self.breaker_cooldown)
+        state.cond.notify_all()
+
+    def metrics(self) -> dict[str, dict]:
+        """Per-host current rate, request/retry counters and breaker trips."""
+        with self._lock:
+            states = dict(self._states)
+        out = {}
+        for host, state in states.items():
+            with state.cond:
+                out[host] = {
+                    'rate': state.rate,
+                    'requests': state.requests,
+                    'successes': state.successes,
+                    'throttled': state.throttled,
+                    'failures': state.failures,
+                    'retries': state.retries,
+                    'breaker_trips': state.breaker_trips,
+                    'breaker': state.breaker,
+                    'waited_s': round(state.waited, 3),
+                }
+        return out
+
+
+def limited_get(
+    session: requests.Session,
+    url: str,
+    limiter: AdaptiveRateLimiter,
+    max_retries=DEFAULT_MAX_RETRIES,
+    **kwargs
+) -> requests.Response:
+    """
+    GET through an AdaptiveRateLimiter, retrying throttles and connection
+    errors with the limiter's shared pauses instead of per-call backoff.
+
+    The session should not retry THROTTLE_STATUS_CODES itself
+    (status_forcelist=ADAPTIVE_STATUS_CODES, as get_session's are),
+    otherwise the limiter never sees them. The last response is returned
+    as-is when retries run out.
+    """
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+
+    for attempt in range(1, max_retries + 2):
+        limiter.acquire(url)
+        try:
+            response = session.get(url, **kwargs)
+        except RETRYABLE_EXCEPTIONS as exc:
+            limiter.record_failure(url)
+            if attempt > max_retries:
+                raise
+            limiter.record_retry(url)
+            logger.warning(
+                "%s attempt %d/%d failed (%s: %s). Retrying...",
+                url, attempt, max_retries + 1, type(exc).__name__, exc
+            )
+            continue
+
+        if response.status_code in THROTTLE_STATUS_CODES:
+            limiter.record_throttle(url, parse_retry_after(response.headers.get('Retry-After')))
+            if attempt > max_retries:
+                return response
+            limiter.record_retry(url)
+            continue
+
+        if response.status_code >= 500:
+            limiter.record_failure(url)
+        else:
+            limiter.record_success(url)
+        return response
+
 def retry_call(
     func,
     args=(),
@@ -59,18 +535,33 @@ def retry_call(
         kwargs = {}
 
     last_exception = None
+    # Earlier attempts that timed out but are still running
+    abandoned = []
 
     for attempt in range(1, max_retries + 2):
         try:
             if timeout is not None:
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(func, *args, **kwargs)
+                # The clock starts when the call starts, not while it queues.
+                # A timed-out call keeps running on its worker; retry_call
+                # returns control immediately instead of joining it
+                future = _submit_timed(func, args, kwargs, timeout)
+                try:
                     return future.result(timeout=timeout)
+                except FuturesTimeoutError:
+                    _abandon(future)
+                    abandoned.append(future)
+                    raise
             else:
                 return func(*args, **kwargs)
 
         except (FuturesTimeoutError, *RETRYABLE_EXCEPTIONS) as exc:
             last_exception = exc
+            if isinstance(exc, FuturesTimeoutError) and abandoned_calls() >= MAX_ABANDONED_CALLS:
+                logger.error(
+                    "%s timed out with %d timed-out calls still running; not retrying",
+                    label, abandoned_calls()
+                )
+                raise
             if attempt <= max_retries:
                 wait = backoff_factor * (2 ** (attempt -1))
                 logger.warning(
@@ -78,7 +569,19 @@ def retry_call(
                     label, attempt, max_retries+1,
                     type(exc).__name__, exc, wait
                 )
-                time.sleep(wait)
+                # A slow earlier attempt that finishes during the backoff is
+                # used instead of starting another copy of the same call
+                deadline = time.monotonic() + wait
+                while abandoned and time.monotonic() < deadline:
+                    done, _ = futures_wait(
+                        abandoned, timeout=deadline - time.monotonic(), return_when=FIRST_COMPLETED
+                    )
+                    for f in done:
+                        abandoned.remove(f)
+                        if f.exception() is None:
+                            logger.info("%s: attempt that timed out finished during backoff", label)
+                            return f.result()
+                time.sleep(max(0.0, deadline - time.monotonic()))
             else:
                 logger.error(
                     "%s FAILED after %d attempts. Last error: %s: %s",
@@ -1,23 +1,78 @@
 """Utility to run SQL scripts from registry."""
 import os
+import re
+import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from sqlalchemy import create_engine, text
 from utils.utils import build_db_url
 
 logger = logging.getLogger(__name__)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQL_MAX_WORKERS = 4
+UPSERT_COUNT_KEYS = ('target', 'inserted', 'updated', 'unchanged')
 
 
-def run_sql_file(script_path: str, engine=None) -> int:
+def split_sql_statements(sql: str) -> list[str]:
     """
-    Execute a SQL file and return rows affected.
+    Split a script on top-level semicolons, ignoring ones inside quotes and
+    -- / block comments. Empty statements are dropped.
+    """
+    statements = []
+    buf = []
+    i = 0
+    n = len(sql)
+    quote = None
+    while i < n:
+        ch = sql[i]
+        nxt = sql[i + 1] if i + 1 < n else ''
+        if quote:
+            buf.append(ch)
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+            buf.append(ch)
+        elif ch == '-' and nxt == '-':
+            j = sql.find('\n', i)
+            j = n if j == -1 else j
+            buf.append(sql[i:j])
+            i = j
+            continue
+        elif ch == '/' and nxt == '*':
+            j = sql.find('*/', i + 2)
+            j = n if j == -1 else j + 2
+            buf.append(sql[i:j])
+            i = j
+            continue
+        elif ch == ';':
+            statements.append(''.join(buf))
+            buf = []
+        else:
+            buf.append(ch)
+        i += 1
+    statements.append(''.join(buf))
 
-    Args:
-        script_path: Relative path from project root to SQL file
-        engine: SQLAlchemy engine (created if not provided)
+    def _has_code(stmt: str) -> bool:
+        stmt = re.sub(r'/\*.*?\*/', '', stmt, flags=re.S)
+        return any(
+            line.strip() and not line.strip().startswith('--')
+            for line in stmt.splitlines()
+        )
+
+    return [stmt.strip() for stmt in statements if _has_code(stmt)]
+
+
+def run_sql_script(script_path: str, engine=None, params: dict = None) -> tuple[int, list[dict]]:
+    """
+    Execute a SQL file statement by statement in one transaction.
+
+    Statements that return a row with target/inserted/updated/unchanged
+    columns (the production upserts) are collected as upsert counts.
 
     Returns:
-        Number of rows affected (or 0 if not available)
+        (rows affected, list of upsert count dicts)
     """
     if engine is None:
         engine = create_engine(build_db_url())
@@ -29,37 +84,285 @@ def run_sql_file(script_path: str, engine=None) -> int:
 
     logger.info(f"Executing {script_path}...")
 
+    rows = 0
+    upserts = []
     with engine.begin() as conn:
-        result = conn.execute(text(sql))
-        rows = result.rowcount if result.rowcount >= 0 else 0
+        for statement in split_sql_statements(sql):
+            result = conn.execute(text(statement), params or {})
+            if result.returns_rows:
+                for row in result.mappings():
+                    if all(k in row for k in UPSERT_COUNT_KEYS):
+                        counts = {k: row[k] for k in UPSERT_COUNT_KEYS}
+                        upserts.append(counts)
+                        rows += counts['inserted'] + counts['updated']
+                        logger.info(
+                            f"{counts['target']}: {counts['inserted']} inserted, "
+                            f"{counts['updated']} updated, {counts['unchanged']} unchanged"
+                        )
+            elif result.rowcount >= 0:
+                rows += result.rowcount
 
     logger.info(f"Completed {script_path}: {rows} rows affected")
-    return rows
+    return rows, upserts
 
 
-def run_sql_registry(registry: list, engine=None) -> dict:
+def run_sql_file(script_path: str, engine=None, params: dict = None) -> int:
     """
-    Run all scripts in registry order.
+    Execute a SQL file and return rows affected.
 
     Args:
-        registry: List of registry entries with 'name' and 'script' keys
+        script_path: Relative path from project root to SQL file
         engine: SQLAlchemy engine (created if not provided)
+        params: Bind parameters for :name placeholders in the script
 
     Returns:
-        Dict mapping script names to results with 'status' and 'rows'/'error'
+        Number of rows affected (or 0 if not available)
+    """
+    rows, _ = run_sql_script(script_path, engine, params)
+    return rows
+
+
+def refresh_materialized_views(views: list[str], engine=None, concurrently: bool = True) -> int:
+    """
+    Refresh materialized views in order.
+
+    CONCURRENTLY keeps the view readable during the refresh (it needs a
+    unique index on the view). A view that has never been populated cannot
+    be refreshed concurrently, so it gets a plain refresh the first time.
+
+    Returns:
+        Number of views refreshed
     """
     if engine is None:
         engine = create_engine(build_db_url())
 
-    results = {}
+    for view in views:
+        schema, name = view.split('.', 1)
+        with engine.begin() as conn:
+            populated = conn.execute(
+                text("""
+                    SELECT ispopulated FROM pg_matviews
+                    WHERE schemaname = :schema AND matviewname = :name
+                """),
+                {'schema': schema, 'name': name}
+            ).scalar()
+            if populated is None:
+                raise ValueError(f"Materialized view {view} does not exist")
+
+            mode = 'CONCURRENTLY ' if concurrently and populated else ''
+            logger.info(f"Refreshing {view} {mode.strip() or '(full)'}...")
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW {mode}{schema}.{name}"))
+
+    return len(views)
+
+
+def script_params(entry: dict, params: dict = None) -> dict:
+    """
+    Bind parameters for one registry entry: every name the entry declares in
+    'params', taken from params or NULL (no filter) when not given.
+    """
+    params = params or {}
+    bound = {}
+    for name in entry.get('params', []):
+        value = params.get(name)
+        if name == 'game_pks' and value is not None:
+            value = [int(pk) for pk in value]
+        bound[name] = value
+    return bound
+
+
+def build_sql_dag(registry: list, sources=()) -> dict[str, set[str]]:
+    """
+    Build the script dependency graph from each entry's 'tables' and
+    'depends_on'.
+
+    Args:
+        registry: SQL registry entries
+        sources: Tables produced outside the registry (Python loads, raw
+            ingestion) that scripts may depend on
+
+    Returns:
+        Dict of entry name -> names of the entries it depends on
+
+    Raises:
+        ValueError: duplicate names or producers, a dependency with no
+            producer, or a cycle
+    """
+    names = [entry['name'] for entry in registry]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate registry names: {duplicates}")
+
+    producers = {}
     for entry in registry:
-        name = entry['name']
-        script = entry['script']
+        for table in entry.get('tables', []):
+            if table in producers:
+                raise ValueError(
+                    f"Table {table} is produced by both {producers[table]} and {entry['name']}"
+                )
+            producers[table] = entry['name']
+
+    sources = set(sources)
+    graph = {}
+    missing = []
+    for entry in registry:
+        deps = set()
+        for table in entry.get('depends_on', []):
+            if table in producers:
+                if producers[table] != entry['name']:
+                    deps.add(producers[table])
+            elif table not in sources:
+                missing.append(f"{entry['name']} -> {table}")
+        graph[entry['name']] = deps
+
+    if missing:
+        raise ValueError(f"Dependencies with no producer: {missing}")
+
+    # Kahn's algorithm; whatever never becomes ready is on (or behind) a cycle
+    remaining = {name: len(deps) for name, deps in graph.items()}
+    ready = [name for name in names if remaining[name] == 0]
+    seen = 0
+    while ready:
+        node = ready.pop()
+        seen += 1
+        for name, deps in graph.items():
+            if node in deps:
+                remaining[name] -= 1
+                if remaining[name] == 0:
+                    ready.append(name)
+    if seen != len(graph):
+        cyclic = sorted(name for name, left in remaining.items() if left > 0)
+        raise ValueError(f"Dependency cycle among registry entries: {cyclic}")
+
+    return graph
+
+
+def format_trace(results: dict) -> str:
+    """One line per script: start/end offset (s), duration and worker thread."""
+    lines = []
+    timed = [(name, r) for name, r in results.items() if 'started' in r]
+    for name, r in sorted(timed, key=lambda item: item[1]['started']):
+        lines.append(
+            f"{name:<32} {r['started']:>8.2f}s -> {r['finished']:>8.2f}s "
+            f"({r['duration']:.2f}s, {r['status']}, {r['worker']})"
+        )
+    skipped = [name for name, r in results.items() if r['status'] == 'skipped']
+    if skipped:
+        lines.append(f"skipped: {', '.join(skipped)}")
+    return '\n'.join(lines)
+
+
+def run_sql_registry(
+    registry: list,
+    engine=None,
+    params: dict = None,
+    sources=(),
+    max_workers: int = SQL_MAX_WORKERS
+) -> dict:
+    """
+    Run registry scripts as a dependency graph.
+
+    A script starts as soon as every script producing a table in its
+    depends_on has finished, so independent scripts run concurrently on
+    pooled connections. With max_workers=1 scripts run one at a time in
+    dependency order (registry order among ready scripts).
+
+    Args:
+        registry: List of registry entries with 'name', 'script', 'tables'
+            and 'depends_on' keys; entries with 'refresh' (and optional
+            'concurrently') refresh those materialized views instead.
+            Entries with 'full_only' cannot be scoped and are 'deferred'
+            (not run) when any params value is set
+        engine: SQLAlchemy engine (created if not provided)
+        params: Load scope shared by all scripts, e.g. {'game_pks': [...]}
+            or {'start_date': ..., 'end_date': ...}; each script receives
+            the names listed in its entry's 'params'
+        sources: Tables produced outside the registry (see build_sql_dag)
+        max_workers: Scripts allowed to run at once
+
+    Returns:
+        Dict mapping script names to results with 'status' and 'rows'/'error',
+        plus 'upserts' (inserted/updated/unchanged per target) when reported,
+        and 'started'/'finished'/'duration'/'worker' timing for scripts that
+        ran. If a script fails no new scripts start: running ones finish,
+        the rest are marked 'skipped', and the first error is raised.
+    """
+    graph = build_sql_dag(registry, sources)
+    entries = {entry['name']: entry for entry in registry}
+    order = {entry['name']: i for i, entry in enumerate(registry)}
+    max_workers = max(1, max_workers)
+
+    if engine is None:
+        engine = create_engine(build_db_url(), pool_size=max_workers)
+
+    t0 = time.perf_counter()
+
+    def _run(name: str) -> dict:
+        entry = entries[name]
+        started = time.perf_counter() - t0
+        result = {'worker': threading.current_thread().name}
+        if entry.get('full_only') and any(v is not None for v in (params or {}).values()):
+            result.update(status='deferred', rows=0)
+            finished = time.perf_counter() - t0
+            result.update(started=started, finished=finished, duration=finished - started)
+            return result
         try:
-            rows = run_sql_file(script, engine)
-            results[name] = {'status': 'success', 'rows': rows}
+            if 'refresh' in entry:
+                rows = refresh_materialized_views(entry['refresh'], engine, entry.get('concurrently', True))
+                upserts = []
+            else:
+                rows, upserts = run_sql_script(entry['script'], engine, script_params(entry, params))
+            result.update(status='success', rows=rows)
+            if upserts:
+                result['upserts'] = upserts
         except Exception as e:
             logger.error(f"Failed {name}: {e}")
-            results[name] = {'status': 'error', 'error': str(e)}
-            raise
-    return results
+            result.update(status='error', error=str(e), exception=e)
+        finished = time.perf_counter() - t0
+        result.update(started=started, finished=finished, duration=finished - started)
+        return result
+
+    results = {}
+    waiting = {name: set(deps) for name, deps in graph.items()}
+    failed = None
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sql') as executor:
+        running = {}
+
+        def _submit_ready():
+            ready = sorted((n for n, deps in waiting.items() if not deps), key=order.get)
+            for name in ready:
+                if len(running) >= max_workers:
+                    break
+                del waiting[name]
+                running[executor.submit(_run, name)] = name
+
+        _submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result = future.result()
+                error = result.pop('exception', None)
+                results[name] = result
+                logger.info(
+                    f"{name}: {result['status']} in {result['duration']:.2f}s "
+                    f"(started at +{result['started']:.2f}s)"
+                )
+                if error is not None:
+                    failed = failed or error
+                    continue
+                for deps in waiting.values():
+                    deps.discard(name)
+            if failed is None:
+                _submit_ready()
+
+    for name in sorted(waiting, key=order.get):
+        results[name] = {'status': 'skipped'}
+
+    logger.info(f"SQL registry trace:\n{format_trace(results)}")
+
+    if failed is not None:
+        raise failed
+
+    return {name: results[name] for name in sorted(results, key=order.get)}
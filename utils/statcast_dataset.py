@@ -0,0 +1,240 @@
+"""Hive-partitioned Statcast parquet dataset (season=/game_date=) helpers."""
+import os
+import logging
+from datetime import date
+from typing import Iterable, Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+PARTITION_SCHEMA = pa.schema([
+    ('season', pa.int32()),
+    ('game_date', pa.date32()),
+])
+SORT_COLUMNS = ['game_pk', 'at_bat_number', 'pitch_number']
+MAX_ROWS_PER_GROUP = 64 * 1024
+
+
+def _partitioning() -> ds.Partitioning:
+    return ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+
+def write_statcast_dataset(df: pd.DataFrame, dataset_dir: str) -> int:
+    """
+    Write a Statcast pull as a season/game_date partitioned parquet dataset.
+
+    Rows are sorted on game_pk, at_bat_number, pitch_number so row groups are
+    clustered for pushdown (preserve_order keeps that order in the files).
+    Partitions present in df replace the same partitions on disk; other
+    partitions are left alone.
+
+    Returns:
+        Number of rows written
+    """
+    if df.empty:
+        logger.warning(f"Nothing to write to {dataset_dir}")
+        return 0
+
+    os.makedirs(dataset_dir, exist_ok=True)
+
+    df = df.copy()
+    game_date = pd.to_datetime(df['game_date'], errors='coerce')
+    df['game_date'] = game_date.dt.date
+    df['season'] = game_date.dt.year.astype('int32')
+
+    sort_cols = [c for c in SORT_COLUMNS if c in df.columns]
+    if sort_cols:
+        df = df.sort_values(by=sort_cols, kind='stable')
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.set_column(
+        table.schema.get_field_index('game_date'),
+        'game_date',
+        table.column('game_date').cast(pa.date32())
+    )
+
+    ds.write_dataset(
+        table,
+        dataset_dir,
+        format='parquet',
+        partitioning=_partitioning(),
+        existing_data_behavior='delete_matching',
+        max_rows_per_group=MAX_ROWS_PER_GROUP,
+        preserve_order=True,
+    )
+    return table.num_rows
+
+
+def open_statcast_dataset(dataset_dir: str) -> ds.Dataset:
+    return ds.dataset(dataset_dir, format='parquet', partitioning=_partitioning())
+
+
+def _filter_expr(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    game_pks: list[int] | None = None,
+) -> ds.Expression | None:
+    expr = None
+    if start_date is not None:
+        expr = ds.field('game_date') >= date.fromisoformat(start_date)
+    if end_date is not None:
+        cond = ds.field('game_date') <= date.fromisoformat(end_date)
+        expr = cond if expr is None else expr & cond
+    if game_pks is not None:
+        cond = ds.field('game_pk').isin([int(pk) for pk in game_pks])
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def _available(columns: list[str] | None, names: list[str]) -> list[str] | None:
+    if columns is None:
+        return None
+    available = set(names)
+    return [c for c in columns if c in available]
+
+
+def read_statcast_dataset(
+    dataset_dir: str,
+    columns: list[str] | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    game_pks: list[int] | None = None,
+) -> pd.DataFrame:
+    """
+    Read a partitioned Statcast dataset with projection and predicate pushdown.
+
+    Args:
+        dataset_dir: Root of the season=/game_date= dataset
+        columns: Columns to read (None = all); unknown names are ignored
+        start_date / end_date: Inclusive game_date bounds, pruned by partition
+        game_pks: Only these games (filtered with row group statistics)
+    """
+    dataset = open_statcast_dataset(dataset_dir)
+    expr = _filter_expr(start_date, end_date, game_pks)
+    columns = _available(columns, dataset.schema.names)
+
+    table = dataset.to_table(columns=columns, filter=expr)
+    return table.to_pandas()
+
+
+def read_statcast_source(
+    path: str,
+    columns: list[str] | None = None,
+    **filters,
+) -> pd.DataFrame:
+    """Read either a partitioned dataset directory or a single parquet file."""
+    if os.path.isdir(path):
+        return read_statcast_dataset(path, columns=columns, **filters)
+    if any(v is not None for v in filters.values()):
+        raise ValueError(f"Date/game filters need a partitioned dataset, got file {path}")
+    columns = _available(columns, pq.read_schema(path).names)
+    return pd.read_parquet(path, columns=columns)
+
+def _partition_dates(dataset: ds.Dataset, expr: ds.Expression | None) -> list[date]:
+    dates = set()
+    for fragment in dataset.get_fragments(filter=expr):
+        game_date = ds.get_partition_keys(fragment.partition_expression).get('game_date')
+        if game_date is not None:
+            dates.add(game_date)
+    return sorted(dates)
+
+
+def _iter_dataset_batches(
+    dataset: ds.Dataset,
+    columns: list[str] | None,
+    batch_rows: int,
+    expr: ds.Expression | None,
+) -> Iterator[pa.RecordBatch]:
+    """One game_date partition at a time, sorted on SORT_COLUMNS, sliced into batches."""
+    sort_cols = [c for c in SORT_COLUMNS if c in (columns or dataset.schema.names)]
+    for game_date in _partition_dates(dataset, expr):
+        day = ds.field('game_date') == game_date
+        table = dataset.to_table(columns=columns, filter=day if expr is None else expr & day)
+        if sort_cols:
+            table = table.sort_by([(c, 'ascending') for c in sort_cols])
+        yield from table.to_batches(max_chunksize=batch_rows)
+
+
+def iter_statcast_batches(
+    path: str,
+    columns: list[str] | None = None,
+    batch_rows: int = 100_000,
+    **filters,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a dataset directory or single parquet file as pandas frames of up
+    to batch_rows rows, with the same projection/filters as read_statcast_source.
+
+    Dataset directories are read one game_date partition at a time and sorted
+    on game_pk within it, so games arrive clustered whatever order the files
+    were written in. Single files are streamed in file order.
+    """
+    if os.path.isdir(path):
+        dataset = open_statcast_dataset(path)
+        batches = _iter_dataset_batches(
+            dataset,
+            _available(columns, dataset.schema.names),
+            batch_rows,
+            _filter_expr(**filters),
+        )
+    else:
+        if any(v is not None for v in filters.values()):
+            raise ValueError(f"Date/game filters need a partitioned dataset, got file {path}")
+        pf = pq.ParquetFile(path)
+        batches = pf.iter_batches(
+            batch_size=batch_rows,
+            columns=_available(columns, pf.schema_arrow.names),
+        )
+
+    for batch in batches:
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def align_batches_on(frames: Iterable[pd.DataFrame], key: str = 'game_pk') -> Iterator[pd.DataFrame]:
+    """
+    Re-cut a stream of frames so no `key` value is split across two frames.
+
+    Expects the source to be clustered on key (iter_statcast_batches sorts
+    dataset partitions on game_pk); the trailing key of each frame is held
+    back and prepended to the next one. A key that shows up again after its
+    frame was emitted means the source is not clustered, and raises
+    ValueError rather than letting a builder aggregate a partial game.
+    """
+    emitted = set()
+
+    def _emit(frame: pd.DataFrame) -> pd.DataFrame:
+        keys = set(frame[key].unique())
+        repeated = keys & emitted
+        if repeated:
+            raise ValueError(
+                f"{key} values {sorted(int(k) for k in repeated)[:10]} reappear in a later batch; the "
+                f"source is not clustered on {key}. Load it without batch_rows or "
+                f"rewrite it with write_statcast_dataset."
+            )
+        emitted.update(keys)
+        return frame
+
+    carry = None
+    for frame in frames:
+        if carry is not None:
+            frame = pd.concat([carry, frame], ignore_index=True)
+            carry = None
+        if frame.empty:
+            continue
+
+        last = frame[key].iloc[-1]
+        tail = (frame[key] == last).to_numpy()
+        if tail.all():
+            carry = frame
+            continue
+
+        carry = frame[tail]
+        yield _emit(frame[~tail])
+
+    if carry is not None and not carry.empty:
+        yield _emit(carry)
@@ -71,6 +71,25 @@ def is_homerun(events: str) -> bool:
 def is_foul(description: str) -> bool:
     return isinstance(description, str) and description.lower() == 'foul'
 
+# ---------------------
+#   VECTORIZED MAPPING
+# ---------------------
+def map_series(s: pd.Series, fn) -> pd.Series:
+    # Apply a scalar description/events mapper once per distinct value and
+    # broadcast through factorize codes. Same output as s.map(fn) (NA -> fn(None)),
+    # but Python-level work scales with distinct values, not rows.
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+
+    results = [fn(u) for u in uniques]
+    results.append(fn(None))  # code -1 (NA) indexes the last slot
+    lookup = np.empty(len(results), dtype=object)
+    lookup[:] = results
+
+    if all(isinstance(r, (bool, np.bool_)) for r in results):
+        lookup = lookup.astype(bool)
+
+    return pd.Series(lookup[codes], index=s.index, name=s.name)
+
 # ---------------------
 #    PK ASSURANCE
 # ---------------------
@@ -95,4 +114,115 @@ def assert_pk_unique(
         
         df = df.drop_duplicates(subset=pk_cols, keep="last").copy()
 
-    return df
\ No newline at end of file
+    return df
+
+# Bit widths for packing Statcast PK columns into one int64 key
+PK_PACK_BITS = {
+    'game_pk': 40,
+    'game_counter': 12,
+    'at_bat_number': 12,
+    'pitch_number': 11,
+}
+
+class PKDedupIndex:
+    """
+    Compact cross-batch PK index for streaming loads.
+
+    Keys are packed into int64 (game_pk | game_counter | pitch_number bit
+    fields) when every PK column has a width in PK_PACK_BITS, otherwise
+    hashed with pd.util.hash_pandas_object. Seen keys live in sorted int64
+    chunks (8 bytes/row, vectorized lookups). A new batch's keys form a new
+    chunk, merged into the previous one while that is no larger, so each
+    key is re-merged O(log n) times and there are O(log n) chunks to search.
+
+    Within a batch, assert_pk_unique keeps the last row as before. Across
+    batches, split_seen separates rows whose key an earlier batch already
+    loaded. The regular merge is COALESCE(target, excluded), which would keep
+    the earlier row's values, so the caller must load those rows with an
+    overwrite merge for the last row to win. Counts and a sample of those
+    keys (with the batch they were found in) are returned by stats().
+    """
+
+    def __init__(self, pk_cols: list[str], sample_size: int = 25):
+        self.pk_cols = list(pk_cols)
+        self.sample_size = sample_size
+        self.packed = (
+            all(c in PK_PACK_BITS for c in self.pk_cols)
+            and sum(PK_PACK_BITS[c] for c in self.pk_cols) <= 63
+        )
+        self._chunks: list[np.ndarray] = []
+        self.batches = 0
+        self.cross_batch_duplicates = 0
+        self.samples: list[pd.DataFrame] = []
+
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks)
+
+    def keys(self, df: pd.DataFrame) -> np.ndarray:
+        if not self.packed:
+            return pd.util.hash_pandas_object(df[self.pk_cols], index=False).to_numpy().view(np.int64)
+
+        key = np.zeros(len(df), dtype=np.int64)
+        for col in self.pk_cols:
+            bits = PK_PACK_BITS[col]
+            vals = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+            if np.isnan(vals).any() or (vals < 0).any() or (vals >= 2 ** bits).any():
+                raise ValueError(f"PK column {col} has values that do not fit in {bits} bits")
+            key = (key << bits) | vals.astype(np.int64)
+        return key
+
+    def _contains(self, keys: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(keys), dtype=bool)
+        for chunk in self._chunks:
+            pos = np.searchsorted(chunk, keys).clip(max=len(chunk) - 1)
+            found |= chunk[pos] == keys
+        return found
+
+    def _add(self, keys: np.ndarray):
+        """Add keys not seen before as a new chunk, merging equal-or-smaller chunks."""
+        new = np.unique(keys)
+        if not len(new):
+            return
+        self._chunks.append(new)
+        while len(self._chunks) > 1 and len(self._chunks[-2]) <= len(self._chunks[-1]):
+            last = self._chunks.pop()
+            # chunks are disjoint sorted runs, which a stable sort merges in linear time
+            self._chunks[-1] = np.sort(np.concatenate([self._chunks[-1], last]), kind='stable')
+
+    def split_seen(self, df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Split df into (rows with new keys, rows whose key an earlier batch
+        emitted), then record this batch's keys.
+        """
+        missing = [c for c in self.pk_cols if c not in df.columns]
+        if missing:
+            raise ValueError(f"Missing PK columns: {missing}")
+        self.batches += 1
+        if df.empty:
+            return df, df
+
+        keys = self.keys(df)
+        seen_mask = self._contains(keys)
+        self._add(keys[~seen_mask])
+        if not seen_mask.any():
+            return df, df.iloc[:0]
+
+        n = int(seen_mask.sum())
+        self.cross_batch_duplicates += n
+        sampled = sum(len(x) for x in self.samples)
+        if sampled < self.sample_size:
+            sample = df.loc[seen_mask, self.pk_cols].head(self.sample_size - sampled)
+            self.samples.append(sample.assign(batch=self.batches))
+        return df.loc[~seen_mask], df.loc[seen_mask]
+
+    def dedup(self, df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """assert_pk_unique within the batch, then split_seen against earlier batches."""
+        return self.split_seen(assert_pk_unique(df, self.pk_cols))
+
+    def stats(self) -> dict:
+        sample = pd.concat(self.samples) if self.samples else None
+        return {
+            'keys_seen': len(self),
+            'cross_batch_duplicates': self.cross_batch_duplicates,
+            'sample_keys': sample.to_dict('records') if sample is not None else [],
+        }
\ No newline at end of file